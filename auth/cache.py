@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, select
+
+from core.database import async_session
+from models.revoked_token import RevokedToken
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Core jadval: tozalash ORM hodisalarini (table_versions) ishga tushirmaydi
+_TABLE = RevokedToken.__table__
+
+AUTH_CACHE_TTL = float(getenv("AUTH_CACHE_TTL", "300"))
+AUTH_CACHE_MAX_ENTRIES = int(getenv("AUTH_CACHE_MAX_ENTRIES", "1024"))
+# Boshqa worker'da bekor qilingan token shu vaqt ichida bu worker'ga ham yetib keladi
+AUTH_REVOCATION_REFRESH = float(getenv("AUTH_REVOCATION_REFRESH", "5"))
+# Muddati o'tgan revoked_tokens qatorlarini o'chirish oralig'i
+AUTH_REVOCATION_SWEEP = float(getenv("AUTH_REVOCATION_SWEEP", "600"))
+
+# Yangilanishda oldingi o'qish vaqtidan shuncha orqaga qaraladi: kech commit
+# bo'lgan logout'lar va worker'lar orasidagi soat farqi o'tkazib yuborilmaydi
+REVOCATION_OVERLAP = timedelta(seconds=60)
+
+
+def token_hash(token: str) -> bytes:
+    # Xotirada to'liq JWT emas, uning 32 baytli xeshi saqlanadi
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """Tekshirilgan token -> (admin, jti) keshi: TTL tokenning exp vaqtidan oshmaydi, LRU bo'yicha cheklangan."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[object, float]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: bytes):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: bytes, value, exp: float | None):
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: bytes):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RevokedTokens:
+    """Bekor qilingan tokenlarning xotiradagi jti -> exp lug'ati.
+
+    So'rov paytida bazaga murojaat qilinmaydi. Shu worker'dagi logout
+    lug'atni darhol yangilaydi; boshqa worker'larda qilingan logout'lar
+    fon vazifasi orqali har AUTH_REVOCATION_REFRESH soniyada qo'shiladi:
+    butun jadval faqat startup'da o'qiladi, keyin esa oxirgi o'qishdan beri
+    revoked_at bo'yicha qo'shilgan qatorlar.
+    Muddati o'tgan jti'lar xotiradan ham, revoked_tokens jadvalidan ham
+    o'chiriladi - muddati o'tgan token baribir imzo tekshiruvidan o'tmaydi.
+    """
+
+    def __init__(self, refresh_interval: float, sweep_interval: float):
+        self.refresh_interval = refresh_interval
+        self.sweep_interval = sweep_interval
+        self._revoked: dict[str, float] = {}
+        # Oxirgi yangilanish boshlangan vaqt; None - hali to'liq yuklanmagan
+        self._since: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def add(self, jti: str, exp: float):
+        self._revoked[jti] = float(exp)
+
+    def _forget_expired(self):
+        now = time.time()
+        for jti in [jti for jti, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[jti]
+
+    async def refresh(self, full: bool = False):
+        started = datetime.utcnow()
+        query = (select(RevokedToken.jti, RevokedToken.expires_at)
+                 .where(RevokedToken.expires_at > started))
+        if not full and self._since is not None:
+            query = query.where(RevokedToken.revoked_at > self._since - REVOCATION_OVERLAP)
+        async with async_session() as db:
+            result = await db.execute(query)
+            for jti, expires_at in result.all():
+                self._revoked[jti] = expires_at.replace(tzinfo=timezone.utc).timestamp()
+        self._since = started
+        self._forget_expired()
+
+    async def sweep(self) -> int:
+        async with async_session() as db:
+            result = await db.execute(
+                delete(_TABLE).where(_TABLE.c.expires_at <= datetime.utcnow()))
+            await db.commit()
+        return result.rowcount
+
+    async def _run(self):
+        next_sweep = time.monotonic()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + self.sweep_interval
+                    await self.sweep()
+            except Exception:
+                logger.exception("Bekor qilingan tokenlarni yangilab bo'lmadi")
+
+    async def start(self):
+        await self.refresh(full=True)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+token_cache = TokenCache(ttl=AUTH_CACHE_TTL, max_entries=AUTH_CACHE_MAX_ENTRIES)
+revoked_tokens = RevokedTokens(refresh_interval=AUTH_REVOCATION_REFRESH,
+                               sweep_interval=AUTH_REVOCATION_SWEEP)
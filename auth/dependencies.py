@@ -5,31 +5,46 @@ from sqlalchemy.future import select
 
 from core.database import get_db
 from models.admin import Admin
-from models.blacklisted_token import BlacklistedToken
-from auth.token import decode_access_token
+from auth.cache import revoked_tokens, token_cache, token_hash
+from auth.token import decode_access_claims
 
 bearer_scheme = HTTPBearer()
 
 
+def _revoked():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token allaqachon bekor qilingan"
+    )
+
+
 async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db)
 ):
     token = credentials.credentials
-
-    result = await db.execute(select(BlacklistedToken).where(BlacklistedToken.token == token))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token allaqachon bekor qilingan"
-        )
-
-    username = decode_access_token(token)
-    if not username:
+    key = token_hash(token)
+
+    # Qora ro'yxat xotirada: keshdan o'tgan so'rov bazaga umuman murojaat qilmaydi
+    cached = token_cache.get(key)
+    if cached is not None:
+        admin, jti = cached
+        if jti in revoked_tokens:
+            token_cache.discard(key)
+            raise _revoked()
+        return admin
+
+    claims = decode_access_claims(token)
+    username = claims.get("sub") if claims else None
+    jti = claims.get("jti") if claims else None
+    # jti'siz tokenni bekor qilib bo'lmaydi, shuning uchun u qabul qilinmaydi
+    if not username or not jti:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Yaroqsiz yoki muddati o'tgan token"
         )
+    if jti in revoked_tokens:
+        raise _revoked()
 
     result = await db.execute(select(Admin).where(Admin.username == username))
     admin = result.scalar_one_or_none()
@@ -37,4 +52,7 @@ async def get_current_admin(
     if not admin:
         raise HTTPException(status_code=404, detail="Admin topilmadi")
 
+    # Keshdagi obyekt so'rovlar orasida ulashiladi, shuning uchun sessiyadan ajratiladi
+    db.expunge(admin)
+    token_cache.set(key, (admin, jti), claims.get("exp"))
     return admin
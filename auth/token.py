@@ -1,4 +1,5 @@
 
+from uuid import uuid4
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from os import getenv
@@ -14,14 +15,19 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti - bekor qilish (logout) uchun tokenning qisqa, noyob identifikatori
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def decode_access_token(token: str):
+def decode_access_claims(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+
+def decode_access_token(token: str):
+    payload = decode_access_claims(token)
+    return payload.get("sub") if payload else None
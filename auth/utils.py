@@ -1,11 +1,91 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from os import getenv
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+load_dotenv()
+
+# Qiymat o'zgarsa, eski xeshlar keyingi muvaffaqiyatli login'da qayta xeshlanadi
+BCRYPT_ROUNDS = int(getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt GIL'ni bo'shatadi, shuning uchun oddiy thread'lar yetarli
+PASSWORD_HASH_WORKERS = int(getenv("PASSWORD_HASH_WORKERS", "2"))
+# Bajarilayotgan + navbatdagi amallar chegarasi; oshsa 503 (brute-force hujumida navbat o'smaydi)
+PASSWORD_HASH_MAX_PENDING = int(getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+@dataclass
+class HasherStats:
+    completed: int = 0
+    rejected: int = 0
+    pending: int = 0
+    queue_seconds_total: float = 0.0
+    queue_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+
+
+class PasswordHasher:
+    """Parol xeshlash va tekshirishni alohida, cheklangan thread pool'da bajaradi.
+
+    Event loop bloklanmaydi: bcrypt'ning 200-300 ms lik ishi shu pool'da
+    o'tadi, ochiq so'rovlar esa kutmaydi. Navbatda kutish vaqti stats'da
+    yig'iladi.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self.stats = HasherStats()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash")
+
+    async def run(self, func, *args):
+        if self.stats.pending >= self.max_pending:
+            self.stats.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server band, birozdan keyin qayta urinib ko'ring",
+                headers={"Retry-After": "1"},
+            )
+        self.stats.pending += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self.stats.pending -= 1
+        self.stats.completed += 1
+        self.stats.queue_seconds_total += waited
+        self.stats.queue_seconds_max = max(self.stats.queue_seconds_max, waited)
+        self.stats.run_seconds_total += ran
+        return result
+
+
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASH_WORKERS, max_pending=PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(pwd_context.hash, password)
 
 
-def hash_password(password: str):
-    return pwd_context.hash(password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
 
 
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_and_update_password(plain_password: str,
+                                     hashed_password: str) -> tuple[bool, str | None]:
+    """(to'g'rimi, yangi_xesh) qaytaradi; BCRYPT_ROUNDS o'zgargan bo'lsa yangi_xesh beriladi."""
+    return await password_hasher.run(
+        pwd_context.verify_and_update, plain_password, hashed_password)
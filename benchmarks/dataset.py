@@ -0,0 +1,311 @@
+"""Benchmark va yuklama testlari uchun katta sintetik ma'lumotlar bazasi.
+
+Ishchi papka (standart: bench-data/) ilova kutadigan tuzilishda yaratiladi:
+db/bench.db, static/images (rasmlar), static/pdfs va manifest.json. Ma'lumotlar
+--seed bo'yicha takrorlanadi: bir xil seed va scale har doim bir xil bazani beradi.
+--scale 1 da: 100k guruh (tizim/bo'limlar bo'ylab), 200k murojaat, uzun matnli
+50k qonun hujjati, minglab yangilik, e'lon va rasm.
+
+Ishga tushirish:
+    python -m benchmarks.dataset --out bench-data --scale 1
+    python -m benchmarks.dataset --out bench-data --scale 0.05   # tezkor tekshiruv
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from auth.utils import pwd_context
+from core.database import install_sqlite_tuning
+from core.schema import upgrade_schema
+from models.admin import Admin
+from models.boglanish_form import BoglanishForm
+from models.corrupsiyaga_qarshi import Corrupsiya
+from models.elonlar import Elon
+from models.guruh import Guruh
+from models.malumotnoma import Malumotnoma
+from models.management_system_page import ManagementSystemPage  # noqa: F401
+from models.menu import Menu, SubMenu
+from models.pdf_text import PdfText  # noqa: F401
+from models.qonun_qaror_farmon import QonunQarorFarmon
+from models.rahbariyat import Rahbariyat
+from models.reglament import Reglament
+from models.revoked_token import RevokedToken  # noqa: F401
+from models.shaharsozlik_norma_qoida_bolim import ShaharsozlikNormaQoidaBolim
+from models.smeta_resurs_norma import SmetaResursNorma
+from models.standart import Standart
+from models.tarkibiy_bolinmalar import TarkibiyBolinma
+from models.tashkiliy_tuzilma import TashkilTuzilma
+from models.tizim import Tizim
+from models.tmsiti_boglanish_malumoti import TmsitiBoglanishMalumoti
+from models.tmsiti_haqida import TmsitiHaqida
+from models.vakansiyalar import Vakansiya
+from models.yangiliklar import Yangilik
+from services.image_render import Image
+
+DB_PATH = os.path.join("db", "bench.db")
+IMAGE_FOLDER = os.path.join("static", "images")
+PDF_FOLDER = os.path.join("static", "pdfs")
+ADMIN_USERNAME = "bench"
+ADMIN_PASSWORD = "bench-password"
+
+# --scale 1 dagi qatorlar soni
+SIZES = {
+    "tizim": 20,
+    "bolim": 500,
+    "guruh": 100_000,
+    "boglanish_form": 200_000,
+    "qonun": 50_000,
+    "yangilik": 5_000,
+    "elon": 2_000,
+    "image": 2_000,
+    "standart": 3_000,
+    "reglament": 1_000,
+    "smeta": 1_000,
+    "malumotnoma": 500,
+    "vakansiya": 200,
+    "corrupsiya": 300,
+    "rahbariyat": 20,
+    "tarkibiy": 60,
+    "menu": 20,
+}
+CHUNK = 5_000
+
+WORDS = (
+    "shaharsozlik norma qoida qurilish loyiha talab hujjat texnik reglament standart "
+    "bino inshoot xavfsizlik yong'in muhandislik tarmoq suv ta'minoti kanalizatsiya "
+    "issiqlik elektr energiya samaradorlik smeta resurs narx hisob-kitob vazirlik qaror "
+    "farmon qonun tasdiqlash o'zgartirish bo'lim modda band ijro nazorat ekspertiza "
+    "tuman viloyat respublika hudud mahalla yo'l ko'prik maktab shifoxona uy-joy "
+    "tadbirkor fuqaro murojaat ariza javob muddat tartib yangilik e'lon seminar"
+).split()
+MUROJAAT_TURLARI = ("Taklif", "Shikoyat", "Ariza", "Savol")
+HUJJAT_TURLARI = ("Qonun", "Qaror", "Farmon", "Buyruq")
+
+# Minimal to'g'ri PDF va PNG (Pillow bo'lmasa rasm sifatida ishlatiladi)
+PDF_BYTES = (b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+             b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n")
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360f8cfc0f01f0005000201a5a5e1c1"
+    "0000000049454e44ae426082")
+
+
+def scaled(scale: float) -> dict[str, int]:
+    return {name: max(1, int(round(count * scale))) for name, count in SIZES.items()}
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def title(rng: random.Random) -> str:
+    return text(rng, rng.randint(4, 10)).capitalize()
+
+
+def timestamp(rng: random.Random) -> datetime:
+    return datetime(2020, 1, 1) + timedelta(seconds=rng.randint(0, 5 * 365 * 86400))
+
+
+def phone(rng: random.Random) -> str:
+    return f"+998 {rng.randint(90, 99)} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}"
+
+
+def write_images(folder: str, count: int, rng: random.Random) -> list[str]:
+    """Turli o'lcham va rangdagi JPEG rasmlar; Pillow bo'lmasa bir xil kichik PNG."""
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for i in range(count):
+        if Image is not None:
+            name = f"bench-{i:06d}.jpg"
+            width, height = rng.choice(((1600, 1067), (1200, 800), (800, 600), (1080, 1350)))
+            start = tuple(rng.randrange(256) for _ in range(3))
+            image = Image.new("RGB", (width, height), start)
+            # Gradient: bir rangli rasmdan farqli o'laroq JPEG uni deyarli siqa olmaydi
+            band = Image.linear_gradient("L").resize((width, height))
+            image.paste(tuple(rng.randrange(256) for _ in range(3)), mask=band)
+            image.save(os.path.join(folder, name), quality=85)
+        else:
+            name = f"bench-{i:06d}.png"
+            with open(os.path.join(folder, name), "wb") as f:
+                f.write(PNG_BYTES)
+        names.append(name)
+    return names
+
+
+async def insert_rows(engine, table, rows, label: str):
+    started = time.perf_counter()
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK:
+            async with engine.begin() as conn:
+                await conn.execute(insert(table), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), batch)
+        total += len(batch)
+    print(f"  {label:<24}{total:>10} qator  {time.perf_counter() - started:8.1f} s")
+    return total
+
+
+async def generate(out: str, scale: float, seed: int) -> dict:
+    sizes = scaled(scale)
+    rng = random.Random(seed)
+    for folder in ("db", IMAGE_FOLDER, PDF_FOLDER):
+        os.makedirs(os.path.join(out, folder), exist_ok=True)
+    db_path = os.path.join(out, DB_PATH)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    started = time.perf_counter()
+    images = write_images(os.path.join(out, IMAGE_FOLDER), sizes["image"], rng)
+    print(f"  {'rasmlar':<24}{len(images):>10} fayl   {time.perf_counter() - started:8.1f} s")
+    pdf = os.path.join(PDF_FOLDER, "bench.pdf")
+    with open(os.path.join(out, pdf), "wb") as f:
+        f.write(PDF_BYTES)
+
+    def image_path(i: int) -> str:
+        return f"{IMAGE_FOLDER}/{images[i % len(images)]}"
+
+    # Sxema ilovadagidek migratsiyalar bilan quriladi (jadvallar, indekslar, triggerlar)
+    url = f"sqlite+aiosqlite:///{db_path}"
+    await asyncio.to_thread(upgrade_schema, url)
+    engine = create_async_engine(url)
+    install_sqlite_tuning(engine.sync_engine)
+
+    counts = {}
+    counts["tizim"] = await insert_rows(engine, Tizim.__table__, (
+        {"id": i, "name": f"Tizim {i}. {title(rng)}", "created_at": timestamp(rng)}
+        for i in range(1, sizes["tizim"] + 1)), "tizim")
+    counts["bolim"] = await insert_rows(engine, ShaharsozlikNormaQoidaBolim.__table__, (
+        {"id": i, "name": f"Bo'lim {i}. {title(rng)}", "tizim": rng.randint(1, sizes["tizim"]),
+         "created_at": timestamp(rng)}
+        for i in range(1, sizes["bolim"] + 1)), "bo'lim")
+    counts["guruh"] = await insert_rows(engine, Guruh.__table__, (
+        {"shifr": f"ShNQ {rng.randint(1, 9)}.{rng.randint(1, 99):02d}.{i:06d}",
+         "hujjat_nomi": title(rng), "link": f"https://example.uz/hujjat/{i}",
+         "pdf": pdf if i % 3 == 0 else None, "bolim": rng.randint(1, sizes["bolim"]),
+         "created_at": timestamp(rng)}
+        for i in range(1, sizes["guruh"] + 1)), "guruh")
+    counts["qonun"] = await insert_rows(engine, QonunQarorFarmon.__table__, (
+        {"title": title(rng), "type": rng.choice(HUJJAT_TURLARI),
+         # 4-16 KB matn: ro'yxat sahifalari uzun content'ni ham o'qiydi
+         "content": text(rng, rng.randint(500, 2000)), "number": f"PQ-{i}",
+         "date": date(2000, 1, 1) + timedelta(days=rng.randint(0, 9000)),
+         "source": "https://lex.uz"}
+        for i in range(1, sizes["qonun"] + 1)), "qonun_qaror_farmon")
+    counts["boglanish_form"] = await insert_rows(engine, BoglanishForm.__table__, (
+        {"FIO": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS).capitalize()}ov",
+         "email": f"user{i}@example.uz", "tel_raqam": phone(rng),
+         "type": rng.choice(MUROJAAT_TURLARI), "murojat_matni": text(rng, rng.randint(20, 200)),
+         "fayl": pdf if i % 10 == 0 else None, "created_at": timestamp(rng)}
+        for i in range(1, sizes["boglanish_form"] + 1)), "boglanish_form")
+    counts["yangilik"] = await insert_rows(engine, Yangilik.__table__, (
+        {"name": title(rng), "text": text(rng, rng.randint(150, 800)), "rasm": image_path(i),
+         "created_at": timestamp(rng)}
+        for i in range(sizes["yangilik"])), "yangilik")
+    counts["elon"] = await insert_rows(engine, Elon.__table__, (
+        {"name": title(rng), "description": text(rng, rng.randint(50, 300)),
+         "rasm": image_path(i), "created_at": timestamp(rng)}
+        for i in range(sizes["elon"])), "e'lon")
+    counts["standart"] = await insert_rows(engine, Standart.__table__, (
+        {"name": f"O'z DSt {i}: {title(rng)}", "description": text(rng, 60), "pdf": pdf}
+        for i in range(sizes["standart"])), "standart")
+    counts["reglament"] = await insert_rows(engine, Reglament.__table__, (
+        {"shifri": f"TR {i}", "nomi": title(rng), "link": f"https://example.uz/r/{i}", "pdf": pdf}
+        for i in range(sizes["reglament"])), "reglament")
+    counts["smeta"] = await insert_rows(engine, SmetaResursNorma.__table__, (
+        {"yangi_ShNQ_raqami": f"ShNQ 4.{i}", "yangilangan_ShNQ_nomi": title(rng),
+         "ShNQ_raqami": f"SNiP {i}", "ShNQ_nomi": title(rng), "pdf": pdf}
+        for i in range(sizes["smeta"])), "smeta_resurs_norma")
+    counts["malumotnoma"] = await insert_rows(engine, Malumotnoma.__table__, (
+        {"nomi": title(rng), "hujjat": pdf} for _ in range(sizes["malumotnoma"])), "malumotnoma")
+    counts["vakansiya"] = await insert_rows(engine, Vakansiya.__table__, (
+        {"title": title(rng), "description": text(rng, 120), "bolim": rng.choice(WORDS),
+         "is_active": rng.random() < 0.7, "created_at": timestamp(rng)}
+        for _ in range(sizes["vakansiya"])), "vakansiya")
+    counts["corrupsiya"] = await insert_rows(engine, Corrupsiya.__table__, (
+        {"name": title(rng), "description": text(rng, 200), "created_at": timestamp(rng)}
+        for _ in range(sizes["corrupsiya"])), "corrupsiyaga_qarshi")
+    counts["rahbariyat"] = await insert_rows(engine, Rahbariyat.__table__, (
+        {"positions": title(rng), "full_name": title(rng), "qabul_kunlari": "Dushanba 10:00-12:00",
+         "telefon": phone(rng), "elektron_pochta": f"rahbar{i}@example.uz",
+         "mutahassisligi": title(rng), "rasm": image_path(i)}
+        for i in range(sizes["rahbariyat"])), "rahbariyat")
+    counts["tarkibiy"] = await insert_rows(engine, TarkibiyBolinma.__table__, (
+        {"kimligi": title(rng), "full_name": title(rng), "telefon": phone(rng),
+         "elektron_pochta": f"bolinma{i}@example.uz", "image": image_path(i)}
+        for i in range(sizes["tarkibiy"])), "tarkibiy_bolinma")
+    counts["menu"] = await insert_rows(engine, Menu.__table__, (
+        {"id": i, "title": title(rng), "url": f"/menu/{i}", "created_at": timestamp(rng)}
+        for i in range(1, sizes["menu"] + 1)), "menu")
+    await insert_rows(engine, SubMenu.__table__, (
+        {"title": title(rng), "url": f"/menu/{i}/{j}", "menu_id": i, "created_at": timestamp(rng)}
+        for i in range(1, sizes["menu"] + 1) for j in range(rng.randint(2, 8))), "submenu")
+    await insert_rows(engine, TashkilTuzilma.__table__, [{"image": image_path(0)}], "tashkil_tuzilma")
+    await insert_rows(engine, TmsitiHaqida.__table__, [{"text": text(rng, 1500), "pdf": pdf}],
+                      "tmsiti_haqida")
+    await insert_rows(engine, TmsitiBoglanishMalumoti.__table__, [
+        {"joylashuv": "41.31,69.28", "manzil": "Toshkent", "email": "info@example.uz",
+         "qoshimcha_email": "kanc@example.uz", "tel_raqam": phone(rng)}], "tmsiti_boglanish")
+    await insert_rows(engine, Admin.__table__, [
+        {"username": ADMIN_USERNAME, "hashed_password": pwd_context.hash(ADMIN_PASSWORD),
+         "created_at": datetime.utcnow()}], "admin")
+
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+    await engine.dispose()
+
+    manifest = {
+        "scale": scale,
+        "seed": seed,
+        "counts": counts,
+        "images": len(images),
+        "image_extension": os.path.splitext(images[0])[1],
+        "admin": {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD},
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(out: str) -> dict:
+    path = os.path.join(out, "manifest.json")
+    if not os.path.exists(path):
+        raise SystemExit(f"{path} topilmadi: avval `python -m benchmarks.dataset --out {out}`")
+    with open(path) as f:
+        return json.load(f)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="bench-data", help="Ishchi papka")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Qatorlar soni koeffitsienti (1 = to'liq hajm)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clean", action="store_true", help="Ishchi papkani oldin o'chirish")
+    args = parser.parse_args()
+
+    if args.clean and os.path.isdir(args.out):
+        shutil.rmtree(args.out)
+    started = time.perf_counter()
+    manifest = await generate(args.out, args.scale, args.seed)
+    print(f"Tayyor: {args.out} ({sum(manifest['counts'].values())} qator, "
+          f"{time.perf_counter() - started:.1f} s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
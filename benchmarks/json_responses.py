@@ -0,0 +1,129 @@
+"""JSON javob yo'llarini solishtirish: odatiy (response_model + json.dumps) va tez yo'l.
+
+Bitta jarayonda, bir xil bazada har bir router uchun vakil so'rov ketma-ket
+bajariladi. Avval odatiy yo'l (FastAPI tekshiruvi, Python lug'atlari,
+JSONResponse), keyin core/responses.py dagi tez yo'l (TypeAdapter -> baytlar,
+FastJSONResponse) o'lchanadi, bloklar almashinib keladi. Javob tanalari bir
+xilligi ham tekshiriladi.
+
+Ishga tushirish:
+    python -m benchmarks.dataset --out bench-data --scale 0.1
+    python -m benchmarks.json_responses --data bench-data --iterations 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from benchmarks.load import app_env, percentile
+
+# Katta sahifalar: serializatsiya ulushi ko'proq ko'rinadi
+REQUESTS = [
+    "/full_tizim/",
+    "/tizimlar/?limit=100",
+    "/shaharsozlik-norma-qoida-bolimlar/?limit=100",
+    "/guruhlar/?limit=100",
+    "/guruhlar/?limit=100&cursor=",
+    "/qonun-qaror-farmonlar/?limit=50",
+    "/yangiliklar/?per_page=100",
+    "/elonlar/?per_page=100",
+    "/standartlar/?per_page=100",
+    "/reglamentlar/?per_page=100",
+    "/smeta_resurs_normalari/?per_page=100",
+    "/malumotnoma/?per_page=100",
+    "/corrupsiyaga_qarshi/?per_page=100",
+    "/menus/?per_page=100",
+    "/vakansiyalar/?limit=100",
+    "/rahbariyat/",
+    "/tarkibiy-bolinmalar/",
+    "/tmsiti-haqida/",
+    "/search/?q=qonun&limit=100",
+]
+
+
+def route_handlers(app):
+    """[(route, odatiy ASGI app, tez ASGI app)]."""
+    from fastapi.routing import APIRoute
+    from starlette.responses import JSONResponse
+    from starlette.routing import request_response
+
+    from core.responses import install_json_fast_path
+
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    default = []
+    for route in routes:
+        # Bugungi yo'l: FastAPI'ning response_field'i va stdlib json bilan JSONResponse
+        response_class, route.response_class = route.response_class, JSONResponse
+        default.append(request_response(route.get_route_handler()))
+        route.response_class = response_class
+    install_json_fast_path(app, enabled=True)
+    return [(route, default_app, route.app) for route, default_app in zip(routes, default)]
+
+
+def use(handlers, fast: bool):
+    for route, default_app, fast_app in handlers:
+        route.app = fast_app if fast else default_app
+
+
+async def measure(client, path: str, iterations: int) -> tuple[list[float], bytes]:
+    samples = []
+    body = b""
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        body = response.content
+    return samples, body
+
+
+async def run(args):
+    # benchmarks.load bilan bir xil: sozlamalar importdan oldin o'rnatiladi
+    os.environ.update({**app_env(os.path.abspath(args.data), response_cache=False),
+                       "JSON_FAST_PATH": "false"})
+    os.chdir(args.data)
+    from main import app
+
+    handlers = route_handlers(app)
+    results = []
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                     base_url="http://bench", timeout=120) as client:
+            for path in REQUESTS:
+                samples = {False: [], True: []}
+                bodies = {}
+                for fast in (False, True):
+                    use(handlers, fast)
+                    await measure(client, path, args.warmup)
+                for _ in range(args.rounds):
+                    for fast in (False, True):
+                        use(handlers, fast)
+                        block, bodies[fast] = await measure(
+                            client, path, max(1, args.iterations // args.rounds))
+                        samples[fast].extend(block)
+                results.append((path, samples[False], samples[True],
+                                bodies[False] == bodies[True], len(bodies[True])))
+
+    header = ("so'rov", "hajm KB", "odatiy p50", "tez p50", "odatiy o'rt", "tez o'rt", "tezlanish")
+    print("{:<48}{:>9}{:>12}{:>10}{:>13}{:>10}{:>11}".format(*header))
+    for path, default, fast, same, size in results:
+        mean_default, mean_fast = statistics.fmean(default), statistics.fmean(fast)
+        print(f"{path:<48}{size / 1024:>9.1f}{percentile(default, 50):>12.2f}"
+              f"{percentile(fast, 50):>10.2f}{mean_default:>13.2f}{mean_fast:>10.2f}"
+              f"{mean_default / mean_fast:>10.2f}x" + ("" if same else "  TANA FARQ QILADI"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="bench-data", help="benchmarks.dataset ishchi papkasi")
+    parser.add_argument("--iterations", type=int, default=200, help="Har bir yo'l uchun so'rovlar")
+    parser.add_argument("--rounds", type=int, default=4, help="Almashinuvchi bloklar soni")
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
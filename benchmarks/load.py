@@ -0,0 +1,567 @@
+"""Yuklama testi: ochiq GET va admin CRUD/yuklash endpointlari parallel chaqiriladi.
+
+Ilova benchmarks.dataset yaratgan ishchi papkaga qarab ishga tushiriladi:
+--mode inprocess da ASGI orqali shu jarayonning o'zida (tarmoqsiz), --mode http
+da alohida uvicorn jarayoni sifatida (--url berilsa, ishlab turgan serverga).
+Har bir endpoint uchun p50/p95/p99 va RPS chiqariladi. Natijani baseline
+sifatida saqlash va keyingi ishga tushirishni u bilan solishtirish mumkin:
+p95 yoki umumiy RPS ruxsat etilgan chegaradan yomonlashsa, dastur 1 kodi
+bilan tugaydi (CI'da shu mashinada olingan baseline bilan ishlatiladi).
+
+Ishga tushirish:
+    python -m benchmarks.dataset --out bench-data --scale 0.1
+    python -m benchmarks.load --data bench-data --seconds 20 --concurrency 32
+    python -m benchmarks.load --data bench-data --mode http --workers 2
+    python -m benchmarks.load --data bench-data --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks.load --data bench-data --compare benchmarks/baselines/local.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import httpx
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_KEY = "bench-secret-key"
+
+
+def app_env(data: str, response_cache: bool) -> dict[str, str]:
+    """Ilova benchmark bazasi bilan ishlashi uchun muhit o'zgaruvchilari.
+
+    Fon ishlovchilari o'chiriladi: ular o'lchanayotgan so'rovlar bilan CPU talashadi.
+    """
+    return {
+        "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.abspath(os.path.join(data, 'db', 'bench.db'))}",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", SECRET_KEY),
+        "RESPONSE_CACHE_ENABLED": "true" if response_cache else "false",
+        "IMAGE_RENDITIONS_ENABLED": "false",
+        "PDF_EXTRACT_ENABLED": "false",
+        # Oldinroq yaratilgan bench-data yangi migratsiyalarga startup'da keltiriladi
+        "DB_AUTO_MIGRATE": "true",
+    }
+
+
+@dataclass
+class Context:
+    counts: dict
+    images: int
+    image_extension: str
+    image_bytes: bytes
+    pdf_bytes: bytes
+    admin_headers: dict = field(default_factory=dict)
+
+
+class Recorder:
+    """Har bir so'rov nomi bo'yicha kechikishlar (ms) va kutilmagan javoblar."""
+
+    def __init__(self):
+        self.recording = False
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.error_samples: dict[str, str] = {}
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str,
+                      expected=(200,), **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            response, detail = None, f"{type(e).__name__}: {e}"
+        else:
+            detail = None if response.status_code in expected else \
+                f"{response.status_code}: {response.text[:200]}"
+        elapsed = (time.perf_counter() - started) * 1000
+        if self.recording:
+            self.samples.setdefault(name, []).append(elapsed)
+            if detail is not None:
+                self.errors[name] = self.errors.get(name, 0) + 1
+                self.error_samples.setdefault(name, detail)
+        return response if detail is None else None
+
+
+def _page(rng: random.Random, total: int, per_page: int) -> int:
+    return rng.randint(1, max(1, -(-total // per_page)))
+
+
+def _offset(rng: random.Random, total: int, limit: int) -> int:
+    return rng.randint(0, max(0, total - limit))
+
+
+def _words(rng: random.Random) -> str:
+    from benchmarks.dataset import WORDS
+    return " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+
+
+# --- Ochiq GET endpointlar ---
+
+async def full_tizim(client, ctx, rec, rng):
+    await rec.request(client, "GET /full_tizim/", "GET", "/full_tizim/")
+
+
+async def tizimlar(client, ctx, rec, rng):
+    await rec.request(client, "GET /tizimlar/", "GET", "/tizimlar/", params={"limit": 100})
+
+
+async def bolimlar(client, ctx, rec, rng):
+    await rec.request(client, "GET /shaharsozlik-norma-qoida-bolimlar/?tizim", "GET",
+                      "/shaharsozlik-norma-qoida-bolimlar/",
+                      params={"tizim": rng.randint(1, ctx.counts["tizim"]), "limit": 100})
+
+
+async def guruhlar_offset(client, ctx, rec, rng):
+    limit = rng.choice((10, 50, 100))
+    await rec.request(client, "GET /guruhlar/?offset", "GET", "/guruhlar/", params={
+        "limit": limit, "offset": _offset(rng, ctx.counts["guruh"], limit)})
+
+
+async def guruhlar_tizim(client, ctx, rec, rng):
+    await rec.request(client, "GET /guruhlar/?tizim", "GET", "/guruhlar/", params={
+        "tizim": rng.randint(1, ctx.counts["tizim"]), "limit": 20})
+
+
+async def guruhlar_bolim(client, ctx, rec, rng):
+    await rec.request(client, "GET /guruhlar/?bolim", "GET", "/guruhlar/", params={
+        "bolim": rng.randint(1, ctx.counts["bolim"]), "limit": 20})
+
+
+async def guruhlar_cursor(client, ctx, rec, rng):
+    cursor = ""
+    for _ in range(5):
+        response = await rec.request(client, "GET /guruhlar/?cursor", "GET", "/guruhlar/",
+                                     params={"limit": 50, "cursor": cursor})
+        cursor = response.headers.get("x-next-cursor") if response is not None else None
+        if not cursor:
+            return
+
+
+async def qonunlar(client, ctx, rec, rng):
+    await rec.request(client, "GET /qonun-qaror-farmonlar/?offset", "GET",
+                      "/qonun-qaror-farmonlar/", params={
+                          "limit": 20, "offset": _offset(rng, ctx.counts["qonun"], 20)})
+
+
+def paginated(prefix: str, count_key: str | None, per_page: int = 10, with_total: bool = True):
+    async def scenario(client, ctx, rec, rng):
+        total = ctx.counts.get(count_key, 1) if count_key else 1
+        await rec.request(client, f"GET {prefix}?page", "GET", prefix, params={
+            "page": _page(rng, total, per_page), "per_page": per_page,
+            "with_total": str(with_total).lower()})
+    return scenario
+
+
+async def yangiliklar_cursor(client, ctx, rec, rng):
+    cursor = ""
+    for _ in range(5):
+        response = await rec.request(client, "GET /yangiliklar/?cursor", "GET", "/yangiliklar/",
+                                     params={"per_page": 10, "cursor": cursor})
+        cursor = response.json().get("next_cursor") if response is not None else None
+        if not cursor:
+            return
+
+
+def simple(path: str):
+    async def scenario(client, ctx, rec, rng):
+        await rec.request(client, f"GET {path}", "GET", path)
+    return scenario
+
+
+async def search(client, ctx, rec, rng):
+    await rec.request(client, "GET /search/", "GET", "/search/", params={"q": _words(rng)})
+
+
+def _image_name(ctx: Context, rng: random.Random) -> str:
+    return f"bench-{rng.randrange(ctx.images):06d}{ctx.image_extension}"
+
+
+async def img(client, ctx, rec, rng):
+    await rec.request(client, "GET /img/{name}", "GET", f"/img/{_image_name(ctx, rng)}",
+                      params={"w": rng.choice((320, 640))}, headers={"accept": "image/webp"})
+
+
+async def static_image(client, ctx, rec, rng):
+    await rec.request(client, "GET /static/images/{name}", "GET",
+                      f"/static/images/{_image_name(ctx, rng)}")
+
+
+# --- Admin CRUD va yuklashlar ---
+
+async def boglanish_inbox(client, ctx, rec, rng):
+    params = {"page": _page(rng, ctx.counts["boglanish_form"], 20), "per_page": 20}
+    if rng.random() < 0.5:
+        params = {"search": _words(rng).split()[0], "per_page": 20}
+    await rec.request(client, "GET /boglanish_form/for_admin/", "GET", "/boglanish_form/for_admin/",
+                      params=params, headers=ctx.admin_headers)
+
+
+async def boglanish_submit(client, ctx, rec, rng):
+    files = {"fayl": ("ariza.pdf", ctx.pdf_bytes + os.urandom(16), "application/pdf")} \
+        if rng.random() < 0.3 else None
+    await rec.request(client, "POST /boglanish_form/", "POST", "/boglanish_form/",
+                      expected=(200, 202), files=files, data={
+                          "FIO": "Benchmark Foydalanuvchi", "email": "bench@example.uz",
+                          "tel_raqam": "+998 90 123 45 67", "type": "Savol",
+                          "murojat_matni": _words(rng) * 20})
+
+
+async def guruh_crud(client, ctx, rec, rng):
+    form = {"shifr": f"BENCH-{rng.randrange(10 ** 6)}", "hujjat_nomi": "Benchmark hujjati",
+            "bolim": str(rng.randint(1, ctx.counts["bolim"]))}
+    pdf = {"pdf": ("hujjat.pdf", ctx.pdf_bytes + os.urandom(16), "application/pdf")}
+    created = await rec.request(client, "POST /guruhlar/for_admin/", "POST", "/guruhlar/for_admin/",
+                                data=form, files=pdf, headers=ctx.admin_headers)
+    if created is None:
+        return
+    id = created.json()["id"]
+    await rec.request(client, "PUT /guruhlar/{id}/for_admin/", "PUT", f"/guruhlar/{id}/for_admin/",
+                      data={**form, "hujjat_nomi": "Yangilangan hujjat"}, headers=ctx.admin_headers)
+    await rec.request(client, "DELETE /guruhlar/{id}/for_admin/", "DELETE",
+                      f"/guruhlar/{id}/for_admin/", headers=ctx.admin_headers)
+
+
+async def yangilik_crud(client, ctx, rec, rng):
+    created = await rec.request(
+        client, "POST /yangiliklar/for_admin/", "POST", "/yangiliklar/for_admin/",
+        data={"name": "Benchmark yangiligi", "text": _words(rng) * 50},
+        files={"rasm": (f"rasm{ctx.image_extension}", ctx.image_bytes,
+                        "image/jpeg" if ctx.image_extension == ".jpg" else "image/png")},
+        headers=ctx.admin_headers)
+    if created is None:
+        return
+    id = created.json()["id"]
+    await rec.request(client, "DELETE /yangiliklar/{id}/for_admin/", "DELETE",
+                      f"/yangiliklar/{id}/for_admin/", headers=ctx.admin_headers)
+
+
+async def qonun_crud(client, ctx, rec, rng):
+    form = {"title": "Benchmark qarori", "type": "Qaror", "content": _words(rng) * 500,
+            "number": f"B-{rng.randrange(10 ** 6)}", "date": "2024-01-01", "source": "https://lex.uz"}
+    created = await rec.request(client, "POST /qonun-qaror-farmonlar/for_admin/", "POST",
+                                "/qonun-qaror-farmonlar/for_admin/", data=form,
+                                headers=ctx.admin_headers)
+    if created is None:
+        return
+    id = created.json()["id"]
+    await rec.request(client, "PUT /qonun-qaror-farmonlar/{id}/for_admin/", "PUT",
+                      f"/qonun-qaror-farmonlar/{id}/for_admin/",
+                      data={**form, "title": "Yangilangan qaror"}, headers=ctx.admin_headers)
+    await rec.request(client, "DELETE /qonun-qaror-farmonlar/{id}/for_admin/", "DELETE",
+                      f"/qonun-qaror-farmonlar/{id}/for_admin/", headers=ctx.admin_headers)
+
+
+# (nom, og'irlik, funksiya); --only/--skip nom bo'yicha regex bilan tanlaydi
+PUBLIC_SCENARIOS = [
+    ("full_tizim", 5, full_tizim),
+    ("tizimlar", 2, tizimlar),
+    ("bolimlar", 2, bolimlar),
+    ("guruhlar_offset", 6, guruhlar_offset),
+    ("guruhlar_tizim", 3, guruhlar_tizim),
+    ("guruhlar_bolim", 3, guruhlar_bolim),
+    ("guruhlar_cursor", 2, guruhlar_cursor),
+    ("qonunlar", 4, qonunlar),
+    ("yangiliklar", 5, paginated("/yangiliklar/", "yangilik")),
+    ("yangiliklar_cursor", 2, yangiliklar_cursor),
+    ("elonlar", 3, paginated("/elonlar/", "elon")),
+    ("standartlar", 2, paginated("/standartlar/", "standart", per_page=20)),
+    ("reglamentlar", 1, paginated("/reglamentlar/", "reglament", per_page=20, with_total=False)),
+    ("smeta", 1, paginated("/smeta_resurs_normalari/", "smeta", per_page=20)),
+    ("malumotnoma", 1, paginated("/malumotnoma/", "malumotnoma")),
+    ("management_system_page", 1, paginated("/management_system_page/", None)),
+    ("corrupsiya", 1, paginated("/corrupsiyaga_qarshi/", "corrupsiya")),
+    ("boglanish_malumoti", 1, paginated("/tmsiti_boglanish_malumoti/", None)),
+    ("menus", 1, paginated("/menus/", "menu")),
+    ("vakansiyalar", 1, simple("/vakansiyalar/")),
+    ("tmsiti_haqida", 1, simple("/tmsiti-haqida/")),
+    ("rahbariyat", 1, simple("/rahbariyat/")),
+    ("tashkil_tuzilma", 1, simple("/tashkil-tuzilma/")),
+    ("tarkibiy_bolinmalar", 1, simple("/tarkibiy-bolinmalar/")),
+    ("search", 3, search),
+    ("img", 3, img),
+    ("static", 2, static_image),
+]
+ADMIN_SCENARIOS = [
+    ("boglanish_inbox", 2, boglanish_inbox),
+    ("boglanish_submit", 2, boglanish_submit),
+    ("guruh_crud", 1, guruh_crud),
+    ("yangilik_crud", 1, yangilik_crud),
+    ("qonun_crud", 1, qonun_crud),
+]
+
+
+def select_scenarios(args, ctx: Context) -> list[tuple]:
+    scenarios = PUBLIC_SCENARIOS + ([] if args.no_admin else ADMIN_SCENARIOS)
+    if ctx.image_extension != ".jpg":
+        # Pillow'siz yaratilgan ma'lumotlar: /img o'lchamlarini tayyorlab bo'lmaydi
+        scenarios = [s for s in scenarios if s[0] != "img"]
+    if args.only:
+        scenarios = [s for s in scenarios if re.search(args.only, s[0])]
+    if args.skip:
+        scenarios = [s for s in scenarios if not re.search(args.skip, s[0])]
+    if not scenarios:
+        raise SystemExit("Tanlangan ssenariy yo'q")
+    return scenarios
+
+
+async def worker(client, ctx: Context, rec: Recorder, scenarios, stop: asyncio.Event, seed: int):
+    rng = random.Random(seed)
+    weights = [weight for _, weight, _ in scenarios]
+    while not stop.is_set():
+        _, _, scenario = rng.choices(scenarios, weights)[0]
+        await scenario(client, ctx, rec, rng)
+
+
+async def login(client: httpx.AsyncClient, manifest: dict) -> dict:
+    response = await client.post("/admin-auth/login", data=manifest["admin"])
+    response.raise_for_status()
+    return {"authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(rec: Recorder, seconds: float) -> dict:
+    scenarios = {}
+    for name, samples in sorted(rec.samples.items()):
+        scenarios[name] = {
+            "count": len(samples),
+            "errors": rec.errors.get(name, 0),
+            "rps": round(len(samples) / seconds, 2),
+            "p50": round(percentile(samples, 50), 3),
+            "p95": round(percentile(samples, 95), 3),
+            "p99": round(percentile(samples, 99), 3),
+            "max": round(max(samples), 3),
+        }
+    total = sum(s["count"] for s in scenarios.values())
+    return {
+        "requests": total,
+        "errors": sum(s["errors"] for s in scenarios.values()),
+        "rps": round(total / seconds, 2),
+        "scenarios": scenarios,
+    }
+
+
+def print_report(results: dict, rec: Recorder):
+    header = ("so'rov", "soni", "xato", "rps", "p50 ms", "p95 ms", "p99 ms", "max ms")
+    print("{:<48}{:>8}{:>6}{:>9}{:>9}{:>9}{:>9}{:>9}".format(*header))
+    for name, s in results["scenarios"].items():
+        print(f"{name:<48}{s['count']:>8}{s['errors']:>6}{s['rps']:>9.1f}"
+              f"{s['p50']:>9.2f}{s['p95']:>9.2f}{s['p99']:>9.2f}{s['max']:>9.1f}")
+    print(f"Jami: {results['requests']} so'rov, {results['errors']} xato, {results['rps']:.1f} RPS")
+    for name, detail in rec.error_samples.items():
+        print(f"  xato namunasi {name}: {detail}", file=sys.stderr)
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    """Baseline'ga nisbatan yomonlashgan ko'rsatkichlar ro'yxati."""
+    problems = []
+    for key in ("scale", "mode", "concurrency", "response_cache"):
+        if baseline["meta"].get(key) != results["meta"].get(key):
+            print(f"Ogohlantirish: baseline {key}={baseline['meta'].get(key)!r}, "
+                  f"hozir {results['meta'].get(key)!r}", file=sys.stderr)
+    for name, base in baseline["scenarios"].items():
+        current = results["scenarios"].get(name)
+        if current is None:
+            continue
+        if current["p95"] > base["p95"] * (1 + tolerance) and current["p95"] - base["p95"] > min_delta_ms:
+            problems.append(f"{name}: p95 {base['p95']:.2f} -> {current['p95']:.2f} ms")
+        if current["errors"] > base["errors"]:
+            problems.append(f"{name}: xatolar {base['errors']} -> {current['errors']}")
+    # Umumiy RPS faqat bir xil ssenariylar to'plami uchun solishtiriladi (--only/--skip)
+    same_mix = baseline["meta"].get("selected") == results["meta"].get("selected")
+    if same_mix and results["rps"] < baseline["rps"] * (1 - tolerance):
+        problems.append(f"jami RPS {baseline['rps']:.1f} -> {results['rps']:.1f}")
+    return problems
+
+
+async def run_load(client, ctx: Context, scenarios, args) -> Recorder:
+    rec = Recorder()
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(worker(client, ctx, rec, scenarios, stop, args.seed + i))
+             for i in range(args.concurrency)]
+    await asyncio.sleep(args.warmup)
+    rec.recording = True
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    rec.recording = False
+    await asyncio.gather(*tasks)
+    return rec
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(client: httpx.AsyncClient, process, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"uvicorn {process.returncode} kodi bilan to'xtadi")
+        try:
+            if (await client.get("/tizimlar/")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("Server ishga tushmadi")
+
+
+async def run(args) -> dict:
+    data = os.path.abspath(args.data)
+    env = app_env(data, args.response_cache)
+
+    if args.mode == "inprocess":
+        # Ilova modullari import paytida sozlamalarni o'qiydi, shuning uchun muhit
+        # va ishchi papka (static/, cache/) importdan oldin o'rnatiladi
+        os.environ.update(env)
+        os.chdir(data)
+    from benchmarks.dataset import PDF_BYTES, load_manifest
+
+    manifest = load_manifest(data)
+    with open(os.path.join(data, "static", "images",
+                           f"bench-000000{manifest['image_extension']}"), "rb") as f:
+        image_bytes = f.read()
+    ctx = Context(counts=manifest["counts"], images=manifest["images"],
+                  image_extension=manifest["image_extension"], image_bytes=image_bytes,
+                  pdf_bytes=PDF_BYTES)
+    scenarios = select_scenarios(args, ctx)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    process = None
+    if args.mode == "inprocess":
+        from main import app
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                   base_url="http://bench", timeout=120)
+    else:
+        url = args.url
+        if url is None:
+            port = _free_port()
+            url = f"http://127.0.0.1:{port}"
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", REPO_DIR,
+                 "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers),
+                 "--log-level", "warning", "--no-access-log"],
+                cwd=data, env={**os.environ, **env})
+        client = httpx.AsyncClient(base_url=url, timeout=120, limits=limits)
+
+    try:
+        await _wait_ready(client, process)
+        if not args.no_admin:
+            ctx.admin_headers = await login(client, manifest)
+        rec = await run_load(client, ctx, scenarios, args)
+    finally:
+        await client.aclose()
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if args.mode == "inprocess":
+            await lifespan.__aexit__(None, None, None)
+
+    results = summarize(rec, args.seconds)
+    results["meta"] = {
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "http" else 1,
+        "scale": manifest["scale"],
+        "concurrency": args.concurrency,
+        "seconds": args.seconds,
+        "response_cache": args.response_cache,
+        "selected": [name for name, _, _ in scenarios],
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU",
+        "cpu": _cpu_model(),
+        "commit": _git_commit(),
+        "seed": args.seed,
+        "warmup": args.warmup,
+        "note": args.note,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    print_report(results, rec)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="bench-data", help="benchmarks.dataset ishchi papkasi")
+    parser.add_argument("--mode", choices=("inprocess", "http"), default="inprocess")
+    parser.add_argument("--url", help="http rejimida ishlab turgan server (aks holda uvicorn ishga tushiriladi)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker'lari soni")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0, help="Natijaga kirmaydigan qizdirish vaqti")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel mijozlar soni")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", help="Faqat nomi shu regex'ga mos ssenariylar")
+    parser.add_argument("--skip", help="Nomi shu regex'ga mos ssenariylarni tashlab ketish")
+    parser.add_argument("--no-admin", action="store_true", help="Faqat ochiq GET endpointlar")
+    parser.add_argument("--response-cache", action="store_true",
+                        help="Javoblar keshini yoqish (standart: o'chiq, handlerlar o'lchanadi)")
+    parser.add_argument("--output", help="Natijani JSON faylga yozish")
+    parser.add_argument("--save-baseline", help="Natijani baseline sifatida saqlash")
+    parser.add_argument("--note", help="Natija meta'siga yoziladigan izoh (mashina, sharoit)")
+    parser.add_argument("--compare", help="Baseline bilan solishtirish; yomonlashsa 1 kodi bilan chiqish")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Ruxsat etilgan yomonlashish ulushi (p95 va RPS)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="p95 farqi bundan kichik bo'lsa shovqin deb hisoblanadi")
+    args = parser.parse_args()
+    # inprocess rejimida ishchi papka o'zgaradi: nisbiy yo'llar oldindan to'liq qilinadi
+    for name in ("output", "save_baseline", "compare"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    results = asyncio.run(run(args))
+    for path in (args.output, args.save_baseline):
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if problems:
+            print("\nREGRESSIYA (baseline: %s):" % args.compare, file=sys.stderr)
+            for problem in problems:
+                print(f"  {problem}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Baseline bilan mos ({args.compare})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""SQLite o'qish/yozish raqobati benchmarki.
+
+Bir yozuvchi katta tranzaksiyalarda Yangilik qo'shib turadi, bir nechta
+o'quvchi esa /yangiliklar/ dagi kabi COUNT + sahifa so'rovini bajaradi.
+Standart (rollback journal) va tezlik profili (WAL) bilan o'quvchilarning
+kechikishi solishtiriladi.
+
+Ishga tushirish:
+    python -m benchmarks.sqlite_concurrency --seconds 5 --readers 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import Base, install_sqlite_tuning
+from models.yangiliklar import Yangilik
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def writer(engine, stop: asyncio.Event, batch: int):
+    rows = [{"name": f"Yangilik {i}", "text": "x" * 2000, "rasm": "static/images/default.png"}
+            for i in range(batch)]
+    writes = 0
+    while not stop.is_set():
+        async with engine.begin() as conn:
+            await conn.execute(insert(Yangilik), rows)
+        writes += 1
+        await asyncio.sleep(0)
+    return writes
+
+
+async def reader(engine, stop: asyncio.Event, latencies: list[float], errors: list[str]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(select(func.count()).select_from(Yangilik))
+                await conn.execute(select(Yangilik).order_by(Yangilik.id).limit(10))
+        except OperationalError as e:
+            errors.append(str(e.orig))
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run_profile(tuned: bool, seconds: float, readers: int, batch: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix="tmsiti-bench-"), "bench.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        pool_size=readers + 1,
+        max_overflow=0,
+        connect_args={"timeout": 5},
+    )
+    if tuned:
+        install_sqlite_tuning(engine.sync_engine)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Yangilik.__table__])
+
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    errors: list[str] = []
+    tasks = [asyncio.create_task(reader(engine, stop, latencies, errors))
+             for _ in range(readers)]
+    writer_task = asyncio.create_task(writer(engine, stop, batch))
+    await asyncio.sleep(seconds)
+    stop.set()
+    writes = await writer_task
+    await asyncio.gather(*tasks)
+    await engine.dispose()
+
+    return {
+        "profile": "WAL (tuned)" if tuned else "rollback (default)",
+        "reads": len(latencies),
+        "writes": writes,
+        "errors": len(errors),
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=0.0),
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=500,
+                        help="Har bir yozish tranzaksiyasidagi qatorlar soni")
+    args = parser.parse_args()
+
+    header = ("profil", "o'qish", "yozish", "xato", "p50 ms", "p99 ms", "max ms")
+    print("{:<20}{:>8}{:>8}{:>6}{:>10}{:>10}{:>10}".format(*header))
+    for tuned in (False, True):
+        r = await run_profile(tuned, args.seconds, args.readers, args.batch)
+        print(f"{r['profile']:<20}{r['reads']:>8}{r['writes']:>8}{r['errors']:>6}"
+              f"{r['p50']:>10.2f}{r['p99']:>10.2f}{r['max']:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
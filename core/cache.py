@@ -0,0 +1,274 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import getenv
+from urllib.parse import parse_qsl, urlencode
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RESPONSE_CACHE_ENABLED = getenv(
+    "RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+RESPONSE_CACHE_TTL = float(getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Har bir yozuvning kalit, sarlavha va obyekt uchun taxminiy qo'shimcha hajmi
+ENTRY_OVERHEAD = 512
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+@dataclass
+class CacheEntry:
+    namespace: str
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+    # Javobni bergan route: keshdan berilganda ham metrikalar shu route nomida yoziladi
+    route: object = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers) + ENTRY_OVERHEAD
+
+
+class ResponseCache:
+    """TTL va LRU bo'yicha chiqarib yuboriladigan, xotira hajmi cheklangan kesh."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._namespaces: dict[str, set[str]] = {}
+        # Har bir bekor qilishda oshadi: bekor qilishdan oldin boshlangan javob keshga yozilmaydi
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def generation(self, namespace: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(namespace, 0)
+
+    def set(self, key: str, namespace: str, status: int,
+            headers: list[tuple[bytes, bytes]], body: bytes, route=None,
+            generation: tuple[int, int] | None = None):
+        """generation berilsa va shu orada namespace bekor qilingan bo'lsa, javob saqlanmaydi."""
+        if generation is not None and generation != self.generation(namespace):
+            return
+        entry = CacheEntry(namespace, status, headers, body,
+                           time.monotonic() + self.ttl, route)
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._namespaces.setdefault(namespace, set()).add(key)
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate(self, namespace: str):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for key in list(self._namespaces.get(namespace, ())):
+            self._remove(key)
+
+    def clear(self):
+        self._epoch += 1
+        self._entries.clear()
+        self._namespaces.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        keys = self._namespaces.get(entry.namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[entry.namespace]
+
+
+response_cache = ResponseCache(
+    ttl=RESPONSE_CACHE_TTL,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=RESPONSE_CACHE_MAX_BYTES,
+)
+
+
+def namespace_of(path: str) -> str:
+    # Router prefiksi yo'lning birinchi segmenti: /yangiliklar/2/for_admin/ -> /yangiliklar
+    return "/" + path.lstrip("/").split("/", 1)[0]
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"),
+                                       keep_blank_values=True)))
+    return f"{path}?{query}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _header(scope, name: bytes) -> bytes | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def _entry_header(entry: CacheEntry, name: bytes) -> bytes | None:
+    for key, value in entry.headers:
+        if key == name:
+            return value
+    return None
+
+
+class ResponseCacheMiddleware:
+    """Ochiq GET ro'yxatlarini keshlaydigan ASGI middleware.
+
+    Kesh urilganda so'rov routerga umuman yetib bormaydi: na DB so'rovi,
+    na Pydantic serializatsiyasi bajariladi. Shu router (yoki unga bog'liq
+    routerlar) ichidagi har qanday POST/PUT/PATCH/DELETE tegishli
+    yozuvlarni bekor qiladi.
+    """
+
+    def __init__(self, app, cache: ResponseCache, cached_prefixes,
+                 dependencies: dict[str, tuple[str, ...]] | None = None,
+                 enabled: bool = RESPONSE_CACHE_ENABLED):
+        self.app = app
+        self.cache = cache
+        self.cached_prefixes = set(cached_prefixes)
+        self.dependencies = dependencies or {}
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        namespace = namespace_of(path)
+
+        if method in MUTATING_METHODS:
+            await self._handle_mutation(scope, receive, send, namespace)
+            return
+
+        if method != "GET" or not self._cacheable(scope, namespace):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(path, scope.get("query_string", b""))
+        entry = self.cache.get(key)
+        if entry is not None:
+            scope["route"] = entry.route
+            if_none_match = _header(scope, b"if-none-match")
+            etag = _entry_header(entry, b"etag")
+            if etag and if_none_match and etag_matches(if_none_match.decode("latin-1"),
+                                                      etag.decode("latin-1")):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(k, v) for k, v in entry.headers
+                                if k in (b"etag", b"last-modified", b"cache-control")],
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": entry.headers + [(b"x-cache", b"HIT")],
+            })
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        await self._fill(scope, receive, send, key, namespace)
+
+    def _cacheable(self, scope, namespace: str) -> bool:
+        if namespace not in self.cached_prefixes or "for_admin" in scope["path"]:
+            return False
+        for name, _ in scope["headers"]:
+            if name == b"authorization":
+                return False
+        return True
+
+    async def _fill(self, scope, receive, send, key: str, namespace: str):
+        start = {}
+        chunks: list[bytes] = []
+        storable = True
+        # Handler DB'ni o'qiyotganda parallel yozish commit qilib keshni bekor qilsa,
+        # eski ma'lumotli javob TTL davomida qayta keshlanib qolmasligi kerak
+        generation = self.cache.generation(namespace)
+
+        async def send_wrapper(message):
+            nonlocal storable
+            if message["type"] == "http.response.start":
+                start.update(message)
+                storable = message["status"] == 200 and not any(
+                    k == b"cache-control" and b"no-store" in v for k, v in message.get("headers", []))
+                message = {**message, "headers": list(
+                    message.get("headers", [])) + [(b"x-cache", b"MISS")]}
+            elif message["type"] == "http.response.body" and storable:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache.set(key, namespace, start["status"],
+                                   list(start.get("headers", [])), b"".join(chunks),
+                                   route=scope.get("route"), generation=generation)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _handle_mutation(self, scope, receive, send, namespace: str):
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 4xx javoblar hech narsani o'zgartirmaydi; 5xx da commit bo'lgan bo'lishi mumkin
+            if status < 400 or status >= 500:
+                self.invalidate(namespace)
+
+    def invalidate(self, namespace: str):
+        self.cache.invalidate(namespace)
+        for dependent in self.dependencies.get(namespace, ()):
+            self.cache.invalidate(dependent)
@@ -0,0 +1,93 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "pending_changes"
+# Ta'sirlangan qatorlarni o'zi record_change bilan yozadigan DML so'rovlari (core/crud.py)
+# shu opsiya bilan bajariladi - ular uchun "qator noma'lum" yozuvi qo'shilmaydi
+CHANGES_RECORDED = "changes_recorded"
+
+
+@dataclass
+class Change:
+    table: str
+    op: str  # "insert", "update" yoki "delete"
+    # insert()/update()/delete() so'rovlarida qaysi qator ta'sirlangani noma'lum - None
+    obj: object | None
+    # update uchun: o'zgargan ustunlarning eski qiymatlari
+    previous: dict = field(default_factory=dict)
+
+
+_listeners: list[Callable[[list[Change]], None]] = []
+
+
+def on_commit(listener: Callable[[list[Change]], None]):
+    """Commit muvaffaqiyatli bo'lgandan keyin o'zgarishlar ro'yxatini oluvchi funksiyani ro'yxatdan o'tkazadi."""
+    _listeners.append(listener)
+    return listener
+
+
+def record_change(session, change: Change):
+    """Flush'dan o'tmaydigan o'zgarishni commit'da tinglovchilarga yetkazish uchun qo'shadi."""
+    session.info.setdefault(_SESSION_KEY, []).append(change)
+
+
+def pending_changes(session) -> list[Change]:
+    """Sessiyada hali commit bo'lmagan o'zgarishlar (before_commit tinglovchilari uchun)."""
+    return session.info.get(_SESSION_KEY, [])
+
+
+def _previous_values(obj) -> dict:
+    previous = {}
+    state = inspect(obj)
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.deleted:
+            previous[attr.key] = history.deleted[0]
+    return previous
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    changes = session.info.setdefault(_SESSION_KEY, [])
+    for obj in session.new:
+        changes.append(Change(obj.__table__.name, "insert", obj))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changes.append(Change(obj.__table__.name, "update",
+                                  obj, _previous_values(obj)))
+    for obj in session.deleted:
+        changes.append(Change(obj.__table__.name, "delete", obj))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(state):
+    # ORM DML so'rovlari flush'dan o'tmaydi
+    if state.execution_options.get(CHANGES_RECORDED):
+        return
+    if state.is_orm_statement and (state.is_insert or state.is_update or state.is_delete):
+        op = "insert" if state.is_insert else "update" if state.is_update else "delete"
+        state.session.info.setdefault(_SESSION_KEY, []).append(
+            Change(state.statement.table.name, op, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session):
+    changes = session.info.pop(_SESSION_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        try:
+            listener(changes)
+        except Exception:
+            logger.exception("O'zgarishlar tinglovchisida xato: %r", listener)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_SESSION_KEY, None)
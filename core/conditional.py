@@ -0,0 +1,54 @@
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timezone
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import cache_key, etag_matches
+from core.database import get_db
+from core.versions import get_table_versions
+
+
+def _not_modified_since(if_modified_since: str | None, last_modified) -> bool:
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since.replace(tzinfo=timezone.utc)
+
+
+def conditional_get(*models):
+    """GET javoblari uchun ETag/Last-Modified qo'yadigan va 304 qaytaradigan dependency.
+
+    ETag jadval hisoblagichlari va so'rov yo'lidan olinadi, shuning uchun
+    mos kelganda sahifa so'rovi umuman bajarilmaydi.
+    """
+    tables = tuple(model.__tablename__ for model in models)
+
+    async def dependency(request: Request, response: Response,
+                         db: AsyncSession = Depends(get_db)):
+        versions = await get_table_versions(db, tables)
+        seed = "|".join(f"{t}:{versions.get(t, (0, None))[0]}" for t in tables)
+        seed += "|" + cache_key(request.url.path, request.scope.get("query_string", b""))
+        etag = '"' + hashlib.blake2b(seed.encode(),
+                                     digest_size=16).hexdigest() + '"'
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        stamps = [ts for _, ts in versions.values() if ts is not None]
+        last_modified = max(stamps).replace(tzinfo=timezone.utc) if stamps else None
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if etag_matches(if_none_match, etag) or (
+            if_none_match is None
+            and _not_modified_since(request.headers.get("if-modified-since"), last_modified)
+        ):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
+    return Depends(dependency)
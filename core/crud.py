@@ -0,0 +1,236 @@
+from functools import wraps
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.dependencies import get_current_admin
+from core.changes import CHANGES_RECORDED, Change, record_change
+from core.conditional import conditional_get
+from core.database import get_db
+from core.pagination import CURSOR_QUERY, WITH_TOTAL_QUERY, paginate
+from core.storage import release_file
+
+
+class CRUD:
+    """Bitta model uchun umumiy CRUD amallari.
+
+    Yozish amallari RETURNING bilan bitta so'rovda bajariladi: commit'dan
+    keyin refresh ham, o'chirishdan oldin alohida SELECT ham kerak emas.
+    file_fields - diskdagi fayl yo'lini saqlaydigan ustunlar: almashtirilgan
+    yoki o'chirilgan yozuvning fayllari core/storage orqali bo'shatiladi
+    (shared_files'dagi umumiy fayllardan tashqari). load - javob uchun
+    RETURNING natijasiga yuklanadigan bog'lanishlar (selectinload(...)).
+    track_fields - o'zgarish tinglovchilari (core/changes) eski qiymatini
+    bilishi kerak bo'lgan ustunlar, masalan tashqi kalitlar.
+    """
+
+    def __init__(self, model, not_found: str, file_fields: tuple[str, ...] = (), *,
+                 load: tuple = (), track_fields: tuple[str, ...] = (),
+                 shared_files: tuple[str, ...] = ()):
+        self.model = model
+        self.not_found = not_found
+        self.file_fields = file_fields
+        self.load = load
+        self.track_fields = track_fields
+        self.shared_files = shared_files
+        self.id_col = model.__mapper__.primary_key[0]
+
+    def _not_found(self):
+        return HTTPException(status_code=404, detail=self.not_found)
+
+    def _record(self, db: AsyncSession, op: str, obj, previous: dict | None = None):
+        # RETURNING qatorni beradi: tinglovchilar aynan shu yozuv bo'yicha ishlaydi
+        record_change(db, Change(self.model.__tablename__, op, obj, previous or {}))
+
+    async def release(self, db: AsyncSession, path: str | None):
+        if path not in self.shared_files:
+            await release_file(db, path)
+
+    async def page(self, db: AsyncSession, *, page: int, per_page: int,
+                   cursor: str | None = None, with_total: bool = True, query=None) -> dict:
+        if query is None:
+            query = select(self.model)
+        return await paginate(db, query, self.id_col, page=page, per_page=per_page,
+                              cursor=cursor, with_total=with_total)
+
+    async def get(self, db: AsyncSession, id: int):
+        obj = await db.get(self.model, id, options=self.load)
+        if obj is None:
+            raise self._not_found()
+        return obj
+
+    async def create(self, db: AsyncSession, values: dict):
+        result = await db.scalars(
+            insert(self.model).values(**values).returning(self.model)
+            .options(*self.load)
+            .execution_options(**{CHANGES_RECORDED: True})
+        )
+        obj = result.one()
+        self._record(db, "insert", obj)
+        await db.commit()
+        return obj
+
+    async def update(self, db: AsyncSession, id: int, values: dict):
+        """Faqat values'dagi ustunlarni yangilaydi; yozuv bo'lmasa 404."""
+        if not values:
+            return await self.get(db, id)
+
+        files = [field for field in self.file_fields if field in values]
+        tracked = [field for field in self.track_fields if field in values]
+        old = {}
+        if files or tracked:
+            # Almashtirilayotgan fayllar va kuzatiladigan ustunlarning eski qiymatlari
+            # (faqat shu ustunlar o'qiladi)
+            columns = files + tracked
+            row = (await db.execute(
+                select(*(getattr(self.model, f) for f in columns))
+                .where(self.id_col == id)
+            )).first()
+            if row is None:
+                raise self._not_found()
+            old = dict(zip(columns, row))
+
+        result = await db.scalars(
+            update(self.model).where(self.id_col == id).values(**values)
+            .returning(self.model)
+            .options(*self.load)
+            .execution_options(populate_existing=True, **{CHANGES_RECORDED: True})
+        )
+        obj = result.one_or_none()
+        if obj is None:
+            raise self._not_found()
+        for field in files:
+            if old[field] != values[field]:
+                await self.release(db, old[field])
+        self._record(db, "update", obj,
+                     {f: old[f] for f in tracked if old[f] != values[f]})
+        await db.commit()
+        return obj
+
+    async def delete(self, db: AsyncSession, id: int):
+        result = await db.scalars(
+            delete(self.model).where(self.id_col == id).returning(self.model)
+            .execution_options(**{CHANGES_RECORDED: True})
+        )
+        obj = result.one_or_none()
+        if obj is None:
+            raise self._not_found()
+        for field in self.file_fields:
+            await self.release(db, getattr(obj, field))
+        self._record(db, "delete", obj)
+        await db.commit()
+        return obj
+
+
+def _guarded(form, error: str):
+    """Forma dependency'sidagi kutilmagan xatoni endpointdagidek 500 ga aylantiradi."""
+
+    @wraps(form)
+    async def dependency(*args, **kwargs):
+        try:
+            return await form(*args, **kwargs)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"{error}: {str(e)}")
+
+    return dependency
+
+
+def add_crud_routes(router: APIRouter, crud: CRUD, *, deleted_message: str, delete_error: str,
+                    page_model=None, out_model=None, related_models: tuple = (),
+                    create_form=None, create_error: str = "",
+                    update_form=None, update_error: str = "",
+                    path: str = "", docs: dict | None = None):
+    """Routerga bir xil ko'rinishdagi CRUD endpointlarini qo'shadi.
+
+    Ochiq ro'yxat page_model berilganda, yaratish/yangilash esa create_form/
+    update_form berilganda qo'shiladi. Forma - maydonlarni tekshirib, fayllarni
+    saqlab, ustun qiymatlari lug'atini qaytaradigan async dependency.
+    Admin tekshiruvi formadan oldin bajariladi: ruxsatsiz so'rovning fayli
+    saqlanmaydi. docs - "list"/"create"/"update"/"delete" bo'yicha summary,
+    description kabi endpoint parametrlari.
+    """
+    docs = docs or {}
+
+    if page_model is not None:
+        @router.get(f"{path}/", response_model=page_model,
+                    dependencies=[conditional_get(crud.model, *related_models)],
+                    **docs.get("list", {}))
+        async def get_all(
+            db: AsyncSession = Depends(get_db),
+            page: int = Query(
+                1, ge=1, description="Sahifa raqami, 1 dan kam bo'lmasligi kerak."),
+            per_page: int = Query(
+                10, ge=1, le=100, description="Har bir sahifadagi elementlar soni, 1-100 oralig'ida."),
+            cursor: str | None = CURSOR_QUERY,
+            with_total: bool = WITH_TOTAL_QUERY
+        ):
+            try:
+                page_data = await crud.page(db, page=page, per_page=per_page,
+                                            cursor=cursor, with_total=with_total)
+                return page_model(**page_data)
+            except HTTPException as e:
+                raise e
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Ma'lumotlarni olishda xato yuz berdi: {str(e)}"
+                )
+
+    if create_form is not None:
+        @router.post(f"{path}/for_admin/", response_model=out_model,
+                     **docs.get("create", {}))
+        async def create(
+            current_admin=Depends(get_current_admin),
+            values: dict = Depends(_guarded(create_form, create_error)),
+            db: AsyncSession = Depends(get_db)
+        ):
+            try:
+                return await crud.create(db, values)
+            except HTTPException as e:
+                raise e
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"{create_error}: {str(e)}"
+                )
+
+    if update_form is not None:
+        @router.put(f"{path}/{{id}}/for_admin/", response_model=out_model,
+                    **docs.get("update", {}))
+        async def update(
+            id: int,
+            current_admin=Depends(get_current_admin),
+            values: dict = Depends(_guarded(update_form, update_error)),
+            db: AsyncSession = Depends(get_db)
+        ):
+            try:
+                return await crud.update(db, id, values)
+            except HTTPException as e:
+                raise e
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"{update_error}: {str(e)}"
+                )
+
+    @router.delete(f"{path}/{{id}}/for_admin/", **docs.get("delete", {}))
+    async def delete(
+        id: int,
+        db: AsyncSession = Depends(get_db),
+        current_admin=Depends(get_current_admin)
+    ):
+        try:
+            await crud.delete(db, id)
+            return {"message": deleted_message}
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"{delete_error}: {str(e)}"
+            )
+
+    return router
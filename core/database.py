@@ -1,9 +1,101 @@
+from os import getenv
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
-DATABASE_URL = "sqlite+aiosqlite:///./db/tmsiti.db"
+from core.metrics import METRICS_ENABLED, install_db_metrics
+from core.profiler import SQL_PROFILE, install_db_profiler
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _normalize_url(url: str) -> str:
+    # Render/Heroku kabi xizmatlar "postgres://" beradi, bizga async drayver kerak
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://"):
+        url = "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+
+DATABASE_URL = _normalize_url(
+    getenv("DATABASE_URL") or "sqlite+aiosqlite:///./db/tmsiti.db")
+DB_ECHO = _env_bool("DB_ECHO", False)
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_TIMEOUT = int(getenv("DB_POOL_TIMEOUT", "30"))
+
+# SQLite uchun tezlik profili: WAL rejimida o'quvchilar yozuvchini kutmaydi
+SQLITE_TUNING = _env_bool("SQLITE_TUNING", True)
+SQLITE_SYNCHRONOUS = getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE = int(getenv("SQLITE_CACHE_SIZE", "-65536"))  # manfiy = KiB
+SQLITE_MMAP_SIZE = int(getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT = int(getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms
+
+database_url = make_url(DATABASE_URL)
+IS_SQLITE = database_url.get_backend_name() == "sqlite"
+IS_POSTGRES = database_url.get_backend_name() == "postgresql"
+
+
+def _engine_options() -> dict:
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    # Xotiradagi SQLite StaticPool ishlatadi, unga pool sozlamalari berilmaydi
+    if IS_SQLITE and database_url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def sqlite_pragmas() -> list[str]:
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size={SQLITE_CACHE_SIZE}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}",
+    ]
+
+
+def install_sqlite_tuning(sync_engine: Engine):
+    """Har bir yangi SQLite ulanishiga PRAGMA profilini qo'llaydi."""
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in sqlite_pragmas():
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+engine = create_async_engine(DATABASE_URL, **_engine_options())
+
+if IS_SQLITE and SQLITE_TUNING:
+    install_sqlite_tuning(engine.sync_engine)
+
+if METRICS_ENABLED:
+    install_db_metrics(engine.sync_engine)
+
+if SQL_PROFILE:
+    install_db_profiler(engine.sync_engine)
 
 async_session = async_sessionmaker(
     bind=engine,
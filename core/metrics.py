@@ -0,0 +1,217 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+load_dotenv()
+
+METRICS_ENABLED = getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (16 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2)
+
+# Hech bir routega mos kelmagan so'rovlar bitta yorliqqa yig'iladi (yorliqlar soni cheklangan)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Prometheus histogrammasi: kuzatish bitta bisect va ikkita qo'shish."""
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...],
+                 labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        # yorliqlar -> [har bir oraliq soni (+Inf bilan), yig'indi]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(names, labels + (format_value(bound),))} "
+                             f"{cumulative}")
+            label_text = format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, buckets, labels: tuple[str, ...] = ()) -> Histogram:
+        metric = Histogram(name, help, buckets, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> list[str]:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return lines
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "http_requests_total", "HTTP so'rovlar soni", ("method", "route", "status"))
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "So'rovni bajarish vaqti", LATENCY_BUCKETS,
+    ("method", "route"))
+REQUEST_STATEMENTS = registry.histogram(
+    "http_request_db_statements", "Bitta so'rovdagi SQL so'rovlar soni", STATEMENT_BUCKETS,
+    ("method", "route"))
+REQUEST_DB_DURATION = registry.histogram(
+    "http_request_db_duration_seconds", "Bitta so'rov davomida bazada o'tgan vaqt",
+    LATENCY_BUCKETS, ("method", "route"))
+DB_STATEMENTS = registry.counter(
+    "db_statements_total", "Barcha SQL so'rovlar soni (fon vazifalari bilan)")
+DB_DURATION = registry.counter(
+    "db_duration_seconds_total", "Barcha SQL so'rovlarda o'tgan vaqt")
+UPLOAD_BYTES = registry.histogram(
+    "upload_bytes", "Yuklangan fayl hajmi", SIZE_BUCKETS, ("folder",))
+UPLOAD_DURATION = registry.histogram(
+    "upload_duration_seconds", "Faylni qabul qilish (diskka yozish va tekshirish) vaqti",
+    LATENCY_BUCKETS, ("folder",))
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+# Joriy so'rovning hisoblagichlari; engine hodisalari shu obyektni to'ldiradi
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+_QUERY_START_KEY = "metrics_query_start"
+
+
+def install_db_metrics(sync_engine: Engine):
+    """SQL so'rovlar soni va vaqtini engine hodisalaridan yig'adi."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_QUERY_START_KEY].pop()
+        DB_STATEMENTS.inc()
+        DB_DURATION.inc(amount=elapsed)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # Xato bilan tugagan so'rov uchun after_cursor_execute chaqirilmaydi
+        connection = context.connection
+        if connection is not None and connection.info.get(_QUERY_START_KEY):
+            connection.info[_QUERY_START_KEY].pop()
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mount (masalan /static) route obyektini qo'ymaydi
+    root_path = scope.get("root_path", "")
+    return root_path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Har bir HTTP so'rov uchun vaqt, status va SQL hisoblagichlarini yozadi.
+
+    Yo'l emas, route shabloni (/yangiliklar/{id}/for_admin/) yorliq bo'ladi,
+    shuning uchun seriyalar soni routelar soni bilan cheklangan.
+    """
+
+    def __init__(self, app, enabled: bool = METRICS_ENABLED):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_stats.reset(token)
+            labels = (scope["method"], route_label(scope))
+            REQUESTS.inc(labels + (status,))
+            REQUEST_DURATION.observe(labels, elapsed)
+            REQUEST_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_DB_DURATION.observe(labels, stats.db_seconds)
@@ -0,0 +1,29 @@
+import logging
+
+from sqlalchemy import inspect
+
+logger = logging.getLogger(__name__)
+
+
+def sync_table(connection, table) -> set[str]:
+    """Mavjud jadvalga modelda bor, bazada yo'q ustun va indekslarni qo'shadi.
+
+    create_all faqat yangi jadvallarni yaratadi; Alembic'gacha qurilgan
+    bazani boshlang'ich revision'ga keltirishda (migrations/versions/0001)
+    keyin qo'shilgan nullable ustunlar va indekslar shu yerda qo'shiladi.
+    Qo'shilgan ustunlar nomini qaytaradi (to'ldirish chaqiruvchining ishi).
+    """
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    quote = connection.dialect.identifier_preparer.quote
+    added = set()
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_type = column.type.compile(dialect=connection.dialect)
+        connection.exec_driver_sql(
+            f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}")
+        logger.info("%s jadvaliga %s ustuni qo'shildi", table.name, column.name)
+        added.add(column.name)
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+    return added
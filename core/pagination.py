@@ -0,0 +1,136 @@
+import base64
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CURSOR_QUERY = Query(
+    None,
+    description="Cursor (keyset) rejimi: oldingi javobdagi next_cursor yoki prev_cursor qiymati. "
+                "Bo'sh qiymat (cursor=) birinchi sahifani qaytaradi. Berilsa, page e'tiborga olinmaydi.")
+WITH_TOTAL_QUERY = Query(
+    True,
+    description="Umumiy sonni (COUNT) hisoblash. false bo'lsa, total va total_pages null qaytadi.")
+
+
+def encode_cursor(direction: str, value, id: int) -> str:
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps([direction, value, id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, order_col) -> tuple[str, object, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, value, id = json.loads(raw)
+        if direction not in ("next", "prev") or not isinstance(id, int):
+            raise ValueError(direction)
+        python_type = order_col.type.python_type
+        if value is not None and python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        return direction, value, id
+    except (ValueError, TypeError, json.JSONDecodeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Yaroqsiz cursor qiymati")
+
+
+def _seek(order_col, id_col, value, id, forward: bool):
+    # (order_col, id) juftligi bo'yicha qidiruv: indeks bo'yicha to'g'ridan-to'g'ri o'tiladi
+    if order_col is id_col:
+        return id_col > id if forward else id_col < id
+    if forward:
+        return or_(order_col > value, and_(order_col == value, id_col > id))
+    return or_(order_col < value, and_(order_col == value, id_col < id))
+
+
+async def keyset(db: AsyncSession, query, order_col, id_col, limit: int,
+                 cursor: str, descending: bool = False):
+    """Keyset sahifalash. (items, next_cursor, prev_cursor) qaytaradi."""
+    direction, value, last_id = ("next", None, None)
+    if cursor:
+        direction, value, last_id = decode_cursor(cursor, order_col)
+
+    backwards = direction == "prev"
+    # descending tartibda "oldinga" yurish kichik qiymatlar tomon bo'ladi
+    forward = backwards == descending
+    if last_id is not None:
+        query = query.where(_seek(order_col, id_col, value, last_id, forward))
+
+    columns = (order_col,) if order_col is id_col else (order_col, id_col)
+    ascending = forward
+    query = query.order_by(None).order_by(
+        *(c.asc() if ascending else c.desc() for c in columns))
+
+    result = await db.execute(query.limit(limit + 1))
+    items = list(result.scalars().unique().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+    if backwards:
+        items.reverse()
+
+    def cursor_for(direction: str, item):
+        return encode_cursor(direction, getattr(item, order_col.key), getattr(item, id_col.key))
+
+    next_cursor = prev_cursor = None
+    if items:
+        if (not backwards and has_more) or backwards:
+            next_cursor = cursor_for("next", items[-1])
+        if (backwards and has_more) or (not backwards and last_id is not None):
+            prev_cursor = cursor_for("prev", items[0])
+    return items, next_cursor, prev_cursor
+
+
+async def count(db: AsyncSession, query) -> int:
+    count_query = query.with_only_columns(
+        func.count(), maintain_column_froms=True).order_by(None)
+    return (await db.execute(count_query)).scalar()
+
+
+async def paginate(db: AsyncSession, query, order_col, *, page: int, per_page: int,
+                   cursor: str | None = None, with_total: bool = True,
+                   id_col=None, descending: bool = False) -> dict:
+    """Paginated*Out sxemalari uchun lug'at qaytaradi: offset yoki cursor rejimida."""
+    id_col = order_col if id_col is None else id_col
+    total = await count(db, query) if with_total else None
+    total_pages = (total + per_page - 1) // per_page if total is not None else None
+
+    if cursor is not None:
+        items, next_cursor, prev_cursor = await keyset(
+            db, query, order_col, id_col, per_page, cursor, descending)
+        return {
+            "items": items, "total": total, "page": None, "per_page": per_page,
+            "total_pages": total_pages, "next_cursor": next_cursor, "prev_cursor": prev_cursor,
+        }
+
+    order = (order_col,) if order_col is id_col else (order_col, id_col)
+    query = query.order_by(None).order_by(
+        *(c.desc() if descending else c for c in order))
+    result = await db.execute(query.offset((page - 1) * per_page).limit(per_page))
+    return {
+        "items": result.scalars().unique().all(), "total": total, "page": page,
+        "per_page": per_page, "total_pages": total_pages,
+        "next_cursor": None, "prev_cursor": None,
+    }
+
+
+async def list_page(db: AsyncSession, query, order_col, response: Response, *,
+                    limit: int, offset: int, cursor: str | None = None,
+                    id_col=None, descending: bool = False) -> list:
+    """Ro'yxat qaytaradigan endpointlar uchun: cursor X-Next-Cursor/X-Prev-Cursor sarlavhalarida."""
+    id_col = order_col if id_col is None else id_col
+    if cursor is not None:
+        items, next_cursor, prev_cursor = await keyset(
+            db, query, order_col, id_col, limit, cursor, descending)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if prev_cursor:
+            response.headers["X-Prev-Cursor"] = prev_cursor
+        return items
+
+    order = (order_col,) if order_col is id_col else (order_col, id_col)
+    query = query.order_by(None).order_by(
+        *(c.desc() if descending else c for c in order))
+    result = await db.execute(query.offset(offset).limit(limit))
+    return result.scalars().unique().all()
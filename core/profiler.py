@@ -0,0 +1,241 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from os import getenv
+from uuid import uuid4
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.metrics import route_label
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Debug rejimi: har bir so'rovning SQL so'rovlari vaqti bilan yoziladi
+SQL_PROFILE = getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes", "on")
+# Xotirada saqlanadigan oxirgi so'rovlar izlari soni
+SQL_PROFILE_TRACES = int(getenv("SQL_PROFILE_TRACES", "200"))
+# Bitta so'rovda shuncha marta takrorlangan bir xil shakldagi SQL N+1 deb belgilanadi
+SQL_PROFILE_REPEAT_THRESHOLD = int(getenv("SQL_PROFILE_REPEAT_THRESHOLD", "3"))
+# Izda saqlanadigan SQL matnlari chegarasi (son va vaqt baribir to'liq hisoblanadi)
+SQL_PROFILE_MAX_STATEMENTS = int(getenv("SQL_PROFILE_MAX_STATEMENTS", "500"))
+
+PROFILE_PATH_PREFIX = "/debug/profiles"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_POSITIONAL_RE = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_PARAM_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL matnidan qiymatlarni olib tashlaydi: faqat parametrlari bilan farq qiladigan
+    so'rovlar (IN ro'yxati uzunligi ham) bir xil shaklga tushadi."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _STRING_RE.sub("?", shape)
+    shape = _POSITIONAL_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    return _PARAM_LIST_RE.sub("(?)", shape)
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    query: str
+    id: str = field(default_factory=lambda: uuid4().hex)
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    started: float = field(default_factory=time.perf_counter)
+    route: str = ""
+    status: int = 0
+    # [(sql, boshlanish, davomiylik)] - so'rov boshidan sekundlarda
+    statements: list = field(default_factory=list)
+    statement_count: int = 0
+    db_seconds: float = 0.0
+    # shakl -> [soni, umumiy vaqt]
+    shapes: dict = field(default_factory=dict)
+    total_seconds: float = 0.0
+    # response_model tekshiruvi va JSON'ga yozishga ketgan vaqt (core/responses o'lchaydi)
+    serialize_seconds: float = 0.0
+
+    def record(self, statement: str, started: float, elapsed: float):
+        self.statement_count += 1
+        self.db_seconds += elapsed
+        if len(self.statements) < SQL_PROFILE_MAX_STATEMENTS:
+            self.statements.append((statement, started - self.started, elapsed))
+        stats = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+
+    def finish_headers(self, now: float):
+        """Javob sarlavhalari jo'natilayotgan paytdagi umumiy vaqt."""
+        self.total_seconds = now - self.started
+
+    def repeated(self, threshold: int = SQL_PROFILE_REPEAT_THRESHOLD) -> list[dict]:
+        return [
+            {"shape": shape, "count": count, "duration_ms": round(seconds * 1000, 3)}
+            for shape, (count, seconds) in sorted(
+                self.shapes.items(), key=lambda item: item[1][0], reverse=True)
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return ", ".join((
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statement_count} SQL"',
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+            f"total;dur={self.total_seconds * 1000:.2f}",
+        ))
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "db_ms": round(self.db_seconds * 1000, 3),
+            "statement_count": self.statement_count,
+            "n_plus_one": bool(self.repeated()),
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "query": self.query,
+            "serialize_ms": round(self.serialize_seconds * 1000, 3),
+            "repeated": self.repeated(),
+            "statements": [
+                {"sql": sql, "start_ms": round(start * 1000, 3),
+                 "duration_ms": round(elapsed * 1000, 3)}
+                for sql, start, elapsed in self.statements
+            ],
+            "truncated": self.statement_count > len(self.statements),
+        }
+
+
+class ProfileStore:
+    """Oxirgi so'rovlar izlari (eng eskisi birinchi chiqib ketadi)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def add(self, profile: RequestProfile):
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_entries:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        return self._profiles.get(profile_id)
+
+    def recent(self, limit: int, n_plus_one: bool = False) -> list[RequestProfile]:
+        profiles = []
+        for profile in reversed(self._profiles.values()):
+            if n_plus_one and not profile.repeated():
+                continue
+            profiles.append(profile)
+            if len(profiles) >= limit:
+                break
+        return profiles
+
+    def clear(self):
+        self._profiles.clear()
+
+
+profile_store = ProfileStore(SQL_PROFILE_TRACES)
+
+# Joriy so'rovning izi; engine hodisalari SQL so'rovlarni shunga yozadi
+request_profile: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+
+@contextmanager
+def serialize_timer():
+    """Ichidagi ish vaqtini joriy so'rov izining serialize_seconds'iga qo'shadi."""
+    profile = request_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialize_seconds += time.perf_counter() - started
+
+
+def install_db_profiler(sync_engine: Engine):
+    """Har bir SQL so'rovni (matni va vaqti bilan) joriy so'rov iziga yozadi."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and request_profile.get() is not None:
+            context.profiler_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = request_profile.get()
+        started = getattr(context, "profiler_started", None)
+        if profile is not None and started is not None:
+            profile.record(statement, started, time.perf_counter() - started)
+
+
+class ProfilerMiddleware:
+    """SQL_PROFILE rejimida har bir javobga Server-Timing va X-Profile-Id qo'shadi.
+
+    To'liq iz (SQL matnlari, vaqtlari, takrorlangan shakllar) adminlar uchun
+    /debug/profiles/{id} orqali olinadi. Bir xil shakldagi so'rov
+    SQL_PROFILE_REPEAT_THRESHOLD martadan ko'p bajarilsa log'ga ogohlantirish yoziladi.
+    """
+
+    def __init__(self, app, store: ProfileStore = profile_store, enabled: bool = SQL_PROFILE):
+        self.app = app
+        self.store = store
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if (not self.enabled or scope["type"] != "http"
+                or scope["path"].startswith(PROFILE_PATH_PREFIX)):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            method=scope["method"], path=scope["path"],
+            query=scope.get("query_string", b"").decode("latin-1"))
+        token = request_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                profile.finish_headers(time.perf_counter())
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"server-timing", profile.server_timing().encode("latin-1")),
+                    (b"x-profile-id", profile.id.encode("latin-1")),
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_profile.reset(token)
+            profile.route = route_label(scope)
+            if not profile.status:
+                profile.status = 500
+                profile.finish_headers(time.perf_counter())
+            self.store.add(profile)
+            for repeated in profile.repeated():
+                logger.warning("N+1 gumon: %s %s - %d marta (%.1f ms): %s",
+                               profile.method, profile.route, repeated["count"],
+                               repeated["duration_ms"], repeated["shape"])
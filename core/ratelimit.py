@@ -0,0 +1,185 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import getenv
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+
+load_dotenv()
+
+LOGIN_RATE_WINDOW = float(getenv("LOGIN_RATE_WINDOW", "300"))
+# Bitta foydalanuvchi nomi uchun oyna ichidagi muvaffaqiyatsiz urinishlar
+LOGIN_RATE_LIMIT_USERNAME = int(getenv("LOGIN_RATE_LIMIT_USERNAME", "5"))
+# Bitta IP manzildan oyna ichidagi barcha urinishlar
+LOGIN_RATE_LIMIT_IP = int(getenv("LOGIN_RATE_LIMIT_IP", "20"))
+RATE_LIMIT_MAX_KEYS = int(getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Reverse proxy ortida mijoz IP'si X-Forwarded-For'ning oxirgi qiymatidan olinadi
+RATE_LIMIT_TRUST_PROXY = getenv(
+    "RATE_LIMIT_TRUST_PROXY", "false").lower() in ("1", "true", "yes", "on")
+
+
+class RateLimitStore(ABC):
+    """Sliding window hisoblagichlari ombori.
+
+    Bir nechta worker yoki server umumiy chegaraga ega bo'lishi uchun
+    (masalan, Redis'da) shu metodlar qayta yoziladi. Hisob "sliding window
+    counter" usulida: oldingi oynaning soni o'tgan vaqtga mutanosib ravishda
+    kamayib boradi, shuning uchun bloklash o'z-o'zidan so'nadi.
+    """
+
+    @abstractmethod
+    async def retry_after(self, key: str, window: float, limit: int) -> float:
+        """Chegaraga yetilmagan bo'lsa 0, aks holda yana ruxsat beriladigan vaqtgacha soniyalar."""
+
+    @abstractmethod
+    async def hit(self, key: str, window: float) -> float:
+        """Hisoblagichni bittaga oshiradi va yangi sonni qaytaradi."""
+
+    @abstractmethod
+    async def reset(self, key: str):
+        """Kalit hisoblagichini o'chiradi."""
+
+
+@dataclass
+class _Window:
+    size: float
+    start: float
+    current: int = 0
+    previous: int = 0
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Bitta jarayon uchun xotiradagi ombor; kalitlar soni max_keys bilan cheklangan.
+
+    Kalitlar oxirgi murojaat tartibida (LRU) saqlanadi: eng uzoq tegilmagani -
+    boshida, shuning uchun tozalash faqat boshidan olib tashlaydi.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._windows: OrderedDict[str, _Window] = OrderedDict()
+
+    def __len__(self):
+        return len(self._windows)
+
+    def _roll(self, key: str, window: float, now: float, create: bool) -> _Window | None:
+        start = now - now % window
+        entry = self._windows.get(key)
+        if entry is None:
+            if not create:
+                return None
+            if len(self._windows) >= self.max_keys:
+                self._prune(now)
+            entry = self._windows[key] = _Window(size=window, start=start)
+            return entry
+        self._windows.move_to_end(key)
+        if entry.start != start:
+            entry.previous = entry.current if entry.start == start - window else 0
+            entry.current = 0
+            entry.start = start
+        return entry
+
+    def _prune(self, now: float):
+        # Ikki oynadan beri tegilmagan kalitlar hisobga hech narsa qo'shmaydi; ular boshida turadi
+        while self._windows:
+            entry = next(iter(self._windows.values()))
+            if entry.start + 2 * entry.size > now:
+                break
+            self._windows.popitem(last=False)
+        # Hujum paytida ham xotira o'smaydi: eng uzoq tegilmagan kalitlar tashlanadi
+        while len(self._windows) >= self.max_keys:
+            self._windows.popitem(last=False)
+
+    @staticmethod
+    def _weighted(entry: _Window, now: float) -> float:
+        elapsed = now - entry.start
+        return entry.previous * (1 - elapsed / entry.size) + entry.current
+
+    async def retry_after(self, key: str, window: float, limit: int) -> float:
+        now = time.time()
+        entry = self._roll(key, window, now, create=False)
+        if entry is None or self._weighted(entry, now) < limit:
+            return 0.0
+        elapsed = now - entry.start
+        if entry.current < limit:
+            # Joriy oynada: oldingi oyna ulushi kamayib chegaradan tushguncha
+            return window * (1 - (limit - entry.current) / entry.previous) - elapsed
+        # Keyingi oynada joriy son "oldingi" bo'lib kamayadi
+        return window - elapsed + window * (1 - limit / entry.current)
+
+    async def hit(self, key: str, window: float) -> float:
+        now = time.time()
+        entry = self._roll(key, window, now, create=True)
+        entry.current += 1
+        return self._weighted(entry, now)
+
+    async def reset(self, key: str):
+        self._windows.pop(key, None)
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class LoginRateLimiter:
+    """Login urinishlarini DB va bcrypt ishidan oldin cheklaydi.
+
+    IP bo'yicha har bir urinish, foydalanuvchi nomi bo'yicha esa faqat
+    muvaffaqiyatsizlari sanaladi; muvaffaqiyatli login nom hisoblagichini
+    tozalaydi.
+    """
+
+    def __init__(self, store: RateLimitStore, window: float,
+                 username_limit: int, ip_limit: int):
+        self.store = store
+        self.window = window
+        self.username_limit = username_limit
+        self.ip_limit = ip_limit
+        self.rejected = 0
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        return "login:user:" + username.strip().lower()
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return "login:ip:" + ip
+
+    def _too_many(self, retry_after: float) -> HTTPException:
+        self.rejected += 1
+        return HTTPException(
+            status_code=429,
+            detail="Juda ko'p urinish. Birozdan keyin qayta urinib ko'ring",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def check(self, username: str, ip: str):
+        retry_after = await self.store.retry_after(
+            self._username_key(username), self.window, self.username_limit)
+        if retry_after > 0:
+            raise self._too_many(retry_after)
+        retry_after = await self.store.retry_after(self._ip_key(ip), self.window, self.ip_limit)
+        if retry_after > 0:
+            raise self._too_many(retry_after)
+        await self.store.hit(self._ip_key(ip), self.window)
+
+    async def failed(self, username: str):
+        await self.store.hit(self._username_key(username), self.window)
+
+    async def succeeded(self, username: str):
+        await self.store.reset(self._username_key(username))
+
+
+login_limiter = LoginRateLimiter(
+    store=MemoryRateLimitStore(max_keys=RATE_LIMIT_MAX_KEYS),
+    window=LOGIN_RATE_WINDOW,
+    username_limit=LOGIN_RATE_LIMIT_USERNAME,
+    ip_limit=LOGIN_RATE_LIMIT_IP,
+)
@@ -0,0 +1,102 @@
+from os import getenv
+
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+from starlette.responses import JSONResponse
+from starlette.routing import request_response
+
+from core.profiler import serialize_timer
+
+try:
+    import orjson
+except ImportError:  # orjson ixtiyoriy: bo'lmasa standart json ishlatiladi
+    orjson = None
+
+load_dotenv()
+
+JSON_FAST_PATH = getenv("JSON_FAST_PATH", "true").lower() in ("1", "true", "yes", "on")
+
+
+class RawJSON:
+    """Tayyor JSON baytlari: FastJSONResponse ularni qayta kodlamaydi."""
+
+    __slots__ = ("body",)
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+class FastJSONResponse(JSONResponse):
+    """Ilovaning standart javob klassi.
+
+    response_model'li endpointlarda kontent allaqachon bayt (RawJSON);
+    qolganlarida (lug'at, ro'yxat) orjson bilan kodlanadi.
+    """
+
+    def render(self, content) -> bytes:
+        if isinstance(content, RawJSON):
+            return content.body
+        with serialize_timer():
+            if orjson is not None:
+                return orjson.dumps(content)
+            return super().render(content)
+
+
+class JSONBytesField:
+    """FastAPI response_field o'rnini bosadi: bitta TypeAdapter bilan tekshiradi
+    va to'g'ridan-to'g'ri JSON baytlarga aylantiradi.
+
+    Odatiy yo'lda javob ORM'dan tekshiriladi, Python lug'atlariga
+    (mode="json") aylantiriladi va keyin yana json.dumps qilinadi. Bu yerda
+    pydantic-core modelni oraliq lug'atlarsiz baytlarga yozadi. Natija bayt
+    darajasida bir xil, shuning uchun ETag va javoblar keshi o'zgarmaydi.
+    """
+
+    def __init__(self, annotation):
+        self.adapter = TypeAdapter(annotation)
+
+    def validate(self, value, values=None, *, loc=()):
+        try:
+            with serialize_timer():
+                return self.adapter.validate_python(value, from_attributes=True), None
+        except ValidationError as exc:
+            return None, [{**error, "loc": loc + tuple(error["loc"])}
+                          for error in exc.errors(include_url=False)]
+
+    def serialize(self, value, *, include=None, exclude=None, by_alias=True,
+                  exclude_unset=False, exclude_defaults=False, exclude_none=False) -> RawJSON:
+        with serialize_timer():
+            return RawJSON(self.adapter.dump_json(
+                value, include=include, exclude=exclude, by_alias=by_alias,
+                exclude_unset=exclude_unset, exclude_defaults=exclude_defaults,
+                exclude_none=exclude_none))
+
+
+def _response_class(route: APIRoute):
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    return response_class
+
+
+def install_json_fast_path(app: FastAPI, enabled: bool = JSON_FAST_PATH) -> int:
+    """response_model'li va FastJSONResponse qaytaradigan routelarni tez yo'lga o'tkazadi.
+
+    Barcha include_router'lardan keyin chaqiriladi. OpenAPI sxemasi
+    route.response_field'dan olinadi va o'zgarmaydi. O'tkazilgan routelar
+    sonini qaytaradi.
+    """
+    if not enabled:
+        return 0
+    installed = 0
+    for route in app.routes:
+        if (not isinstance(route, APIRoute) or route.response_field is None
+                or not issubclass(_response_class(route), FastJSONResponse)):
+            continue
+        route.secure_cloned_response_field = JSONBytesField(route.response_model)
+        route.app = request_response(route.get_route_handler())
+        installed += 1
+    return installed
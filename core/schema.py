@@ -0,0 +1,79 @@
+import asyncio
+import importlib
+import logging
+import os
+import pkgutil
+from os import getenv
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Sxema eskirgan bo'lsa startup'da migratsiyalarni o'zi bajaradi. Bir nechta
+# nusxa bir vaqtda ko'tariladigan joyda o'chiq qoladi: migratsiya deploy
+# bosqichida bir marta "alembic upgrade head" bilan bajariladi.
+DB_AUTO_MIGRATE = getenv("DB_AUTO_MIGRATE", "false").lower() in ("1", "true", "yes", "on")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(ROOT, "alembic.ini")
+
+
+def import_models():
+    """models/ dagi barcha modullarni yuklaydi: Base.metadata to'liq bo'ladi."""
+    import models
+
+    for module in pkgutil.iter_modules(models.__path__):
+        importlib.import_module(f"models.{module.name}")
+
+
+def alembic_config(url: str | None = None) -> Config:
+    config = Config(ALEMBIC_INI)
+    # Joriy papkadan qat'i nazar (benchmarks chdir qiladi) migratsiyalar topiladi
+    config.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+    if url:
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection) -> str | None:
+    """Bazadagi alembic_version qiymati; jadval bo'lmasa None."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def upgrade_schema(url: str | None = None, revision: str = "head"):
+    """alembic upgrade head. O'z event loop'ini ochadi, shuning uchun
+    ishlab turgan loop ichidan asyncio.to_thread orqali chaqiriladi."""
+    config = alembic_config(url)
+    # Ilova ichidan chaqirilganda uning logging sozlamalari o'zgartirilmaydi
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
+
+
+async def check_schema(engine):
+    """Startup tekshiruvi: saqlangan sxema versiyasini kutilgan head bilan solishtiradi.
+
+    Jadvallar aks ettirilmaydi va create_all chaqirilmaydi - bitta kichik
+    SELECT. Versiya mos kelmasa DB_AUTO_MIGRATE yoqilgan bo'lsa migratsiyalar
+    bajariladi, aks holda ilova ko'tarilmaydi.
+    """
+    async with engine.connect() as connection:
+        current = await connection.run_sync(current_revision)
+    head = head_revision()
+    if current == head:
+        return
+    if not DB_AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Baza sxemasi eskirgan ({current or 'versiyasiz'}, kerak: {head}). "
+            "\"alembic upgrade head\" ni ishga tushiring yoki DB_AUTO_MIGRATE=true qiling")
+    logger.info("Baza sxemasi yangilanmoqda: %s -> %s", current or "versiyasiz", head)
+    await asyncio.to_thread(upgrade_schema)
@@ -0,0 +1,390 @@
+import html
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import bindparam, func, inspect, select, text, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import IS_POSTGRES
+from models.elonlar import Elon
+from models.guruh import Guruh
+from models.malumotnoma import Malumotnoma
+from models.pdf_text import PdfText
+from models.qonun_qaror_farmon import QonunQarorFarmon
+from models.reglament import Reglament
+from models.smeta_resurs_norma import SmetaResursNorma
+from models.standart import Standart
+from models.stored_file import StoredFile
+from models.tmsiti_haqida import TmsitiHaqida
+from models.yangiliklar import Yangilik
+
+SQLITE_INDEX = "search_index"
+POSTGRES_INDEX = "search_documents"
+# Bitta FTS5 jadvalida rowid = id * _KIND_SLOTS + tur raqami: o'chirish rowid bo'yicha bo'ladi
+_KIND_SLOTS = 16
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+# snippet()/ts_headline belgilaydigan joylar: matn HTML sifatida ekranlangach <mark> ga
+# almashtiriladi. Unicode xususiy hududi belgilari matnda uchramaydi va escape ularga tegmaydi
+_SNIPPET_START = "\ue000"
+_SNIPPET_STOP = "\ue001"
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    number: int
+    model: type
+    title: tuple[str, ...]
+    body: tuple[str, ...] = ()
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+
+# Qidiruv turlari: /search?type=... qiymatlari. number o'zgarmasligi kerak (rowid'ning bir qismi)
+SEARCH_SOURCES = {
+    "qonun": SearchSource(1, QonunQarorFarmon, ("title", "number"), ("content", "type", "source")),
+    "yangilik": SearchSource(2, Yangilik, ("name",), ("text",)),
+    "elon": SearchSource(3, Elon, ("name",), ("description",)),
+    "standart": SearchSource(4, Standart, ("name",), ("description",)),
+    "guruh": SearchSource(5, Guruh, ("shifr", "hujjat_nomi")),
+    "smeta": SearchSource(6, SmetaResursNorma,
+                          ("yangi_ShNQ_raqami", "yangilangan_ShNQ_nomi"),
+                          ("ShNQ_raqami", "ShNQ_nomi")),
+    "reglament": SearchSource(7, Reglament, ("shifri", "nomi")),
+}
+
+
+@dataclass(frozen=True)
+class PdfSource:
+    number: int
+    model: type
+    column: str
+    title: tuple[str, ...]
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+
+# Hujjatga biriktirilgan PDF matni (services/pdf_text.py) egasi nomidan indekslanadi:
+# natijada type - egasining turi, id - uning ID'si. Faqat shu ustunlardagi PDF'lar
+# ajratiladi; murojaatlarga biriktirilgan fayllar (boglanish_form.fayl) bu yerda yo'q.
+# number SEARCH_SOURCES raqamlari bilan to'qnashmasligi kerak
+PDF_SOURCES = {
+    "guruh": PdfSource(8, Guruh, "pdf", ("shifr", "hujjat_nomi")),
+    "standart": PdfSource(9, Standart, "pdf", ("name",)),
+    "reglament": PdfSource(10, Reglament, "pdf", ("shifri", "nomi")),
+    "smeta": PdfSource(11, SmetaResursNorma, "pdf",
+                       ("yangi_ShNQ_raqami", "yangilangan_ShNQ_nomi")),
+    "malumotnoma": PdfSource(12, Malumotnoma, "hujjat", ("nomi",)),
+    "tmsiti_haqida": PdfSource(13, TmsitiHaqida, "pdf", ("pdf",)),
+}
+# type=pdf: faqat PDF matnidagi mosliklar
+PDF_KIND = "pdf"
+SEARCH_KINDS = (*SEARCH_SOURCES, *(kind for kind in PDF_SOURCES if kind not in SEARCH_SOURCES),
+                PDF_KIND)
+
+_FILES = StoredFile.__tablename__
+_TEXTS = PdfText.__tablename__
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _concat(row: str, columns: tuple[str, ...]) -> str:
+    if not columns:
+        return "''"
+    joined = " || ' ' || ".join(f"coalesce({row}.\"{column}\", '')" for column in columns)
+    return f"trim({joined})"
+
+
+def _sqlite_statements(kind: str, source: SearchSource) -> list[str]:
+    rowid = f"%s.id * {_KIND_SLOTS} + {source.number}"
+    insert = (f"INSERT INTO {SQLITE_INDEX}(rowid, kind, ref_id, title, body) "
+              f"VALUES ({rowid % 'new'}, '{kind}', new.id, "
+              f"{_concat('new', source.title)}, {_concat('new', source.body)});")
+    delete = f"DELETE FROM {SQLITE_INDEX} WHERE rowid = {rowid % 'old'};"
+    name = f"search_{kind}"
+    return [
+        f"DROP TRIGGER IF EXISTS {name}_ai",
+        f"DROP TRIGGER IF EXISTS {name}_au",
+        f"DROP TRIGGER IF EXISTS {name}_ad",
+        f"CREATE TRIGGER {name}_ai AFTER INSERT ON {source.table} BEGIN {insert} END",
+        f"CREATE TRIGGER {name}_au AFTER UPDATE ON {source.table} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER {name}_ad AFTER DELETE ON {source.table} BEGIN {delete} END",
+    ]
+
+
+def _postgres_statements(kind: str, source: SearchSource) -> list[str]:
+    name = f"search_sync_{kind}"
+    return [
+        f"""CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM {POSTGRES_INDEX} WHERE kind = '{kind}' AND ref_id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO {POSTGRES_INDEX}(kind, ref_id, title, body)
+        VALUES ('{kind}', NEW.id, {_concat('NEW', source.title)}, {_concat('NEW', source.body)});
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        f"DROP TRIGGER IF EXISTS {name} ON {source.table}",
+        f"CREATE TRIGGER {name} AFTER INSERT OR UPDATE OR DELETE ON {source.table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {name}()",
+    ]
+
+
+def _backfill_statement(kind: str, source: SearchSource) -> str:
+    if IS_POSTGRES:
+        return (f"INSERT INTO {POSTGRES_INDEX}(kind, ref_id, title, body) "
+                f"SELECT '{kind}', t.id, {_concat('t', source.title)}, {_concat('t', source.body)} "
+                f"FROM {source.table} t ON CONFLICT DO NOTHING")
+    return (f"INSERT INTO {SQLITE_INDEX}(rowid, kind, ref_id, title, body) "
+            f"SELECT t.id * {_KIND_SLOTS} + {source.number}, '{kind}', t.id, "
+            f"{_concat('t', source.title)}, {_concat('t', source.body)} FROM {source.table} t")
+
+
+def referenced_pdf_paths():
+    """Qidiruvga kiradigan PDF'lar yo'llari (stored_files.path ko'rinishida) select'i."""
+    return union(*(select(func.ltrim(getattr(source.model, source.column), "/"))
+                   for source in PDF_SOURCES.values()))
+
+
+def _pdf_index_kind(kind: str) -> str:
+    return f"{PDF_KIND}:{kind}"
+
+
+def _pdf_select(kind: str, source: PdfSource, where: str) -> str:
+    # Egasi -> stored_files (yo'l bo'yicha) -> tayyor pdf_texts; bazada "/static/..." ham bor
+    rowid = "" if IS_POSTGRES else f"t.id * {_KIND_SLOTS} + {source.number}, "
+    return (f"SELECT {rowid}'{_pdf_index_kind(kind)}', t.id, {_concat('t', source.title)}, p.text "
+            f"FROM {source.table} t "
+            f"JOIN {_FILES} f ON f.path = ltrim(t.\"{source.column}\", '/') "
+            f"JOIN {_TEXTS} p ON p.sha256 = f.sha256 AND p.status = 'done' "
+            f"WHERE {where}")
+
+
+def _owned_by_blob(source: PdfSource, sha256: str, expression: str) -> str:
+    return (f"SELECT {expression} FROM {source.table} t "
+            f"JOIN {_FILES} f ON f.path = ltrim(t.\"{source.column}\", '/') "
+            f"WHERE f.sha256 = {sha256}")
+
+
+def _watched_columns(source: PdfSource) -> str:
+    return ", ".join(f'"{column}"' for column in dict.fromkeys((source.column, *source.title)))
+
+
+def _sqlite_pdf_statements(kind: str, source: PdfSource) -> list[str]:
+    # Egasining sarlavhasi label'da: ko'rsatiladi, lekin qidirilmaydi (hujjatning o'zi bilan takrorlanmaydi)
+    columns = "rowid, kind, ref_id, label, body"
+    insert = f"INSERT INTO {SQLITE_INDEX}({columns}) {_pdf_select(kind, source, 't.id = new.id')};"
+    delete = f"DELETE FROM {SQLITE_INDEX} WHERE rowid = old.id * {_KIND_SLOTS} + {source.number};"
+    owned = _owned_by_blob(source, "old.sha256", f"t.id * {_KIND_SLOTS} + {source.number}")
+    delete_owned = f"DELETE FROM {SQLITE_INDEX} WHERE rowid IN ({owned});"
+    insert_owned = (f"INSERT INTO {SQLITE_INDEX}({columns}) "
+                    f"{_pdf_select(kind, source, 'f.sha256 = new.sha256')};")
+    name = f"search_pdf_{kind}"
+    return [
+        *(f"DROP TRIGGER IF EXISTS {name}_{suffix}" for suffix in ("ai", "au", "ad", "tu", "td")),
+        f"CREATE TRIGGER {name}_ai AFTER INSERT ON {source.table} BEGIN {insert} END",
+        f"CREATE TRIGGER {name}_au AFTER UPDATE OF {_watched_columns(source)} ON {source.table} "
+        f"BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER {name}_ad AFTER DELETE ON {source.table} BEGIN {delete} END",
+        # Matn tayyor bo'lganda shu PDF'ga havola qiladigan yozuvlar indekslanadi
+        f"CREATE TRIGGER {name}_tu AFTER UPDATE OF status, text ON {_TEXTS} "
+        f"WHEN old.status = 'done' OR new.status = 'done' BEGIN {delete_owned} {insert_owned} END",
+        f"CREATE TRIGGER {name}_td AFTER DELETE ON {_TEXTS} WHEN old.status = 'done' "
+        f"BEGIN {delete_owned} END",
+    ]
+
+
+def _postgres_pdf_statements(kind: str, source: PdfSource) -> list[str]:
+    index_kind = _pdf_index_kind(kind)
+    name = f"search_sync_pdf_{kind}"
+    insert = f"INSERT INTO {POSTGRES_INDEX}(kind, ref_id, label, body)"
+    return [
+        f"""CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM {POSTGRES_INDEX} WHERE kind = '{index_kind}' AND ref_id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        {insert} {_pdf_select(kind, source, 't.id = NEW.id')} ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        f"""CREATE OR REPLACE FUNCTION {name}_text() RETURNS trigger AS $$
+BEGIN
+    IF OLD.status = 'done' THEN
+        DELETE FROM {POSTGRES_INDEX} WHERE kind = '{index_kind}'
+            AND ref_id IN ({_owned_by_blob(source, 'OLD.sha256', 't.id')});
+    END IF;
+    IF TG_OP = 'UPDATE' AND NEW.status = 'done' THEN
+        {insert} {_pdf_select(kind, source, 'f.sha256 = NEW.sha256')} ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        f"DROP TRIGGER IF EXISTS {name} ON {source.table}",
+        f"CREATE TRIGGER {name} AFTER INSERT OR DELETE OR UPDATE OF {_watched_columns(source)} "
+        f"ON {source.table} FOR EACH ROW EXECUTE FUNCTION {name}()",
+        f"DROP TRIGGER IF EXISTS {name}_text ON {_TEXTS}",
+        f"CREATE TRIGGER {name}_text AFTER UPDATE OF status, text OR DELETE ON {_TEXTS} "
+        f"FOR EACH ROW EXECUTE FUNCTION {name}_text()",
+    ]
+
+
+def _pdf_backfill_statement(kind: str, source: PdfSource) -> str:
+    if IS_POSTGRES:
+        return (f"INSERT INTO {POSTGRES_INDEX}(kind, ref_id, label, body) "
+                f"{_pdf_select(kind, source, '1 = 1')} ON CONFLICT DO NOTHING")
+    return (f"INSERT INTO {SQLITE_INDEX}(rowid, kind, ref_id, label, body) "
+            f"{_pdf_select(kind, source, '1 = 1')}")
+
+
+def install_search_index(connection):
+    """Qidiruv indeksi va uni manba jadvallar bilan sinxron tutadigan triggerlarni yaratadi.
+
+    Migratsiyada chaqiriladi: SEARCH_SOURCES yoki PDF_SOURCES o'zgarsa, yangi
+    revision uni qayta chaqiradi. Triggerlar har safar qayta yaratiladi; indeks jadvali yangi
+    yaratilgan bo'lsa, mavjud yozuvlar bilan to'ldiriladi. Indeks router'lardan
+    mustaqil: ORM, insert()/update()/delete() va qo'lda yozilgan SQL ham
+    triggerdan o'tadi.
+    """
+    index = POSTGRES_INDEX if IS_POSTGRES else SQLITE_INDEX
+    created = not inspect(connection).has_table(index)
+
+    if IS_POSTGRES:
+        statements = [
+            f"""CREATE TABLE IF NOT EXISTS {POSTGRES_INDEX} (
+    kind VARCHAR(20) NOT NULL,
+    ref_id INTEGER NOT NULL,
+    label TEXT,
+    title TEXT,
+    body TEXT,
+    tsv TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED,
+    PRIMARY KEY (kind, ref_id)
+)""",
+            f"CREATE INDEX IF NOT EXISTS ix_{POSTGRES_INDEX}_tsv ON {POSTGRES_INDEX} USING GIN (tsv)",
+        ]
+        build, build_pdf = _postgres_statements, _postgres_pdf_statements
+    else:
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_INDEX} USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, label UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')",
+        ]
+        build, build_pdf = _sqlite_statements, _sqlite_pdf_statements
+
+    for kind, source in SEARCH_SOURCES.items():
+        statements.extend(build(kind, source))
+    for kind, source in PDF_SOURCES.items():
+        statements.extend(build_pdf(kind, source))
+    if created:
+        statements.extend(_backfill_statement(kind, source)
+                          for kind, source in SEARCH_SOURCES.items())
+        statements.extend(_pdf_backfill_statement(kind, source)
+                          for kind, source in PDF_SOURCES.items())
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def _tokens(query: str) -> list[str]:
+    return _TOKEN_RE.findall(query.lower())
+
+
+def _sqlite_match(tokens: list[str]) -> str:
+    # Har bir so'z prefiks bo'yicha qidiriladi; FTS5 sintaksisi foydalanuvchiga ochilmaydi
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _postgres_match(tokens: list[str]) -> str:
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _index_kinds(kinds: list[str]) -> list[str]:
+    # type=guruh hujjatning o'zini ham, unga biriktirilgan PDF matnini ham qamraydi
+    selected = set()
+    for kind in kinds:
+        if kind == PDF_KIND:
+            selected.update(_pdf_index_kind(pdf_kind) for pdf_kind in PDF_SOURCES)
+            continue
+        if kind in SEARCH_SOURCES:
+            selected.add(kind)
+        if kind in PDF_SOURCES:
+            selected.add(_pdf_index_kind(kind))
+    return sorted(selected)
+
+
+def _hit_kind(index_kind: str) -> dict:
+    prefix, _, owner = index_kind.partition(":")
+    if prefix == PDF_KIND and owner:
+        return {"type": owner, "source": PDF_KIND}
+    return {"type": index_kind, "source": None}
+
+
+def _snippet_html(snippet: str | None) -> str | None:
+    """Hujjat matnini ekranlaydi, keyin topilgan so'zlarni <mark> bilan o'raydi."""
+    if snippet is None:
+        return None
+    return (html.escape(snippet)
+            .replace(_SNIPPET_START, SNIPPET_OPEN)
+            .replace(_SNIPPET_STOP, SNIPPET_CLOSE))
+
+
+async def search(db: AsyncSession, query: str, kinds: list[str] | None,
+                 limit: int, offset: int) -> dict:
+    tokens = _tokens(query)
+    if not tokens:
+        return {"items": [], "total": 0}
+
+    params = {"match": None, "limit": limit, "offset": offset,
+              "open": _SNIPPET_START, "close": _SNIPPET_STOP}
+    kind_filter = ""
+    if kinds:
+        kind_filter = " AND kind IN :kinds"
+        params["kinds"] = _index_kinds(kinds)
+
+    if IS_POSTGRES:
+        params["match"] = _postgres_match(tokens)
+        source = (f"FROM {POSTGRES_INDEX}, to_tsquery('simple', :match) AS q "
+                  f"WHERE tsv @@ q{kind_filter}")
+        rows_sql = (
+            f"SELECT kind, ref_id, coalesce(label, title) AS title, ts_headline('simple', "
+            f"CASE WHEN body <> '' THEN body ELSE title END, q, "
+            f"'StartSel=\"' || :open || '\", StopSel=\"' || :close || '\", MaxWords=30, MinWords=10') AS snippet, "
+            f"ts_rank_cd(tsv, q) AS score {source} "
+            f"ORDER BY score DESC, ref_id LIMIT :limit OFFSET :offset")
+    else:
+        params["match"] = _sqlite_match(tokens)
+        source = f"FROM {SQLITE_INDEX} WHERE {SQLITE_INDEX} MATCH :match{kind_filter}"
+        # bm25: kichik qiymat yaxshiroq; sarlavhadagi moslik matndagidan 10 barobar og'ir
+        rows_sql = (
+            f"SELECT kind, ref_id, coalesce(label, title) AS title, "
+            f"snippet({SQLITE_INDEX}, -1, :open, :close, '…', 24) AS snippet, "
+            f"-bm25({SQLITE_INDEX}, 0.0, 0.0, 0.0, 10.0, 1.0) AS score {source} "
+            f"ORDER BY score DESC LIMIT :limit OFFSET :offset")
+
+    def prepared(sql: str):
+        statement = text(sql)
+        if kinds:
+            statement = statement.bindparams(bindparam("kinds", expanding=True))
+        return statement
+
+    total = (await db.execute(prepared(f"SELECT count(*) {source}"), params)).scalar()
+    rows = (await db.execute(prepared(rows_sql), params)).mappings().all()
+    return {
+        "items": [
+            {**_hit_kind(row["kind"]), "id": row["ref_id"], "title": row["title"],
+             "snippet": _snippet_html(row["snippet"]), "score": row["score"]}
+            for row in rows
+        ],
+        "total": total,
+    }
@@ -0,0 +1,168 @@
+import logging
+import mimetypes
+import os
+import re
+import stat
+import zlib
+from os import getenv
+
+from dotenv import load_dotenv
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+try:
+    import brotli
+except ImportError:  # brotli ixtiyoriy: bo'lmasa faqat .gz yaratiladi
+    brotli = None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Xesh nomli fayllar (core/uploads): mazmuni o'zgarsa, nomi ham o'zgaradi
+STATIC_IMMUTABLE_CACHE_CONTROL = getenv(
+    "STATIC_IMMUTABLE_CACHE_CONTROL", "public, max-age=31536000, immutable")
+# Eski (uuid nomli) fayllar va boshqa statik fayllar har safar qayta tekshiriladi
+STATIC_CACHE_CONTROL = getenv("STATIC_CACHE_CONTROL", "no-cache")
+STATIC_CHUNK_SIZE = int(getenv("STATIC_CHUNK_SIZE", str(256 * 1024)))
+# "" - fayl uvicorn'ning o'zidan beriladi; "x-accel-redirect" - nginx; "x-sendfile" - Apache/lighttpd
+STATIC_OFFLOAD = getenv("STATIC_OFFLOAD", "").lower()
+STATIC_ACCEL_PREFIX = getenv("STATIC_ACCEL_PREFIX", "/_protected_static/")
+PRECOMPRESS_MIN_BYTES = int(getenv("PRECOMPRESS_MIN_BYTES", "1024"))
+# Siqilgan nusxa asl hajmning shu ulushidan kichik bo'lsagina saqlanadi
+PRECOMPRESS_MAX_RATIO = float(getenv("PRECOMPRESS_MAX_RATIO", "0.9"))
+
+COMPRESSIBLE_TYPES = {
+    "application/pdf", "application/json", "image/svg+xml", "image/bmp",
+    "text/plain", "text/csv", "text/html", "text/css", "application/javascript",
+}
+# Brauzer qo'llaydigan kodlash -> diskdagi qo'shimcha (afzallik tartibida)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+VARIANT_SUFFIXES = tuple(suffix for _, suffix in ENCODINGS)
+
+# <sha256>.<ext> bloblar va <sha256>-<kenglik>.<ext> rasm nusxalari
+_HASHED_NAME_RE = re.compile(r"^[0-9a-f]{64}(-[0-9]{1,5})?(\.[a-z0-9]{1,10})?$")
+_PRECOMPRESS_CHUNK = 1024 * 1024
+
+
+def is_hashed_name(filename: str) -> bool:
+    return bool(_HASHED_NAME_RE.match(filename))
+
+
+def is_compressible(content_type: str | None) -> bool:
+    return content_type in COMPRESSIBLE_TYPES
+
+
+def _write_variant(path: str, suffix: str, compressor) -> bool:
+    target = path + suffix
+    tmp = target + ".part"
+    size = os.path.getsize(path)
+    with open(path, "rb") as src, open(tmp, "wb") as out:
+        while chunk := src.read(_PRECOMPRESS_CHUNK):
+            out.write(compressor.compress(chunk))
+        out.write(compressor.flush())
+    if os.path.getsize(tmp) > size * PRECOMPRESS_MAX_RATIO:
+        os.remove(tmp)
+        return False
+    os.replace(tmp, target)
+    return True
+
+
+def precompress(path: str, content_type: str | None):
+    """Blob yoniga .br/.gz nusxalarini yozadi (yuklash vaqtida, bir marta).
+
+    Siqish CPU talab qiladi, shuning uchun threadpool'da chaqiriladi.
+    Foyda bermaydigan nusxa (masalan, ichidan siqilgan PDF) saqlanmaydi.
+    """
+    if not is_compressible(content_type) or os.path.getsize(path) < PRECOMPRESS_MIN_BYTES:
+        return
+    compressors = [(".gz", lambda: zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS))]
+    if brotli is not None:
+        compressors.insert(0, (".br", lambda: brotli.Compressor(quality=11)))
+    for suffix, factory in compressors:
+        try:
+            _write_variant(path, suffix, factory())
+        except OSError:
+            logger.exception("Siqilgan nusxani yozib bo'lmadi: %s%s", path, suffix)
+            if os.path.exists(path + suffix + ".part"):
+                os.remove(path + suffix + ".part")
+
+
+def accepted_encodings(header: str | None) -> set[str]:
+    encodings = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if not name or params in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+class StaticFileResponse(FileResponse):
+    # Katta PDF'lar kamroq thread almashinuvi bilan beriladi
+    chunk_size = STATIC_CHUNK_SIZE
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Statik fayllarni uzoq keshlash sarlavhalari va oldindan siqilgan nusxalar bilan beradi.
+
+    - xesh nomli fayllarga `Cache-Control: immutable` qo'yiladi;
+    - Accept-Encoding ruxsat bersa, yuklashda yaratilgan .br/.gz nusxa beriladi;
+    - Range so'rovlari (206) asl fayldan FileResponse orqali beriladi;
+    - STATIC_OFFLOAD yoqilgan bo'lsa, faylni reverse proxy o'zi yuboradi.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope,
+                      status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        filename = os.path.basename(full_path)
+        media_type = mimetypes.guess_type(filename)[0] or "text/plain"
+        headers = {
+            "Cache-Control": (STATIC_IMMUTABLE_CACHE_CONTROL if is_hashed_name(filename)
+                              else STATIC_CACHE_CONTROL),
+        }
+        compressible = is_compressible(media_type)
+        if compressible:
+            headers["Vary"] = "Accept-Encoding"
+
+        if STATIC_OFFLOAD in ("x-accel-redirect", "x-sendfile"):
+            return self._offload_response(full_path, media_type, headers)
+
+        served_path, served_stat = full_path, stat_result
+        # Range so'rovi asl faylning baytlariga tegishli, shuning uchun siqilgan nusxa berilmaydi
+        if compressible and "range" not in request_headers:
+            accepted = accepted_encodings(request_headers.get("accept-encoding"))
+            for encoding, suffix in ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    variant_stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                if stat.S_ISREG(variant_stat.st_mode):
+                    served_path, served_stat = full_path + suffix, variant_stat
+                    headers["Content-Encoding"] = encoding
+                    break
+
+        response = StaticFileResponse(
+            served_path, status_code=status_code, stat_result=served_stat,
+            media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _offload_response(self, full_path: str, media_type: str, headers: dict) -> Response:
+        if STATIC_OFFLOAD == "x-accel-redirect":
+            relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = STATIC_ACCEL_PREFIX.rstrip("/") + "/" + relative
+        else:
+            headers["X-Sendfile"] = os.path.abspath(full_path)
+        return Response(media_type=media_type, headers=headers)
+
+
+def variant_paths(path: str) -> tuple[str, ...]:
+    return tuple(path + suffix for suffix in VARIANT_SUFFIXES)
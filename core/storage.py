@@ -0,0 +1,185 @@
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+
+from sqlalchemy import delete, event, exists, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.database import IS_POSTGRES
+from core.static import variant_paths
+from models.image_rendition import ImageRendition
+from models.pdf_text import PdfText
+from models.stored_file import StoredFile
+
+logger = logging.getLogger(__name__)
+
+# Core jadval: ORM hodisalari (table_versions, o'zgarishlar ro'yxati) bu yozuvlarga tegmaydi
+_TABLE = StoredFile.__table__
+_PDF_TEXTS = PdfText.__table__
+_RENDITIONS = ImageRendition.__table__
+
+_UNLINK_KEY = "blobs_to_unlink"
+_CREATED_KEY = "blobs_created"
+
+_EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+_EXT_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+def blob_key(path: str | None) -> str | None:
+    # Bazada "static/..." ham, "/static/..." ham saqlanadi - kalit bitta bo'lishi kerak
+    return path.lstrip("/") if path else None
+
+
+def blob_extension(content_type: str | None, filename: str | None) -> str:
+    if content_type in _EXTENSIONS:
+        return _EXTENSIONS[content_type]
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if _EXT_RE.match(ext) else ""
+
+
+def _identity(path: str) -> tuple[int, ...] | None:
+    # inode o'chirilgan fayldan keyin qayta ishlatilishi mumkin - vaqtlar ham solishtiriladi
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns
+
+
+def place_blob(db: AsyncSession, tmp_path: str, path: str, *, new: bool,
+               keep_tmp: bool = False) -> bool:
+    """Vaqtinchalik faylni kontent manziliga ko'chiradi; blob allaqachon bo'lsa, nusxa tashlanadi.
+
+    new - acquire_file natijasi: stored_files yozuvi shu tranzaksiyada
+    yaratilgan. Bunday holda diskdagi eski fayl (bo'shatilib, o'chirilishi
+    kutilayotgan yoki bekor qilingan tranzaksiyadan qolgan) ishlatilmaydi -
+    blob o'z nusxasi bilan almashtiriladi. keep_tmp=True bo'lsa vaqtinchalik
+    fayl joyida qoladi (blob hard link orqali yaratiladi): tranzaksiya bekor
+    bo'lsa ham uni qayta ishlatish mumkin, o'chirish chaqiruvchining ishi.
+    Blob diskka yozilgan bo'lsa True qaytaradi.
+    """
+    if not new and os.path.exists(path):
+        if not keep_tmp:
+            os.remove(tmp_path)
+        return False
+    if keep_tmp:
+        link_path = f"{tmp_path}.link"
+        try:
+            os.link(tmp_path, link_path)
+        except OSError:
+            shutil.copyfile(tmp_path, link_path)
+        os.replace(link_path, path)
+    else:
+        os.replace(tmp_path, path)
+    if new:
+        db.sync_session.info.setdefault(_CREATED_KEY, {})[path] = _identity(path)
+    return True
+
+
+async def acquire_file(db: AsyncSession, path: str, sha256: str, size: int,
+                       content_type: str | None) -> bool:
+    """Blobga havolalar sonini bittaga oshiradi (joriy tranzaksiya ichida).
+
+    Fayl diskka qo'yilishidan oldin chaqiriladi: yozuv qulflangandan keyin
+    bo'shatish yoki bekor qilish blobni o'chira olmaydi. Yozuv yangi
+    yaratilgan bo'lsa True qaytaradi - blobni shu tranzaksiya qo'yishi kerak.
+    """
+    # Shu tranzaksiyada bo'shatilgan blob qayta ishlatilsa, uni o'chirmaslik kerak
+    db.sync_session.info.get(_UNLINK_KEY, {}).pop(blob_key(path), None)
+    insert = pg_insert if IS_POSTGRES else sqlite_insert
+    statement = insert(_TABLE).values(
+        path=blob_key(path), sha256=sha256, size=size, content_type=content_type,
+        ref_count=1, created_at=datetime.utcnow(),
+    )
+    ref_count = (await db.execute(statement.on_conflict_do_update(
+        index_elements=[_TABLE.c.path],
+        set_={"ref_count": _TABLE.c.ref_count + 1},
+    ).returning(_TABLE.c.ref_count))).scalar_one()
+    # Yozuvlar 1 dan boshlanadi va 0 ga tushganda o'chiriladi
+    return ref_count == 1
+
+
+async def release_file(db: AsyncSession, path: str | None):
+    """Havolani kamaytiradi; oxirgi havola yo'qolsa, fayl commit'dan keyin o'chiriladi.
+
+    stored_files da yozuvi yo'q eski (uuid nomli) fayllar avvalgidek darhol
+    commit'dan keyin o'chiriladi.
+    """
+    key = blob_key(path)
+    if key is None:
+        return
+    result = await db.execute(
+        update(_TABLE).where(_TABLE.c.path == key)
+        .values(ref_count=_TABLE.c.ref_count - 1)
+        .returning(_TABLE.c.ref_count)
+    )
+    remaining = result.scalar_one_or_none()
+    if remaining is not None and remaining > 0:
+        return
+    if remaining is not None:
+        sha256 = (await db.execute(
+            delete(_TABLE).where(_TABLE.c.path == key).returning(_TABLE.c.sha256)
+        )).scalar_one()
+        # Shu mazmundagi fayl boshqa joyda qolmagan bo'lsa, ajratilgan matn ham qidiruvdan olinadi
+        orphaned = ~exists().where(_TABLE.c.sha256 == sha256)
+        await db.execute(delete(_PDF_TEXTS).where(_PDF_TEXTS.c.sha256 == sha256, orphaned))
+        # ... rasm nusxalari esa diskdan ham o'chiriladi
+        variants = (await db.execute(
+            delete(_RENDITIONS).where(_RENDITIONS.c.sha256 == sha256, orphaned)
+            .returning(_RENDITIONS.c.variants)
+        )).scalar_one_or_none()
+        for sizes in (variants or {}).values():
+            _mark_unlink(db, sizes.values())
+    _mark_unlink(db, (key,))
+
+
+def _mark_unlink(db: AsyncSession, paths):
+    # Fayl hozirgi holatida eslab qolinadi: commit'gacha boshqa tranzaksiya
+    # shu manzilga yangi blob qo'ysa, u o'chirilmaydi
+    unlink = db.sync_session.info.setdefault(_UNLINK_KEY, {})
+    for path in paths:
+        unlink[path] = _identity(path)
+
+
+def _unlink(blobs: dict[str, tuple[int, ...] | None]):
+    """Bloblarni .br/.gz nusxalari bilan o'chiradi.
+
+    Manzildagi fayl eslab qolingan fayl bo'lmasa (shu orada boshqa
+    tranzaksiya blobni qayta yaratgan), u nusxalari bilan joyida qoladi.
+    """
+    for blob, identity in blobs.items():
+        if _identity(blob) != identity:
+            continue
+        for path in (blob, *variant_paths(blob)):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                logger.exception("Faylni o'chirib bo'lmadi: %s", path)
+
+
+@event.listens_for(Session, "after_commit")
+def _unlink_released(session):
+    session.info.pop(_CREATED_KEY, None)
+    _unlink(session.info.pop(_UNLINK_KEY, {}))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_created(session, transaction):
+    # commit bo'lmagan (rollback yoki close) tashqi tranzaksiya: shu so'rovda
+    # yangi yozilgan bloblarga havola qolmadi
+    if transaction.parent is not None:
+        return
+    session.info.pop(_UNLINK_KEY, None)
+    _unlink(session.info.pop(_CREATED_KEY, {}))
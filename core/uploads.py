@@ -0,0 +1,165 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from os import getenv
+from uuid import uuid4
+
+from aiofiles import open as aio_open
+from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.metrics import UPLOAD_BYTES, UPLOAD_DURATION
+from core.static import precompress
+from core.storage import acquire_file, blob_extension, place_blob
+
+load_dotenv()
+
+UPLOAD_CHUNK_SIZE = int(getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+UPLOAD_MAX_BYTES = int(getenv("UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))
+IMAGE_MAX_BYTES = int(getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Sessiyada PDF yuklangani belgisi: commit'dan keyin matn ajratish navbati uyg'otiladi
+PDF_UPLOADED_KEY = "pdf_uploaded"
+# ... va yuklangan rasmlar xeshlari: o'lchamlar navbati uyg'otiladi va shu rasmli
+# yozuvlarning renditions ustuni yangilanadi
+IMAGE_UPLOADED_KEY = "image_uploaded"
+
+# Fayl boshidagi "sehrli" baytlar: Content-Type sarlavhasiga ishonib bo'lmaydi
+_SIGNATURES = {
+    "application/pdf": (b"%PDF-",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+}
+_ALIASES = {"image/jpg": "image/jpeg", "image/pjpeg": "image/jpeg"}
+# PDF sarlavhasi birinchi 1024 bayt ichida istalgan joyda kelishi mumkin
+_PDF_HEADER_WINDOW = 1024
+
+
+@dataclass
+class SavedUpload:
+    path: str
+    filename: str
+    size: int
+    sha256: str
+    content_type: str
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    if b"%PDF-" in head[:_PDF_HEADER_WINDOW]:
+        return "application/pdf"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for content_type, signatures in _SIGNATURES.items():
+        if head.startswith(signatures):
+            return content_type
+    return None
+
+
+def safe_filename(filename: str | None) -> str:
+    # Mijoz yuborgan nomdan faqat oxirgi qism olinadi: "../" kabi yo'llar kesiladi
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    return name or "file"
+
+
+@dataclass
+class ReceivedUpload:
+    """Diskka yozilgan, tekshirilgan, lekin hali kontent manziliga ko'chirilmagan fayl."""
+    tmp_path: str
+    path: str
+    filename: str
+    size: int
+    sha256: str
+    content_type: str
+
+
+async def receive_upload(file: UploadFile, folder: str, *,
+                         max_bytes: int = UPLOAD_MAX_BYTES) -> ReceivedUpload:
+    """Yuklangan faylni bo'laklab vaqtinchalik faylga yozadi va tekshiradi.
+
+    Fayl xotiraga to'liq o'qilmaydi. Yozish davomida hajm chegarasi
+    tekshiriladi, SHA-256 hisoblanadi va boshidagi baytlar e'lon qilingan
+    Content-Type bilan solishtiriladi. Xato bo'lsa vaqtinchalik fayl o'chiriladi.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=413, detail=f"Fayl hajmi {max_bytes} baytdan oshmasligi kerak")
+
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = os.path.join(folder, f".{uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    started = time.perf_counter()
+    try:
+        async with aio_open(tmp_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413, detail=f"Fayl hajmi {max_bytes} baytdan oshmasligi kerak")
+                if len(head) < _PDF_HEADER_WINDOW:
+                    head += chunk[:_PDF_HEADER_WINDOW - len(head)]
+                digest.update(chunk)
+                await out.write(chunk)
+
+        sniffed = sniff_content_type(head)
+        declared = _ALIASES.get(file.content_type, file.content_type)
+        if declared in _SIGNATURES or declared == "image/webp":
+            if sniffed != declared:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Fayl mazmuni e'lon qilingan turga ({declared}) mos kelmaydi")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    UPLOAD_BYTES.observe((folder,), size)
+    UPLOAD_DURATION.observe((folder,), time.perf_counter() - started)
+    sha256 = digest.hexdigest()
+    content_type = sniffed or declared
+    filename = sha256 + blob_extension(content_type, safe_filename(file.filename))
+    return ReceivedUpload(tmp_path=tmp_path, path=os.path.join(folder, filename),
+                          filename=filename, size=size, sha256=sha256,
+                          content_type=content_type)
+
+
+async def store_upload(db: AsyncSession, received: ReceivedUpload, *,
+                       keep_tmp: bool = False) -> SavedUpload:
+    """Qabul qilingan faylni kontent manziliga ko'chiradi va havolasini db tranzaksiyasida oshiradi.
+
+    Fayl nomi - kontent xeshi, shuning uchun bir xil fayl diskda bitta
+    nusxada saqlanadi; havolalar soni stored_files jadvalida yuritiladi.
+    keep_tmp=True: vaqtinchalik fayl commit'dan keyin chaqiruvchi tomonidan o'chiriladi.
+    """
+    try:
+        # Avval havola: blob mavjudligi diskka qarab emas, stored_files yozuviga qarab aniqlanadi
+        new = await acquire_file(db, received.path, received.sha256, received.size,
+                                 received.content_type)
+        created = place_blob(db, received.tmp_path, received.path, new=new,
+                             keep_tmp=keep_tmp)
+    except BaseException:
+        if not keep_tmp and os.path.exists(received.tmp_path):
+            os.remove(received.tmp_path)
+        raise
+
+    if created:
+        # .br/.gz nusxalar bir marta shu yerda tayyorlanadi, so'rov paytida siqilmaydi
+        await run_in_threadpool(precompress, received.path, received.content_type)
+    if received.content_type == "application/pdf":
+        db.sync_session.info[PDF_UPLOADED_KEY] = True
+    elif received.content_type.startswith("image/"):
+        db.sync_session.info.setdefault(IMAGE_UPLOADED_KEY, set()).add(received.sha256)
+    return SavedUpload(path=received.path, filename=received.filename, size=received.size,
+                       sha256=received.sha256, content_type=received.content_type)
+
+
+async def save_upload(file: UploadFile, folder: str, db: AsyncSession, *,
+                      max_bytes: int = UPLOAD_MAX_BYTES) -> SavedUpload:
+    """Faylni qabul qiladi (receive_upload) va shu tranzaksiyada saqlaydi (store_upload)."""
+    return await store_upload(db, await receive_upload(file, folder, max_bytes=max_bytes))
@@ -0,0 +1,94 @@
+from collections import Counter
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.database import Base
+from models.table_version import TableVersion
+
+_VERSION_TABLE = TableVersion.__tablename__
+_BUMPS_KEY = "table_version_bumps"
+
+#: Shu jarayondagi commit'lar hisoblagichlarni necha marta oshirgani (jadval -> son).
+#: Kesh hisoblagich o'zgarishini shu bilan solishtirib, boshqa worker'dan kelgan
+#: o'zgarishni ajratadi (services/full_tizim.py).
+local_bumps: Counter = Counter()
+
+
+def _bump(connection, tables: set[str]):
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(tables))
+        .values(version=TableVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount != len(tables):
+        existing = set(connection.execute(
+            select(TableVersion.table_name).where(TableVersion.table_name.in_(tables))
+        ).scalars())
+        connection.execute(insert(TableVersion), [
+            {"table_name": name, "version": 1, "updated_at": now}
+            for name in tables - existing
+        ])
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_table_versions(session, flush_context):
+    # Hisoblagich yozuv bilan bitta tranzaksiyada oshadi, shuning uchun
+    # barcha worker'lar bir xil versiyani ko'radi
+    tables = {
+        obj.__table__.name
+        for obj in chain(session.new, session.deleted,
+                         (o for o in session.dirty if session.is_modified(o, include_collections=False)))
+    }
+    tables.discard(_VERSION_TABLE)
+    if tables:
+        _bump(session.connection(), tables)
+        _record(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_bulk_statement(state):
+    # insert()/update()/delete() so'rovlari flush'dan o'tmaydi, shuning uchun alohida ushlanadi
+    if state.is_orm_statement and (state.is_insert or state.is_update or state.is_delete):
+        table = state.statement.table.name
+        if table != _VERSION_TABLE:
+            _bump(state.session.connection(), {table})
+            _record(state.session, {table})
+
+
+def _record(session, tables):
+    session.info.setdefault(_BUMPS_KEY, Counter()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _count_local_bumps(session):
+    local_bumps.update(session.info.pop(_BUMPS_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_local_bumps(session):
+    session.info.pop(_BUMPS_KEY, None)
+
+
+def seed_table_versions(connection):
+    """Har bir jadval uchun hisoblagich qatori borligini ta'minlaydi (migratsiyalardan keyin, migrations/env.py)."""
+    tables = set(Base.metadata.tables) - {_VERSION_TABLE}
+    existing = set(connection.execute(select(TableVersion.table_name)).scalars())
+    missing = tables - existing
+    if missing:
+        now = datetime.utcnow()
+        connection.execute(insert(TableVersion), [
+            {"table_name": name, "version": 0, "updated_at": now} for name in missing
+        ])
+
+
+async def get_table_versions(db: AsyncSession, tables) -> dict[str, tuple[int, datetime]]:
+    result = await db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.table_name.in_(tuple(tables)))
+    )
+    return {name: (version, updated_at) for name, version, updated_at in result.all()}
@@ -21,7 +21,7 @@ async def create_admin():
 
         new_admin = Admin(
             username=username,
-            hashed_password=hash_password(password)
+            hashed_password=await hash_password(password)
         )
 
         db.add(new_admin)
@@ -1,23 +1,91 @@
-from fastapi.staticfiles import StaticFiles
 from fastapi import FastAPI
-from core.database import Base, engine
+from auth.cache import revoked_tokens
+from core.database import engine
+from core.cache import ResponseCacheMiddleware, response_cache
+from core.metrics import MetricsMiddleware
+from core.profiler import ProfilerMiddleware
+from core.responses import FastJSONResponse, install_json_fast_path
+from core.schema import check_schema
+from core.static import ImmutableStaticFiles
+from services.boglanish_intake import boglanish_intake
+from services.image_cache import image_cache
+from services.image_renditions import image_rendition_worker
+from services.pdf_text import pdf_text_extractor
 
 from routers import (admin_auth, tmsiti_haqida, rahbariyat, tashkil_tuzilma,
                      tarkibiy_bolinma, vakansiya, qonun_qaror_farmon, tizim,
                      shaharsozlik_norma_qoida_bolim, guruh, full_tizim,
                      standart, reglament, smeta_resurs_norma, malumotnoma,
                      management_system_page, elon, yangilik, corrupsiya,
-                     tmsiti_boglanish_malumoti, boglanish_form, menu)
+                     tmsiti_boglanish_malumoti, boglanish_form, menu, search, img,
+                     metrics, profiler)
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Ochiq ro'yxatlar javobi keshlanadi; kalit - yo'l va query parametrlar
+CACHED_PREFIXES = (
+    "/tmsiti-haqida", "/rahbariyat", "/tashkil-tuzilma", "/tarkibiy-bolinmalar",
+    "/vakansiyalar", "/qonun-qaror-farmonlar", "/tizimlar",
+    "/shaharsozlik-norma-qoida-bolimlar", "/guruhlar", "/standartlar",
+    "/reglamentlar", "/smeta_resurs_normalari", "/malumotnoma",
+    "/management_system_page", "/elonlar", "/yangiliklar",
+    "/corrupsiyaga_qarshi", "/tmsiti_boglanish_malumoti", "/menus", "/search",
+)
+
+# Bir router o'zgarganda boshqa routerlarning javoblari ham eskiradi.
+# /full_tizim bu yerda yo'q: u o'zining snapshotidan beriladi (services/full_tizim.py)
+CACHE_DEPENDENCIES = {
+    "/tizimlar": ("/shaharsozlik-norma-qoida-bolimlar", "/guruhlar", "/search"),
+    "/shaharsozlik-norma-qoida-bolimlar": ("/guruhlar", "/search"),
+    # /search natijalari qidiruv indeksiga kiradigan routerlar bilan birga eskiradi
+    "/qonun-qaror-farmonlar": ("/search",),
+    "/yangiliklar": ("/search",),
+    "/elonlar": ("/search",),
+    "/standartlar": ("/search",),
+    "/guruhlar": ("/search",),
+    "/smeta_resurs_normalari": ("/search",),
+    "/reglamentlar": ("/search",),
+    # PDF matni bo'yicha qidiruv manbalari (core.search.PDF_SOURCES)
+    "/malumotnoma": ("/search",),
+    "/tmsiti-haqida": ("/search",),
+}
+
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    cached_prefixes=CACHED_PREFIXES,
+    dependencies=CACHE_DEPENDENCIES,
+)
+
+# Kesh tashqarisida: Server-Timing va X-Profile-Id keshlangan sarlavhalarga tushmaydi
+app.add_middleware(ProfilerMiddleware)
+
+# Oxirgi qo'shilgan middleware eng tashqarida: keshdan berilgan javoblar ham o'lchanadi
+app.add_middleware(MetricsMiddleware)
+
+app.mount("/static", ImmutableStaticFiles(directory="static"), name="static")
 
 
 @app.on_event("startup")
 async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Sxema migratsiyalar bilan boshqariladi (alembic upgrade head); bu yerda faqat versiya solishtiriladi
+    await check_schema(engine)
+    await revoked_tokens.start()
+    pdf_text_extractor.start()
+    image_rendition_worker.start()
+    await image_cache.start()
+    await boglanish_intake.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Navbatdagi murojaatlar baza yopilishidan oldin yoziladi
+    await boglanish_intake.stop()
+    await revoked_tokens.stop()
+    await pdf_text_extractor.stop()
+    await image_rendition_worker.stop()
+    await image_cache.stop()
+    await engine.dispose()
 
 
 app.include_router(admin_auth.router)
@@ -42,3 +110,10 @@ app.include_router(corrupsiya.router)
 app.include_router(tmsiti_boglanish_malumoti.router)
 app.include_router(boglanish_form.router)
 app.include_router(menu.router)
+app.include_router(search.router)
+app.include_router(img.router)
+app.include_router(metrics.router)
+app.include_router(profiler.router)
+
+# Routelar qo'shilgandan keyin: response_model'li javoblar bitta o'tishda baytlarga yoziladi
+install_json_fast_path(app)
@@ -0,0 +1,80 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core.database import DATABASE_URL, SQLITE_TUNING, Base, install_sqlite_tuning
+from core.schema import import_models
+from core.search import POSTGRES_INDEX, SQLITE_INDEX
+from core.versions import seed_table_versions
+from services.boglanish_inbox import FTS_TABLE
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# Autogenerate modelning to'liq metadata'si bilan solishtiradi
+import_models()
+target_metadata = Base.metadata
+
+# Odatda DATABASE_URL; benchmarks.dataset o'z bazasi uchun sqlalchemy.url beradi
+url = config.get_main_option("sqlalchemy.url") or DATABASE_URL
+is_sqlite = url.startswith("sqlite")
+
+
+# Qidiruv indekslari (FTS5 va uning yordamchi jadvallari) modelda yo'q, ularni
+# install_search_index/install_inbox_search boshqaradi: autogenerate ularni o'chirmasin
+MANAGED_TABLES = (SQLITE_INDEX, POSTGRES_INDEX, FTS_TABLE)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    return not (type_ == "table" and reflected and compare_to is None
+                and name.startswith(MANAGED_TABLES))
+
+
+def _configure(**options):
+    context.configure(
+        target_metadata=target_metadata,
+        # SQLite ALTER TABLE cheklangan: ustun o'zgarishlari jadvalni qayta qurish orqali
+        render_as_batch=is_sqlite,
+        compare_type=True,
+        include_object=include_object,
+        **options,
+    )
+
+
+def run_migrations_offline():
+    _configure(url=url, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    upgraded = []
+    _configure(connection=connection,
+               on_version_apply=lambda step, **kwargs: upgraded.append(step.is_upgrade))
+    with context.begin_transaction():
+        context.run_migrations()
+        # Yangi jadvallar uchun table_versions hisoblagich qatorlari (autogenerate'da emas)
+        if any(upgraded):
+            seed_table_versions(connection)
+
+
+async def run_migrations_online():
+    # Ilova pool'idan alohida: migratsiya boshqa thread/loop'da ham bajarilishi mumkin
+    engine = create_async_engine(url, poolclass=NullPool)
+    if is_sqlite and SQLITE_TUNING:
+        install_sqlite_tuning(engine.sync_engine)
+    # begin(): SQLite'da Alembic DDL'ni tranzaksiyaga o'ramaydi, seed qatorlari shu yerda commit bo'ladi
+    async with engine.begin() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,369 @@
+"""Boshlang'ich sxema: Alembic'gacha startup'da quriladigan barcha jadvallar.
+
+Yangi bazada jadvallar, indekslar va qidiruv indekslari yaratiladi. Alembic'dan
+oldingi baza (create_all + sync_table bilan qurilgan, masalan db/tmsiti.db)
+ham shu revision bilan qabul qilinadi: yo'q jadvallar yaratiladi, mavjud
+jadvallarga yetishmagan ustun va indekslar qo'shiladi.
+
+Jadvallar bu yerda muzlatilgan: modellar keyin o'zgarsa, o'zgarish yangi
+revision'ga yoziladi, bu fayl o'zgarmaydi.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 07:11:51.421427
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from core.migrations import sync_table
+from core.search import SQLITE_INDEX, POSTGRES_INDEX, install_search_index
+from services.boglanish_inbox import FTS_TABLE, backfill_normalized, install_inbox_search
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+metadata = sa.MetaData()
+
+sa.Table(
+    'admin', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_admin_id', 'id'),
+    sa.Index('ix_admin_username', 'username', unique=True),
+)
+
+sa.Table(
+    'boglanish_form', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('FIO', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('tel_raqam', sa.String(), nullable=True),
+    sa.Column('type', sa.String(), nullable=True),
+    sa.Column('murojat_matni', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('fayl', sa.String(), nullable=True),
+    sa.Column('email_normalized', sa.String(length=255), nullable=True),
+    sa.Column('tel_normalized', sa.String(length=20), nullable=True),
+    sa.Column('intake_id', sa.String(length=32), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_boglanish_form_created_at', 'created_at'),
+    sa.Index('ix_boglanish_form_email_normalized', 'email_normalized'),
+    sa.Index('ix_boglanish_form_id', 'id'),
+    sa.Index('ix_boglanish_form_intake_id', 'intake_id', unique=True),
+    sa.Index('ix_boglanish_form_tel_normalized', 'tel_normalized'),
+    sa.Index('ix_boglanish_form_type_created_at', 'type', 'created_at'),
+)
+
+sa.Table(
+    'corrupsiyaga_qarshi', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_corrupsiyaga_qarshi_id', 'id'),
+)
+
+sa.Table(
+    'elonlar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('rasm', sa.String(), nullable=True),
+    sa.Column('renditions', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_elonlar_id', 'id'),
+)
+
+sa.Table(
+    'image_renditions', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('variants', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256'),
+    sa.Index('ix_image_renditions_id', 'id'),
+    sa.Index('ix_image_renditions_status', 'status'),
+)
+
+sa.Table(
+    'malumotnoma', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nomi', sa.String(), nullable=True),
+    sa.Column('hujjat', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_malumotnoma_id', 'id'),
+)
+
+sa.Table(
+    'management_system_page', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('page', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+)
+
+sa.Table(
+    'menus', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_menus_id', 'id'),
+    sa.Index('ix_menus_title', 'title'),
+)
+
+sa.Table(
+    'pdf_texts', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('page_count', sa.Integer(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256'),
+    sa.Index('ix_pdf_texts_id', 'id'),
+    sa.Index('ix_pdf_texts_status', 'status'),
+)
+
+sa.Table(
+    'qonun_qaror_farmonlar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('type', sa.String(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('number', sa.String(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=True),
+    sa.Column('source', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_qonun_qaror_farmonlar_id', 'id'),
+)
+
+sa.Table(
+    'rahbariyat', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('positions', sa.String(), nullable=True),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('qabul_kunlari', sa.String(), nullable=True),
+    sa.Column('telefon', sa.String(), nullable=True),
+    sa.Column('elektron_pochta', sa.String(), nullable=True),
+    sa.Column('mutahassisligi', sa.String(), nullable=True),
+    sa.Column('rasm', sa.String(), nullable=True),
+    sa.Column('renditions', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_rahbariyat_id', 'id'),
+)
+
+sa.Table(
+    'reglamentlar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shifri', sa.String(), nullable=True),
+    sa.Column('nomi', sa.String(), nullable=True),
+    sa.Column('link', sa.String(), nullable=True),
+    sa.Column('pdf', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_reglamentlar_id', 'id'),
+)
+
+sa.Table(
+    'revoked_tokens', metadata,
+    sa.Column('jti', sa.String(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('jti'),
+    sa.Index('ix_revoked_tokens_expires_at', 'expires_at'),
+)
+
+sa.Table(
+    'smeta_resurs_normalari', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('yangi_ShNQ_raqami', sa.String(), nullable=True),
+    sa.Column('yangilangan_ShNQ_nomi', sa.String(), nullable=True),
+    sa.Column('ShNQ_raqami', sa.String(), nullable=True),
+    sa.Column('ShNQ_nomi', sa.String(), nullable=True),
+    sa.Column('pdf', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_smeta_resurs_normalari_id', 'id'),
+)
+
+sa.Table(
+    'standartlar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('pdf', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_standartlar_id', 'id'),
+)
+
+sa.Table(
+    'stored_files', metadata,
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('path'),
+    sa.Index('ix_stored_files_sha256', 'sha256'),
+)
+
+sa.Table(
+    'table_versions', metadata,
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name'),
+)
+
+sa.Table(
+    'tarkibiy_bolinmalar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kimligi', sa.String(), nullable=True),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('telefon', sa.String(), nullable=True),
+    sa.Column('elektron_pochta', sa.String(), nullable=True),
+    sa.Column('image', sa.String(), nullable=True),
+    sa.Column('renditions', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_tarkibiy_bolinmalar_id', 'id'),
+)
+
+sa.Table(
+    'tashkil_tuzilma', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('image', sa.String(), nullable=True),
+    sa.Column('renditions', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_tashkil_tuzilma_id', 'id'),
+)
+
+sa.Table(
+    'tizim', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+)
+
+sa.Table(
+    'tmsiti_boglanish_malumoti', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('joylashuv', sa.String(), nullable=True),
+    sa.Column('manzil', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('qoshimcha_email', sa.String(), nullable=True),
+    sa.Column('tel_raqam', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_tmsiti_boglanish_malumoti_id', 'id'),
+)
+
+sa.Table(
+    'tmsiti_haqida', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('pdf', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+)
+
+sa.Table(
+    'vakansiyalar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('bolim', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_vakansiyalar_id', 'id'),
+)
+
+sa.Table(
+    'yangiliklar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('rasm', sa.String(), nullable=True),
+    sa.Column('renditions', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_yangiliklar_id', 'id'),
+)
+
+sa.Table(
+    'shaharsozlik_norma_qoida_bolim', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('tizim', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['tizim'], ['tizim.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_shaharsozlik_norma_qoida_bolim_id', 'id'),
+)
+
+sa.Table(
+    'submenus', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=255), nullable=True),
+    sa.Column('menu_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['menu_id'], ['menus.id']),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_submenus_id', 'id'),
+    sa.Index('ix_submenus_title', 'title'),
+)
+
+sa.Table(
+    'guruhlar', metadata,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shifr', sa.String(), nullable=True),
+    sa.Column('hujjat_nomi', sa.String(), nullable=True),
+    sa.Column('link', sa.String(), nullable=True),
+    sa.Column('pdf', sa.String(), nullable=True),
+    sa.Column('bolim', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['bolim'], ['shaharsozlik_norma_qoida_bolim.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_guruhlar_id', 'id'),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+    metadata.create_all(bind)
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        added = sync_table(bind, table)
+        if table.name == "boglanish_form" and added & {"email_normalized", "tel_normalized"}:
+            backfill_normalized(bind)
+    install_search_index(bind)
+    install_inbox_search(bind)
+
+
+def downgrade():
+    bind = op.get_bind()
+    for name in (SQLITE_INDEX, POSTGRES_INDEX, FTS_TABLE):
+        op.execute(f"DROP TABLE IF EXISTS {name}")
+    metadata.drop_all(bind)
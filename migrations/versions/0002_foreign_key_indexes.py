@@ -0,0 +1,28 @@
+"""Tashqi kalitlar uchun indekslar.
+
+/guruhlar?bolim=&tizim= filtrlari, bo'lim/tizim bo'yicha kaskadli o'chirish va
+menyularning submenus yuklanishi shu ustunlar bo'yicha ishlaydi; indekssiz
+har safar butun jadval o'qiladi.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 07:12:45.066491
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_guruhlar_bolim', 'guruhlar', ['bolim'])
+    op.create_index('ix_shaharsozlik_norma_qoida_bolim_tizim', 'shaharsozlik_norma_qoida_bolim', ['tizim'])
+    op.create_index('ix_submenus_menu_id', 'submenus', ['menu_id'])
+
+
+def downgrade():
+    op.drop_index('ix_submenus_menu_id', table_name='submenus')
+    op.drop_index('ix_shaharsozlik_norma_qoida_bolim_tizim', table_name='shaharsozlik_norma_qoida_bolim')
+    op.drop_index('ix_guruhlar_bolim', table_name='guruhlar')
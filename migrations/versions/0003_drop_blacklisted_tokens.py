@@ -0,0 +1,24 @@
+"""Ishlatilmaydigan blacklisted_tokens jadvalini o'chirish.
+
+Token bekor qilish revoked_tokens (jti + muddat) ga o'tgan; eski jadval faqat
+Alembic'gacha yaratilgan bazalarda qolgan.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 07:40:12.512930
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DROP TABLE IF EXISTS blacklisted_tokens")
+
+
+def downgrade():
+    # Jadvaldagi tokenlar baribir qabul qilinmaydi, qayta yaratishga hojat yo'q
+    pass
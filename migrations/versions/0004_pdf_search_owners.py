@@ -0,0 +1,50 @@
+"""PDF matni qidiruvda egasi bo'lgan hujjat nomidan indekslanadi.
+
+Avval stored_files'dagi har bir PDF (murojaatlarga biriktirilgan fuqarolar
+fayllari ham) ajratilib, "pdf" turi ostida pdf_texts ID'si bilan indekslanardi.
+Endi faqat PDF_SOURCES ustunlari havola qiladigan fayllar indekslanadi va
+natijada egasining turi va ID'si qaytadi. Murojaat fayllaridan ajratilgan matn
+o'chiriladi. Indeks jadvaliga label ustuni (ko'rsatiladigan, qidirilmaydigan
+sarlavha) qo'shilgani uchun u qayta quriladi.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:02:37.104512
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from core.search import (POSTGRES_INDEX, SQLITE_INDEX, install_search_index,
+                         referenced_pdf_paths)
+from models.pdf_text import PdfText
+from models.stored_file import StoredFile
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        index = POSTGRES_INDEX
+        op.execute(f"DROP TRIGGER IF EXISTS search_sync_pdf ON {PdfText.__tablename__}")
+        op.execute("DROP FUNCTION IF EXISTS search_sync_pdf()")
+    else:
+        index = SQLITE_INDEX
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS search_pdf_{suffix}")
+
+    texts, files = PdfText.__table__, StoredFile.__table__
+    referenced = sa.select(files.c.sha256).where(files.c.path.in_(referenced_pdf_paths()))
+    bind.execute(sa.delete(texts).where(texts.c.sha256.not_in(referenced)))
+
+    # Yangi jadval yaratiladi va barcha manbalar (PDF matnlari ham) bilan to'ldiriladi
+    op.execute(f"DROP TABLE IF EXISTS {index}")
+    install_search_index(bind)
+
+
+def downgrade():
+    # O'chirilgan murojaat matnlari qaytarilmaydi; yangi triggerlar keyingi install'da qoladi
+    pass
@@ -0,0 +1,23 @@
+"""revoked_tokens.revoked_at uchun indeks.
+
+Har bir worker bekor qilingan tokenlar ro'yxatini butun jadvalni qayta o'qib
+emas, oxirgi yangilanishdan keyin qo'shilgan qatorlar bo'yicha yangilaydi.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:21:09.517302
+"""
+from alembic import op
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+
+
+def downgrade():
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
@@ -0,0 +1,28 @@
+"""tizim.tree_version ustuni.
+
+/full_tizim/ snapshoti boshqa worker'da qilingan o'zgarishdan keyin butun
+daraxtni qayta qurmaydi: har bir commit ta'sirlangan tizimlarning
+tree_version qiymatini oshiradi va faqat qiymati o'zgargan tizimlar
+qayta o'qiladi.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:02:44.381920
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('tizim', sa.Column('tree_version', sa.Integer(), nullable=False,
+                                     server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('tizim') as batch:
+        batch.drop_column('tree_version')
@@ -1,11 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+import re
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from datetime import datetime
 
 from core.database import Base
 
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_email(email: str | None) -> str | None:
+    return email.strip().lower() if email else None
+
+
+def normalize_phone(phone: str | None) -> str | None:
+    # "+998 90 123 45 67" va "998901234567" bitta qiymatga keladi
+    return (_NON_DIGITS.sub("", phone) or None) if phone else None
+
+
+def _from_params(column: str, normalize):
+    # insert()/update() so'rovlarida ham ishlaydigan default: boshqa ustundan hisoblanadi
+    def default(context):
+        return normalize(context.get_current_parameters().get(column))
+    return default
+
 
 class BoglanishForm(Base):
     __tablename__ = "boglanish_form"
+    __table_args__ = (
+        # Admin ro'yxati: tur bo'yicha filtr va sana oralig'i bitta indeks bilan
+        Index("ix_boglanish_form_type_created_at", "type", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     FIO = Column(String)
@@ -13,5 +36,11 @@ class BoglanishForm(Base):
     tel_raqam = Column(String)
     type = Column(String)
     murojat_matni = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     fayl = Column(String)
+    email_normalized = Column(String(255), index=True,
+                              default=_from_params("email", normalize_email))
+    tel_normalized = Column(String(20), index=True,
+                            default=_from_params("tel_raqam", normalize_phone))
+    # Navbat orqali qabul qilingan murojaat kaliti: spool qayta o'qilganda ikki marta yozilmaydi
+    intake_id = Column(String(32), index=True, unique=True)
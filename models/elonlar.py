@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
 from datetime import datetime
 
 from core.database import Base
@@ -11,4 +11,6 @@ class Elon(Base):
     name = Column(String)
     description = Column(Text)
     rasm = Column(String)
+    # Fon rejimida tayyorlanadigan o'lchamlar va formatlar (services/image_renditions.py)
+    renditions = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
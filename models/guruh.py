@@ -13,7 +13,7 @@ class Guruh(Base):
     link = Column(String)
     pdf = Column(String)
     bolim = Column(Integer, ForeignKey(
-        "shaharsozlik_norma_qoida_bolim.id", ondelete="CASCADE"))
+        "shaharsozlik_norma_qoida_bolim.id", ondelete="CASCADE"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     bolim_obj = relationship(
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+
+from core.database import Base
+
+
+class ImageRendition(Base):
+    __tablename__ = "image_renditions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Bir xil mazmunli rasm bir marta qayta ishlanadi (stored_files.sha256)
+    sha256 = Column(String(64), unique=True, nullable=False)
+    path = Column(String(255), nullable=False)
+    # pending, processing, done yoki failed
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    width = Column(Integer)
+    height = Column(Integer)
+    # {"webp": {"320": "static/images/renditions/<sha256>-320.webp", ...}, "avif": {...}}
+    variants = Column(JSON)
+    error = Column(String(500))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
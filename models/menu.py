@@ -26,7 +26,7 @@ class SubMenu(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     url = Column(String(255), nullable=True)
-    menu_id = Column(Integer, ForeignKey("menus.id"), nullable=False)
+    menu_id = Column(Integer, ForeignKey("menus.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     menu = relationship(
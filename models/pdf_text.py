@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+
+from core.database import Base
+
+
+class PdfText(Base):
+    __tablename__ = "pdf_texts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Bir xil mazmunli PDF bir marta qayta ishlanadi (stored_files.sha256)
+    sha256 = Column(String(64), unique=True, nullable=False)
+    path = Column(String(255), nullable=False)
+    # pending, processing, done yoki failed
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    page_count = Column(Integer)
+    text = Column(Text)
+    error = Column(String(500))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, JSON
 from core.database import Base
 
 
@@ -13,3 +13,5 @@ class Rahbariyat(Base):
     elektron_pochta = Column(String)
     mutahassisligi = Column(String)
     rasm = Column(String)
+    # Fon rejimida tayyorlanadigan o'lchamlar va formatlar (services/image_renditions.py)
+    renditions = Column(JSON)
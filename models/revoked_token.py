@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+
+from core.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # Tokenning jti claim'i (uuid4 hex) - to'liq JWT satri saqlanmaydi
+    jti = Column(String(32), primary_key=True)
+    # Token muddati: shundan keyin yozuv kerak emas va fon vazifasi uni o'chiradi
+    expires_at = Column(DateTime, nullable=False, index=True)
+    # Boshqa worker'lar faqat shu vaqtdan keyin qo'shilgan qatorlarni o'qiydi (auth/cache.py)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -9,7 +9,7 @@ class ShaharsozlikNormaQoidaBolim(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
-    tizim = Column(Integer, ForeignKey("tizim.id", ondelete="CASCADE"))
+    tizim = Column(Integer, ForeignKey("tizim.id", ondelete="CASCADE"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     tizim_obj = relationship(
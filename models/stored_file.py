@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from core.database import Base
+
+
+class StoredFile(Base):
+    __tablename__ = "stored_files"
+
+    # static/ ga nisbatan yo'l: static/pdfs/<sha256>.pdf
+    path = Column(String(255), primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100))
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
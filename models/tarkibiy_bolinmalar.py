@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, JSON
 from core.database import Base
 
 
@@ -11,3 +11,5 @@ class TarkibiyBolinma(Base):
     telefon = Column(String)
     elektron_pochta = Column(String)
     image = Column(String)
+    # Fon rejimida tayyorlanadigan o'lchamlar va formatlar (services/image_renditions.py)
+    renditions = Column(JSON)
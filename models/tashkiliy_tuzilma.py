@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, JSON
 from core.database import Base
 
 
@@ -7,3 +7,5 @@ class TashkilTuzilma(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     image = Column(String)
+    # Fon rejimida tayyorlanadigan o'lchamlar va formatlar (services/image_renditions.py)
+    renditions = Column(JSON)
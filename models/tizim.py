@@ -10,6 +10,9 @@ class Tizim(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Tizim, uning bo'limlari yoki guruhlari o'zgargan commit'da oshadi:
+    # /full_tizim/ snapshoti boshqa worker'dagi o'zgarishni shu bo'yicha topadi
+    tree_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # bog‘langan bolimlar
     bolimlar = relationship(
@@ -1,22 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from pydantic import BaseModel, Field
-from passlib.context import CryptContext
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from core.database import get_db
+from core.ratelimit import client_ip, login_limiter
 from models.admin import Admin
-from models.blacklisted_token import BlacklistedToken
-from auth.token import create_access_token
-from auth.utils import verify_password
+from models.revoked_token import RevokedToken
+from auth.cache import revoked_tokens, token_cache, token_hash
+from auth.token import create_access_token, decode_access_claims
+from auth.utils import hash_password, verify_and_update_password
 from auth.dependencies import get_current_admin
 from schemas.admin import AdminOut
 
 router = APIRouter(prefix="/admin-auth", tags=["Admin Auth"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer()
 
 
@@ -36,15 +38,32 @@ class AdminCreate(BaseModel):
 
 @router.post("/login")
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
+    # Cheklovdan oshgan urinish DB so'rovi va bcrypt'gacha yetib bormaydi
+    await login_limiter.check(form_data.username, client_ip(request))
+
     result = await db.execute(select(Admin).where(Admin.username == form_data.username))
     admin = result.scalar_one_or_none()
 
-    if not admin or not verify_password(form_data.password, admin.hashed_password):
+    if not admin:
+        await login_limiter.failed(form_data.username)
+        raise HTTPException(
+            status_code=400, detail="Noto'g'ri foydalanuvchi nomi yoki parol")
+
+    verified, new_hash = await verify_and_update_password(
+        form_data.password, admin.hashed_password)
+    if not verified:
+        await login_limiter.failed(form_data.username)
         raise HTTPException(
             status_code=400, detail="Noto'g'ri foydalanuvchi nomi yoki parol")
+    await login_limiter.succeeded(form_data.username)
+    if new_hash:
+        # BCRYPT_ROUNDS o'zgargan: parol yangi narx bilan qayta saqlanadi
+        admin.hashed_password = new_hash
+        await db.commit()
 
     token = create_access_token({"sub": admin.username})
     return {"access_token": token, "token_type": "bearer"}
@@ -69,7 +88,7 @@ async def register(
                 status_code=400, detail="Bu foydalanuvchi nomi allaqachon mavjud")
 
         # Parolni hash qilish
-        hashed_password = pwd_context.hash(admin_data.password)
+        hashed_password = await hash_password(admin_data.password)
 
         # Yangi admin yaratish
         new_admin = Admin(
@@ -97,10 +116,16 @@ async def logout(
 ):
     try:
         token = credentials.credentials
-        # Tokenni qora ro'yxatga qo'shish
-        blacklisted_token = BlacklistedToken(token=token)
-        db.add(blacklisted_token)
+        claims = decode_access_claims(token)
+        # Tokenni jti bo'yicha bekor qilish: yozuv token muddati tugagach o'chiriladi
+        db.add(RevokedToken(
+            jti=claims["jti"],
+            expires_at=datetime.utcfromtimestamp(claims["exp"])
+        ))
         await db.commit()
+        # Shu worker darhol, qolganlari keyingi yangilanishda tokenni rad etadi
+        revoked_tokens.add(claims["jti"], claims["exp"])
+        token_cache.discard(token_hash(token))
         return {"message": "Muvaffaqiyatli tizimdan chiqildi"}
     except Exception as e:
         raise HTTPException(
@@ -1,14 +1,18 @@
 import os
-from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, or_
 from core.database import get_db
-from models.boglanish_form import BoglanishForm
-from schemas.boglanish_form import BoglanishFormCreate, BoglanishFormOut, PaginatedBoglanishFormOut
+from core.crud import CRUD
+from core.pagination import CURSOR_QUERY, WITH_TOTAL_QUERY
+from core.uploads import receive_upload, save_upload
+from models.boglanish_form import BoglanishForm, normalize_email, normalize_phone
+from schemas.boglanish_form import (BoglanishFormAccepted, BoglanishFormCreate, BoglanishFormOut,
+                                   PaginatedBoglanishFormOut)
 from auth.dependencies import get_current_admin
-from aiofiles import open as aio_open
+from services.boglanish_inbox import inbox_counts, search_clause
+from services.boglanish_intake import boglanish_intake
 from dotenv import load_dotenv
 from datetime import datetime
 from typing import Optional
@@ -20,6 +24,8 @@ load_dotenv()
 FILE_FOLDER = os.getenv("FILE_FOLDER", "static/files")
 ALLOWED_FILE_TYPES = ["application/pdf"]
 
+crud = CRUD(BoglanishForm, "Murojat topilmadi", file_fields=("fayl",))
+
 
 @router.get("/for_admin/", response_model=PaginatedBoglanishFormOut)
 async def get_all(
@@ -32,34 +38,28 @@ async def get_all(
     search: Optional[str] = Query(
         None, description="FIO, email, tel_raqam yoki type bo'yicha umumiy qidiruv."),
     email: Optional[str] = Query(
-        None, description="Maxsus email bo'yicha filtr."),
+        None, description="Maxsus email bo'yicha filtr (katta-kichik harf farqlanmaydi)."),
     tel_raqam: Optional[str] = Query(
-        None, description="Maxsus telefon raqami bo'yicha filtr."),
+        None, description="Maxsus telefon raqami bo'yicha filtr (faqat raqamlar solishtiriladi: +998 90 123 45 67 = 998901234567)."),
     type: Optional[str] = Query(
         None, description="Maxsus murojat turi bo'yicha filtr."),
     created_at_start: Optional[datetime] = Query(
         None, description="Yaratilgan vaqt boshlanishi (masalan, 2025-01-01T00:00:00)."),
     created_at_end: Optional[datetime] = Query(
-        None, description="Yaratilgan vaqt tugashi (masalan, 2025-12-31T23:59:59).")
+        None, description="Yaratilgan vaqt tugashi (masalan, 2025-12-31T23:59:59)."),
+    cursor: Optional[str] = CURSOR_QUERY,
+    with_total: bool = WITH_TOTAL_QUERY
 ):
     try:
         query = select(BoglanishForm)
 
-        # Filtrlash shartlari
+        # Filtrlash shartlari: har biri indeks orqali bajariladi
         if search:
-            search = f"%{search}%"
-            query = query.filter(
-                or_(
-                    BoglanishForm.FIO.ilike(search),
-                    BoglanishForm.email.ilike(search),
-                    BoglanishForm.tel_raqam.ilike(search),
-                    BoglanishForm.type.ilike(search)
-                )
-            )
+            query = query.filter(search_clause(search))
         if email:
-            query = query.filter(BoglanishForm.email == email)
+            query = query.filter(BoglanishForm.email_normalized == normalize_email(email))
         if tel_raqam:
-            query = query.filter(BoglanishForm.tel_raqam == tel_raqam)
+            query = query.filter(BoglanishForm.tel_normalized == normalize_phone(tel_raqam))
         if type:
             query = query.filter(BoglanishForm.type == type)
         if created_at_start:
@@ -67,27 +67,18 @@ async def get_all(
         if created_at_end:
             query = query.filter(BoglanishForm.created_at <= created_at_end)
 
-        # Umumiy elementlar sonini hisoblash
-        total_query = await db.execute(select(func.count()).select_from(query.subquery()))
-        total = total_query.scalar()
-
-        # Sahifalash uchun ma'lumotlarni olish
-        offset = (page - 1) * per_page
-        result = await db.execute(
-            query.offset(offset).limit(per_page).order_by(BoglanishForm.id)
-        )
-        items = result.scalars().all()
-
-        # Umumiy sahifalar sonini hisoblash
-        total_pages = (total + per_page - 1) // per_page
-
-        return PaginatedBoglanishFormOut(
-            items=items,
-            total=total,
-            page=page,
-            per_page=per_page,
-            total_pages=total_pages
-        )
+        page_data = await crud.page(db, page=page, per_page=per_page, cursor=cursor,
+                                    with_total=False, query=query)
+        if with_total:
+            # Son keshdan olinadi: bir xil filtr uchun COUNT har so'rovda qayta hisoblanmaydi
+            total = await inbox_counts.count(db, query, (
+                search, normalize_email(email), normalize_phone(tel_raqam), type,
+                created_at_start, created_at_end))
+            page_data["total"] = total
+            page_data["total_pages"] = (total + per_page - 1) // per_page
+        return PaginatedBoglanishFormOut(**page_data)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -95,7 +86,9 @@ async def get_all(
         )
 
 
-@router.post("/", response_model=BoglanishFormOut)
+@router.post("/", response_model=BoglanishFormOut,
+             responses={202: {"model": BoglanishFormAccepted,
+                              "description": "BOGLANISH_INTAKE_MODE=queue: murojaat navbatga qo'yildi"}})
 async def create(
     FIO: str = Form(..., description="Foydalanuvchining FIOsi"),
     email: str = Form(..., description="Foydalanuvchining email manzili"),
@@ -113,13 +106,12 @@ async def create(
                 detail=f"Yaroqsiz fayl turi: {fayl.content_type}. Faqat PDF fayllar ruxsat etiladi."
             )
 
+        if boglanish_intake.enabled:
+            return await _enqueue(FIO, email, tel_raqam, type, murojat_matni, fayl)
+
         file_path = None
         if fayl:
-            os.makedirs(FILE_FOLDER, exist_ok=True)
-            filename = f"{uuid4().hex}_{fayl.filename}"
-            file_path = os.path.join(FILE_FOLDER, filename)
-            async with aio_open(file_path, "wb") as f:
-                await f.write(await fayl.read())
+            file_path = (await save_upload(fayl, FILE_FOLDER, db)).path
 
         # BoglanishFormCreate schemaga ma'lumotlarni yuborish
         boglanish_data = BoglanishFormCreate(
@@ -131,18 +123,7 @@ async def create(
             fayl=file_path
         )
 
-        new_boglanish = BoglanishForm(
-            FIO=boglanish_data.FIO,
-            email=boglanish_data.email,
-            tel_raqam=boglanish_data.tel_raqam,
-            type=boglanish_data.type,
-            murojat_matni=boglanish_data.murojat_matni,
-            fayl=boglanish_data.fayl
-        )
-        db.add(new_boglanish)
-        await db.commit()
-        await db.refresh(new_boglanish)
-        return new_boglanish
+        return await crud.create(db, boglanish_data.model_dump())
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -150,3 +131,23 @@ async def create(
             status_code=500,
             detail=f"Murojat yaratishda xato yuz berdi: {str(e)}"
         )
+
+
+async def _enqueue(FIO, email, tel_raqam, type, murojat_matni, fayl):
+    # Avval tekshiriladi: noto'g'ri forma uchun fayl diskka yozilmaydi
+    data = BoglanishFormCreate(
+        FIO=FIO,
+        email=email,
+        tel_raqam=tel_raqam,
+        type=type,
+        murojat_matni=murojat_matni,
+    ).model_dump()
+    received = await receive_upload(fayl, FILE_FOLDER) if fayl else None
+    try:
+        request_id = await boglanish_intake.submit(data, received)
+    except BaseException:
+        if received is not None and os.path.exists(received.tmp_path):
+            os.remove(received.tmp_path)
+        raise
+    return JSONResponse(status_code=202, content=BoglanishFormAccepted(
+        message="Murojaat qabul qilindi", request_id=request_id).model_dump())
@@ -1,22 +1,19 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
+from core.cache import etag_matches
 
-from models.tizim import Tizim
-from models.shaharsozlik_norma_qoida_bolim import ShaharsozlikNormaQoidaBolim
+from schemas.full_tizim import FullTizimSchema
+from services.full_tizim import full_tizim_snapshot
 
 router = APIRouter(prefix="/full_tizim", tags=['Full Tizim'])
 
 
-@router.get("/")
-async def get_full_tizim(session: AsyncSession = Depends(get_db)):
-    result = await session.execute(
-        select(Tizim).options(
-            selectinload(Tizim.bolimlar).selectinload(
-                ShaharsozlikNormaQoidaBolim.guruhlar)
-        )
-    )
-    tizimlar = result.scalars().unique().all()
-    return tizimlar
+@router.get("/", response_model=list[FullTizimSchema])
+async def get_full_tizim(request: Request, session: AsyncSession = Depends(get_db)):
+    # Daraxt oldindan JSON baytlarga aylantirilgan, shuning uchun to'g'ridan-to'g'ri qaytariladi
+    body, etag = await full_tizim_snapshot.get(session)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
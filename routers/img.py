@@ -0,0 +1,66 @@
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+
+from core.static import STATIC_CACHE_CONTROL, STATIC_IMMUTABLE_CACHE_CONTROL, is_hashed_name
+from services.image_cache import IMG_MAX_WIDTH, image_cache
+from services.image_render import is_decode_error
+
+router = APIRouter(prefix="/img", tags=["Rasmlar"])
+
+load_dotenv()
+
+IMAGE_FOLDER = os.getenv("IMAGE_FOLDER", "static/images")
+
+
+def _negotiate(accept: str, source: str, formats: list[str]) -> str:
+    # fmt berilmasa brauzer qo'llaydigan eng ixcham format tanlanadi
+    for fmt in ("avif", "webp"):
+        if f"image/{fmt}" in accept and fmt in formats:
+            return fmt
+    return "png" if source.lower().endswith(".png") else "jpeg"
+
+
+@router.get("/{name}", response_class=FileResponse)
+async def get_image(
+    request: Request,
+    name: str,
+    w: int = Query(..., ge=1, le=IMG_MAX_WIDTH,
+                   description=f"Kenglik (piksel), 1-{IMG_MAX_WIDTH}. Rasm kattalashtirilmaydi."),
+    fmt: Optional[str] = Query(
+        None, description="avif, webp, jpeg yoki png. Berilmasa Accept sarlavhasi bo'yicha tanlanadi."),
+):
+    if not image_cache.available:
+        raise HTTPException(status_code=503, detail="Rasm o'lchamini o'zgartirish mavjud emas")
+    # Faqat static/images ichidagi fayl nomi: boshqa papkalarga chiqib bo'lmaydi
+    if name != os.path.basename(name) or name.startswith("."):
+        raise HTTPException(status_code=404, detail="Rasm topilmadi")
+    source = os.path.join(IMAGE_FOLDER, name)
+    if not os.path.isfile(source):
+        raise HTTPException(status_code=404, detail="Rasm topilmadi")
+
+    formats = image_cache.formats()
+    # Xesh nomli rasm o'zgarmaydi; boshqa nom ostidagi fayl almashtirilishi mumkin
+    headers = {"Cache-Control": (STATIC_IMMUTABLE_CACHE_CONTROL if is_hashed_name(name)
+                                 else STATIC_CACHE_CONTROL)}
+    if fmt is None:
+        fmt = _negotiate(request.headers.get("accept", ""), source, formats)
+        headers["Vary"] = "Accept"
+    fmt = fmt.lower()
+    if fmt not in formats:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Yaroqsiz format: {fmt}. Ruxsat etilganlar: {', '.join(formats)}")
+
+    try:
+        path = await image_cache.get(source, w, fmt)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Rasm topilmadi")
+    except Exception as e:
+        if not is_decode_error(e):
+            raise
+        raise HTTPException(status_code=400, detail="Faylni rasm sifatida o'qib bo'lmadi")
+    return FileResponse(path, media_type=f"image/{fmt}", headers=headers)
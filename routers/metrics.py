@@ -0,0 +1,85 @@
+import hmac
+import os
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from auth.cache import token_cache
+from auth.utils import password_hasher
+from core.cache import response_cache
+from core.database import engine
+from core.metrics import format_labels, format_value, registry
+from core.ratelimit import login_limiter
+from services.boglanish_intake import boglanish_intake
+from services.image_cache import image_cache
+
+router = APIRouter(tags=["Monitoring"])
+
+load_dotenv()
+
+# Berilsa /metrics faqat "Authorization: Bearer <token>" bilan ochiladi
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _gauge(name: str, help: str, value, kind: str = "gauge", labels: dict | None = None) -> list[str]:
+    label_text = format_labels(tuple(labels), tuple(labels.values())) if labels else ""
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}",
+            f"{name}{label_text} {format_value(value)}"]
+
+
+def _component_metrics() -> list[str]:
+    # Boshqa modullarning o'z hisoblagichlari: scrape paytida o'qiladi, so'rov yo'liga tegmaydi
+    hasher = password_hasher.stats
+    lines = [
+        *_gauge("password_hash_completed_total", "Bajarilgan parol xeshlash/tekshirish amallari",
+                hasher.completed, "counter"),
+        *_gauge("password_hash_rejected_total", "Navbat to'lgani uchun rad etilgan (503) amallar",
+                hasher.rejected, "counter"),
+        *_gauge("password_hash_pending", "Bajarilayotgan va navbatdagi amallar", hasher.pending),
+        *_gauge("password_hash_queue_seconds_total", "Navbatda kutilgan umumiy vaqt",
+                hasher.queue_seconds_total, "counter"),
+        *_gauge("password_hash_run_seconds_total", "bcrypt ishining umumiy vaqti",
+                hasher.run_seconds_total, "counter"),
+        *_gauge("login_rate_limited_total", "429 bilan rad etilgan login urinishlari",
+                login_limiter.rejected, "counter"),
+        *_gauge("response_cache_hits_total", "Javoblar keshidan berilgan so'rovlar",
+                response_cache.hits, "counter"),
+        *_gauge("response_cache_misses_total", "Javoblar keshida topilmagan so'rovlar",
+                response_cache.misses, "counter"),
+        *_gauge("response_cache_entries", "Javoblar keshidagi yozuvlar", len(response_cache)),
+        *_gauge("response_cache_bytes", "Javoblar keshi hajmi", response_cache.size_bytes),
+        *_gauge("auth_token_cache_entries", "Tekshirilgan tokenlar keshi", len(token_cache)),
+        *_gauge("image_cache_hits_total", "/img nusxalari diskdan berilgan",
+                image_cache.hits, "counter"),
+        *_gauge("image_cache_misses_total", "/img nusxasi yaratilgan", image_cache.misses, "counter"),
+        *_gauge("image_cache_coalesced_total", "Yaratilayotgan nusxani kutgan so'rovlar",
+                image_cache.coalesced, "counter"),
+        *_gauge("image_cache_evictions_total", "Keshdan o'chirilgan nusxalar",
+                image_cache.evictions, "counter"),
+        *_gauge("image_cache_bytes", "/img disk keshi hajmi", image_cache.size_bytes),
+        *_gauge("boglanish_intake_pending", "Navbatdagi murojaatlar", boglanish_intake.pending),
+        *_gauge("boglanish_intake_written_total", "Navbatdan bazaga yozilgan murojaatlar",
+                boglanish_intake.written, "counter"),
+        *_gauge("boglanish_intake_dropped_total", "Yozib bo'lmagani uchun tashlangan murojaatlar",
+                boglanish_intake.dropped, "counter"),
+    ]
+    pool = engine.sync_engine.pool
+    # Xotiradagi SQLite StaticPool'da bu hisoblagichlar yo'q
+    if hasattr(pool, "checkedout"):
+        lines += _gauge("db_pool_checked_out", "Band ulanishlar", pool.checkedout())
+        lines += _gauge("db_pool_size", "Pool hajmi", pool.size())
+        lines += _gauge("db_pool_overflow", "Pooldan tashqari ochilgan ulanishlar", pool.overflow())
+    return lines
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str | None = Header(None)):
+    if METRICS_TOKEN:
+        supplied = (authorization or "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Ruxsat yo'q")
+    lines = registry.render() + _component_metrics()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from auth.dependencies import get_current_admin
+from core.profiler import PROFILE_PATH_PREFIX, SQL_PROFILE, profile_store
+
+router = APIRouter(prefix=PROFILE_PATH_PREFIX, tags=["Monitoring"])
+
+
+def _require_profiler():
+    if not SQL_PROFILE:
+        raise HTTPException(status_code=404, detail="SQL profiler o'chirilgan (SQL_PROFILE)")
+
+
+@router.get(
+    "/",
+    dependencies=[Depends(_require_profiler)],
+    summary="Oxirgi so'rovlar izlari",
+    description="Faqat adminlar uchun: SQL_PROFILE rejimida yozilgan oxirgi so'rovlar (eng yangisi birinchi). n_plus_one=true bo'lsa faqat bir xil SQL takrorlangan so'rovlar qaytariladi.",
+)
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=500, description="Nechta iz qaytarilsin"),
+    n_plus_one: bool = Query(False, description="Faqat N+1 gumon qilingan so'rovlar"),
+    current_admin=Depends(get_current_admin)
+):
+    return [profile.summary() for profile in profile_store.recent(limit, n_plus_one)]
+
+
+@router.get(
+    "/{profile_id}",
+    dependencies=[Depends(_require_profiler)],
+    summary="So'rov izi",
+    description="Faqat adminlar uchun: javobdagi X-Profile-Id bo'yicha so'rovning barcha SQL so'rovlari, ularning vaqti va takrorlangan shakllari.",
+)
+async def get_profile(profile_id: str, current_admin=Depends(get_current_admin)):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Iz topilmadi yoki eskirgan")
+    return profile.as_dict()
@@ -1,11 +1,12 @@
-import re
-from fastapi import APIRouter, Form, Depends, HTTPException, Query
+from fastapi import APIRouter, Form, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from core.database import get_db
+from core.conditional import conditional_get
+from core.crud import CRUD, add_crud_routes
+from core.pagination import CURSOR_QUERY, list_page
 from models.qonun_qaror_farmon import QonunQarorFarmon
 from schemas.qonun_qaror_farmon import QonunQarorFarmonOut
-from auth.dependencies import get_current_admin
 from datetime import date
 from dotenv import load_dotenv
 from pydantic import BaseModel, validator
@@ -61,46 +62,7 @@ class QonunQarorFarmonCreate(BaseModel):
         return v.strip()
 
 
-@router.get(
-    "/",
-    response_model=list[QonunQarorFarmonOut],
-    summary="Barcha qonun, qaror va farmonlarni olish",
-    description="Barcha qonun, qaror va farmonlarni sahifalarga bo'lib olish. Limit (bir sahifadagi yozuvlar soni) va offset (qaysi yozuvdan boshlash) parametrlari yordamida so'rovni boshqarish mumkin. Ma'lumotlar sana bo'yicha kamayish tartibida qaytariladi.",
-    response_description="Qonun, qaror va farmonlar ro'yxati, har birida id, nomi, turi, matni, raqami, sanasi va manbasi."
-)
-async def get_all(
-    db: AsyncSession = Depends(get_db),
-    limit: int = Query(
-        10,
-        ge=1,
-        le=100,
-        description="Bir sahifadagi yozuvlar soni (1-100). Masalan: 10"
-    ),
-    offset: int = Query(
-        0,
-        ge=0,
-        description="Qaysi yozuvdan boshlash (0 yoki undan katta). Masalan: 0"
-    )
-):
-    try:
-        result = await db.execute(
-            select(QonunQarorFarmon).offset(offset).limit(
-                limit).order_by(QonunQarorFarmon.date.desc())
-        )
-        return result.scalars().all()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni olishda xato: {str(e)}")
-
-
-@router.post(
-    "/for_admin/",
-    response_model=QonunQarorFarmonOut,
-    summary="Yangi qonun, qaror yoki farmon yaratish",
-    description="Faqat adminlar uchun: Yangi qonun, qaror yoki farmon yaratish. Barcha maydonlar majburiy: title (kamida 5 belgi), type ('Qonun', 'Qaror', 'Farmon'), content (kamida 10 belgi), number (kamida 3 belgi), date (YYYY-MM-DD formatida), source (kamida 3 belgi).",
-    response_description="Yaratilgan qonun, qaror yoki farmon ma'lumotlari."
-)
-async def create_qonun_qaror_farmon(
+async def qonun_form(
     title: str = Form(...,
                       description="Nomi, kamida 5 belgi. Masalan: 'Mehnat to'g'risida qonun'"),
     type: str = Form(..., description="Tur, faqat 'Qonun', 'Qaror' yoki 'Farmon'. Masalan: 'Qonun'"),
@@ -111,10 +73,8 @@ async def create_qonun_qaror_farmon(
     date: date = Form(...,
                       description="Sana, YYYY-MM-DD formatida. Masalan: '2025-07-02'"),
     source: str = Form(...,
-                       description="Manba, kamida 3 belgi. Masalan: 'Xalq so'zi'"),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
+                       description="Manba, kamida 3 belgi. Masalan: 'Xalq so'zi'")
+) -> dict:
     try:
         data = QonunQarorFarmonCreate(
             title=title,
@@ -126,101 +86,63 @@ async def create_qonun_qaror_farmon(
         )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
-
-    new_qonun = QonunQarorFarmon(
-        title=data.title,
-        type=data.type,
-        content=data.content,
-        number=data.number,
-        date=data.date,
-        source=data.source
-    )
-    try:
-        db.add(new_qonun)
-        await db.commit()
-        await db.refresh(new_qonun)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni saqlashda xato: {str(e)}")
-    return new_qonun
+    return data.model_dump()
 
 
-@router.put(
-    "/{id}/for_admin/",
-    response_model=QonunQarorFarmonOut,
-    summary="Qonun, qaror yoki farmonni yangilash",
-    description="Faqat adminlar uchun: Mavjud qonun, qaror yoki farmonni yangilash. ID orqali hujjat topiladi va yangi ma'lumotlar (title, type, content, number, date, source) bilan yangilanadi.",
-    response_description="Yangilangan qonun, qaror yoki farmon ma'lumotlari."
+@router.get(
+    "/",
+    response_model=list[QonunQarorFarmonOut],
+    dependencies=[conditional_get(QonunQarorFarmon)],
+    summary="Barcha qonun, qaror va farmonlarni olish",
+    description="Barcha qonun, qaror va farmonlarni sahifalarga bo'lib olish. Limit (bir sahifadagi yozuvlar soni) va offset (qaysi yozuvdan boshlash) parametrlari yordamida so'rovni boshqarish mumkin. Ma'lumotlar sana bo'yicha kamayish tartibida qaytariladi.",
+    response_description="Qonun, qaror va farmonlar ro'yxati, har birida id, nomi, turi, matni, raqami, sanasi va manbasi."
 )
-async def update_qonun_qaror_farmon(
-    id: int,
-    title: str = Form(...,
-                      description="Nomi, kamida 5 belgi. Masalan: 'Mehnat to'g'risida qonun'"),
-    type: str = Form(..., description="Tur, faqat 'Qonun', 'Qaror' yoki 'Farmon'. Masalan: 'Qonun'"),
-    content: str = Form(...,
-                        description="Matn, kamida 10 belgi. Masalan: 'Ushbu hujjatda...'"),
-    number: str = Form(...,
-                       description="Raqam, kamida 3 belgi. Masalan: '123-AB'"),
-    date: date = Form(...,
-                      description="Sana, YYYY-MM-DD formatida. Masalan: '2025-07-02'"),
-    source: str = Form(...,
-                       description="Manba, kamida 3 belgi. Masalan: 'Xalq so'zi'"),
+async def get_all(
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
+    limit: int = Query(
+        10,
+        ge=1,
+        le=100,
+        description="Bir sahifadagi yozuvlar soni (1-100). Masalan: 10"
+    ),
+    offset: int = Query(
+        0,
+        ge=0,
+        description="Qaysi yozuvdan boshlash (0 yoki undan katta). Masalan: 0"
+    ),
+    cursor: str | None = CURSOR_QUERY
 ):
     try:
-        data = QonunQarorFarmonCreate(
-            title=title,
-            type=type,
-            content=content,
-            number=number,
-            date=date,
-            source=source
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
-
-    result = await db.execute(select(QonunQarorFarmon).where(QonunQarorFarmon.id == id))
-    qonun = result.scalar_one_or_none()
-    if not qonun:
-        raise HTTPException(status_code=404, detail="Ma'lumot topilmadi")
-
-    qonun.title = data.title
-    qonun.type = data.type
-    qonun.content = data.content
-    qonun.number = data.number
-    qonun.date = data.date
-    qonun.source = data.source
-
-    try:
-        await db.commit()
-        await db.refresh(qonun)
+        return await list_page(db, select(QonunQarorFarmon), QonunQarorFarmon.date, response,
+                               limit=limit, offset=offset, cursor=cursor,
+                               id_col=QonunQarorFarmon.id, descending=True)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni yangilashda xato: {str(e)}")
-    return qonun
+            status_code=500, detail=f"Ma'lumotlarni olishda xato: {str(e)}")
 
 
-@router.delete(
-    "/{id}/for_admin/",
-    summary="Qonun, qaror yoki farmonni o'chirish",
-    description="Faqat adminlar uchun: ID orqali qonun, qaror yoki farmonni o'chirish.",
-    response_description="O'chirish muvaffaqiyatli amalga oshirildi."
+crud = CRUD(QonunQarorFarmon, "Ma'lumot topilmadi")
+add_crud_routes(
+    router, crud, out_model=QonunQarorFarmonOut,
+    create_form=qonun_form, create_error="Ma'lumotlarni saqlashda xato",
+    update_form=qonun_form, update_error="Ma'lumotlarni yangilashda xato",
+    deleted_message="Muvaffaqiyatli o'chirildi",
+    delete_error="Ma'lumotlarni o'chirishda xato",
+    docs={
+        "create": dict(
+            summary="Yangi qonun, qaror yoki farmon yaratish",
+            description="Faqat adminlar uchun: Yangi qonun, qaror yoki farmon yaratish. Barcha maydonlar majburiy: title (kamida 5 belgi), type ('Qonun', 'Qaror', 'Farmon'), content (kamida 10 belgi), number (kamida 3 belgi), date (YYYY-MM-DD formatida), source (kamida 3 belgi).",
+            response_description="Yaratilgan qonun, qaror yoki farmon ma'lumotlari."),
+        "update": dict(
+            summary="Qonun, qaror yoki farmonni yangilash",
+            description="Faqat adminlar uchun: Mavjud qonun, qaror yoki farmonni yangilash. ID orqali hujjat topiladi va yangi ma'lumotlar (title, type, content, number, date, source) bilan yangilanadi.",
+            response_description="Yangilangan qonun, qaror yoki farmon ma'lumotlari."),
+        "delete": dict(
+            summary="Qonun, qaror yoki farmonni o'chirish",
+            description="Faqat adminlar uchun: ID orqali qonun, qaror yoki farmonni o'chirish.",
+            response_description="O'chirish muvaffaqiyatli amalga oshirildi."),
+    },
 )
-async def delete_qonun_qaror_farmon(
-    id: int,
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
-    result = await db.execute(select(QonunQarorFarmon).where(QonunQarorFarmon.id == id))
-    qonun = result.scalar_one_or_none()
-    if not qonun:
-        raise HTTPException(status_code=404, detail="Ma'lumot topilmadi")
-
-    try:
-        await db.delete(qonun)
-        await db.commit()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni o'chirishda xato: {str(e)}")
-    return {"message": "Muvaffaqiyatli o'chirildi"}
@@ -1,14 +1,14 @@
 import os
 import re
-from uuid import uuid4
 from fastapi import APIRouter, Form, UploadFile, File, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from core.database import get_db
+from core.conditional import conditional_get
+from core.crud import CRUD, add_crud_routes
+from core.uploads import IMAGE_MAX_BYTES, save_upload
 from models.rahbariyat import Rahbariyat
 from schemas.rahbariyat import RahbariyatOut
-from auth.dependencies import get_current_admin
-from aiofiles import open as aio_open
 from dotenv import load_dotenv
 from pydantic import BaseModel, EmailStr, validator
 
@@ -19,6 +19,8 @@ load_dotenv()
 IMAGE_FOLDER = os.getenv("IMAGE_FOLDER", "static/images")
 ALLOWED_IMAGE_TYPES = os.getenv(
     "ALLOWED_IMAGE_TYPES", "image/png,image/jpeg,image/jpg").split(",")
+# Rasmsiz yozuvlar uchun umumiy rasm: hech qachon bo'shatilmaydi
+DEFAULT_IMAGE = "/static/images/default.png"
 
 
 class RahbariyatCreate(BaseModel):
@@ -73,14 +75,23 @@ class RahbariyatCreate(BaseModel):
         return v
 
 
-@router.get("/", response_model=list[RahbariyatOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Rahbariyat))
-    return result.scalars().all()
+async def _save_rasm(rasm: UploadFile, db: AsyncSession) -> str:
+    if rasm.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Yaroqsiz fayl turi: {rasm.content_type}. Faqat PNG, JPG, JPEG ruxsat etiladi. Masalan: rasm.jpg"
+        )
+    try:
+        saved = await save_upload(rasm, IMAGE_FOLDER, db, max_bytes=IMAGE_MAX_BYTES)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Rasmni saqlashda xato: {str(e)}")
+    return f"/static/images/{saved.filename}"
 
 
-@router.post("/for_admin/", response_model=RahbariyatOut)
-async def create_rahbariyat(
+async def create_form(
     positions: str = Form(...),
     full_name: str = Form(...),
     qabul_kunlari: str = Form(...),
@@ -88,9 +99,8 @@ async def create_rahbariyat(
     elektron_pochta: str = Form(...),
     mutahassisligi: str = Form(...),
     rasm: UploadFile = File(None),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
+    db: AsyncSession = Depends(get_db)
+) -> dict:
     try:
         data = RahbariyatCreate(
             positions=positions,
@@ -103,46 +113,11 @@ async def create_rahbariyat(
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    if rasm:
-        if rasm.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Yaroqsiz fayl turi: {rasm.content_type}. Faqat PNG, JPG, JPEG ruxsat etiladi. Masalan: rasm.jpg"
-            )
-        filename = f"{uuid4().hex}_{rasm.filename}"
-        file_path = os.path.join(IMAGE_FOLDER, filename)
-        try:
-            async with aio_open(file_path, "wb") as f:
-                await f.write(await rasm.read())
-            image_url = f"/static/images/{filename}"
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Rasmni saqlashda xato: {str(e)}")
-    else:
-        image_url = "/static/images/default.png"
-
-    new_person = Rahbariyat(
-        positions=data.positions,
-        full_name=data.full_name,
-        qabul_kunlari=data.qabul_kunlari,
-        telefon=data.telefon,
-        elektron_pochta=data.elektron_pochta,
-        mutahassisligi=data.mutahassisligi,
-        rasm=image_url
-    )
-    try:
-        db.add(new_person)
-        await db.commit()
-        await db.refresh(new_person)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni saqlashda xato: {str(e)}")
-    return new_person
+    image_url = await _save_rasm(rasm, db) if rasm else DEFAULT_IMAGE
+    return {**data.model_dump(), "rasm": image_url}
 
 
-@router.put("/{id}/for_admin/", response_model=RahbariyatOut)
-async def update_rahbariyat(
-    id: int,
+async def update_form(
     positions: str = Form(...),
     full_name: str = Form(...),
     qabul_kunlari: str = Form(...),
@@ -150,9 +125,8 @@ async def update_rahbariyat(
     elektron_pochta: str = Form(...),
     mutahassisligi: str = Form(...),
     rasm: UploadFile = File(None),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
+    db: AsyncSession = Depends(get_db)
+) -> dict:
     try:
         data = RahbariyatCreate(
             positions=positions,
@@ -165,75 +139,23 @@ async def update_rahbariyat(
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    result = await db.execute(select(Rahbariyat).where(Rahbariyat.id == id))
-    person = result.scalar_one_or_none()
-    if not person:
-        raise HTTPException(status_code=404, detail="Ma'lumot topilmadi")
-
+    values = data.model_dump()
     if rasm:
-        if rasm.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Yaroqsiz fayl turi: {rasm.content_type}. Faqat PNG, JPG, JPEG ruxsat etiladi. Masalan: rasm.jpg"
-            )
-        old_path = person.rasm.lstrip("/")
-        if os.path.exists(old_path) and "default.png" not in old_path:
-            try:
-                os.remove(old_path)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Eski rasmni o'chirishda xato: {str(e)}")
-
-        filename = f"{uuid4().hex}_{rasm.filename}"
-        file_path = os.path.join(IMAGE_FOLDER, filename)
-        try:
-            async with aio_open(file_path, "wb") as f:
-                await f.write(await rasm.read())
-            person.rasm = f"/static/images/{filename}"
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Rasmni saqlashda xato: {str(e)}")
-
-    person.positions = data.positions
-    person.full_name = data.full_name
-    person.qabul_kunlari = data.qabul_kunlari
-    person.telefon = data.telefon
-    person.elektron_pochta = data.elektron_pochta
-    person.mutahassisligi = data.mutahassisligi
+        values["rasm"] = await _save_rasm(rasm, db)
+    return values
 
-    try:
-        await db.commit()
-        await db.refresh(person)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni yangilashda xato: {str(e)}")
-    return person
-
-
-@router.delete("/{id}/for_admin/")
-async def delete_rahbariyat(
-    id: int,
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
-    result = await db.execute(select(Rahbariyat).where(Rahbariyat.id == id))
-    person = result.scalar_one_or_none()
-    if not person:
-        raise HTTPException(status_code=404, detail="Ma'lumot topilmadi")
-
-    if person.rasm and "default.png" not in person.rasm:
-        old_path = person.rasm.lstrip("/")
-        if os.path.exists(old_path):
-            try:
-                os.remove(old_path)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Rasmni o'chirishda xato: {str(e)}")
 
-    try:
-        await db.delete(person)
-        await db.commit()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni o'chirishda xato: {str(e)}")
-    return {"message": "Muvaffaqiyatli o'chirildi"}
+@router.get("/", response_model=list[RahbariyatOut],
+            dependencies=[conditional_get(Rahbariyat)])
+async def get_all(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Rahbariyat))
+    return result.scalars().all()
+
+
+crud = CRUD(Rahbariyat, "Ma'lumot topilmadi", file_fields=("rasm",),
+            shared_files=(DEFAULT_IMAGE,))
+add_crud_routes(router, crud, out_model=RahbariyatOut,
+                create_form=create_form, create_error="Ma'lumotlarni saqlashda xato",
+                update_form=update_form, update_error="Ma'lumotlarni yangilashda xato",
+                deleted_message="Muvaffaqiyatli o'chirildi",
+                delete_error="Ma'lumotlarni o'chirishda xato")
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from core.search import SEARCH_KINDS, search
+from schemas.search import SearchOut
+
+router = APIRouter(prefix="/search", tags=["Qidiruv"])
+
+
+@router.get(
+    "/",
+    response_model=SearchOut,
+    summary="Hujjatlar bo'yicha to'liq matnli qidiruv",
+    description="Qonun-qarorlar, yangiliklar, e'lonlar, standartlar, normalar (guruhlar), "
+                "smeta resurs normalari, reglamentlar va ularga biriktirilgan PDF'lar matni "
+                "bo'yicha qidiradi. Har bir so'z prefiks "
+                "bo'yicha qidiriladi (masalan, '2.07' yoki 'shahar'). Natijalar moslik darajasi "
+                "bo'yicha kamayish tartibida qaytariladi."
+)
+async def search_documents(
+    q: str = Query(..., min_length=1, max_length=200, description="Qidiruv so'zlari."),
+    type: list[str] | None = Query(
+        None, description=f"Faqat shu turlar: {', '.join(SEARCH_KINDS)}. Bir nechta berish mumkin."),
+    limit: int = Query(20, ge=1, le=100, description="Natijalar soni, 1-100 oralig'ida."),
+    offset: int = Query(0, ge=0, description="Nechanchi natijadan boshlash."),
+    db: AsyncSession = Depends(get_db)
+):
+    unknown = [kind for kind in type or () if kind not in SEARCH_KINDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Noma'lum tur: {', '.join(unknown)}")
+    try:
+        result = await search(db, q, type, limit, offset)
+        return SearchOut(**result, limit=limit, offset=offset)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Qidiruvda xato yuz berdi: {str(e)}"
+        )
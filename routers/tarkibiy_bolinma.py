@@ -1,14 +1,14 @@
 import os
 import re
-from uuid import uuid4
 from fastapi import APIRouter, Form, UploadFile, File, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from core.database import get_db
+from core.conditional import conditional_get
+from core.crud import CRUD, add_crud_routes
+from core.uploads import IMAGE_MAX_BYTES, save_upload
 from models.tarkibiy_bolinmalar import TarkibiyBolinma
 from schemas.tarkibiy_bolinma import TarkibiyBolinmaOut
-from auth.dependencies import get_current_admin
-from aiofiles import open as aio_open
 from dotenv import load_dotenv
 from pydantic import BaseModel, EmailStr, validator
 
@@ -19,6 +19,8 @@ load_dotenv()
 IMAGE_FOLDER = os.getenv("IMAGE_FOLDER", "static/images")
 ALLOWED_IMAGE_TYPES = os.getenv(
     "ALLOWED_IMAGE_TYPES", "image/png,image/jpeg,image/jpg").split(",")
+# Rasmsiz yozuvlar uchun umumiy rasm: hech qachon bo'shatilmaydi
+DEFAULT_IMAGE = "/static/images/default.png"
 
 
 class TarkibiyBolinmaCreate(BaseModel):
@@ -58,26 +60,30 @@ class TarkibiyBolinmaCreate(BaseModel):
         return v
 
 
-@router.get("/", response_model=list[TarkibiyBolinmaOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def _save_image(image: UploadFile, db: AsyncSession) -> str:
+    if image.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Yaroqsiz fayl turi: {image.content_type}. Faqat PNG, JPG, JPEG ruxsat etiladi. Masalan: rasm.jpg"
+        )
     try:
-        result = await db.execute(select(TarkibiyBolinma))
-        return result.scalars().all()
+        saved = await save_upload(image, IMAGE_FOLDER, db, max_bytes=IMAGE_MAX_BYTES)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni olishda xato: {str(e)}")
+            status_code=500, detail=f"Rasmni saqlashda xato: {str(e)}")
+    return f"/static/images/{saved.filename}"
 
 
-@router.post("/for_admin/", response_model=TarkibiyBolinmaOut)
-async def create_tarkibiy_bolinma(
+async def create_form(
     kimligi: str = Form(...),
     full_name: str = Form(...),
     telefon: str = Form(...),
     elektron_pochta: str = Form(...),
     image: UploadFile = File(None),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
+    db: AsyncSession = Depends(get_db)
+) -> dict:
     try:
         data = TarkibiyBolinmaCreate(
             kimligi=kimligi,
@@ -88,52 +94,18 @@ async def create_tarkibiy_bolinma(
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    if image:
-        if image.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Yaroqsiz fayl turi: {image.content_type}. Faqat PNG, JPG, JPEG ruxsat etiladi. Masalan: rasm.jpg"
-            )
-        filename = f"{uuid4().hex}_{image.filename}"
-        file_path = os.path.join(IMAGE_FOLDER, filename)
-        try:
-            async with aio_open(file_path, "wb") as f:
-                await f.write(await image.read())
-            image_url = f"/static/images/{filename}"
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Rasmni saqlashda xato: {str(e)}")
-    else:
-        image_url = "/static/images/default.png"
-
-    new_bolinma = TarkibiyBolinma(
-        kimligi=data.kimligi,
-        full_name=data.full_name,
-        telefon=data.telefon,
-        elektron_pochta=data.elektron_pochta,
-        image=image_url
-    )
-    try:
-        db.add(new_bolinma)
-        await db.commit()
-        await db.refresh(new_bolinma)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni saqlashda xato: {str(e)}")
-    return new_bolinma
+    image_url = await _save_image(image, db) if image else DEFAULT_IMAGE
+    return {**data.model_dump(exclude={"image"}), "image": image_url}
 
 
-@router.put("/{id}/for_admin/", response_model=TarkibiyBolinmaOut)
-async def update_tarkibiy_bolinma(
-    id: int,
+async def update_form(
     kimligi: str = Form(...),
     full_name: str = Form(...),
     telefon: str = Form(...),
     elektron_pochta: str = Form(...),
     image: UploadFile = File(None),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
+    db: AsyncSession = Depends(get_db)
+) -> dict:
     try:
         data = TarkibiyBolinmaCreate(
             kimligi=kimligi,
@@ -144,73 +116,27 @@ async def update_tarkibiy_bolinma(
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    result = await db.execute(select(TarkibiyBolinma).where(TarkibiyBolinma.id == id))
-    bolinma = result.scalar_one_or_none()
-    if not bolinma:
-        raise HTTPException(status_code=404, detail="Ma'lumot topilmadi")
-
+    values = data.model_dump(exclude={"image"})
     if image:
-        if image.content_type not in ALLOWED_IMAGE_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Yaroqsiz fayl turi: {image.content_type}. Faqat PNG, JPG, JPEG ruxsat etiladi. Masalan: rasm.jpg"
-            )
-        old_path = bolinma.image.lstrip("/")
-        if os.path.exists(old_path) and "default.png" not in old_path:
-            try:
-                os.remove(old_path)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Eski rasmni o'chirishda xato: {str(e)}")
-
-        filename = f"{uuid4().hex}_{image.filename}"
-        file_path = os.path.join(IMAGE_FOLDER, filename)
-        try:
-            async with aio_open(file_path, "wb") as f:
-                await f.write(await image.read())
-            bolinma.image = f"/static/images/{filename}"
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Rasmni saqlashda xato: {str(e)}")
-
-    bolinma.kimligi = data.kimligi
-    bolinma.full_name = data.full_name
-    bolinma.telefon = data.telefon
-    bolinma.elektron_pochta = data.elektron_pochta
+        values["image"] = await _save_image(image, db)
+    return values
 
-    try:
-        await db.commit()
-        await db.refresh(bolinma)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni yangilashda xato: {str(e)}")
-    return bolinma
-
-
-@router.delete("/{id}/for_admin/")
-async def delete_tarkibiy_bolinma(
-    id: int,
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
-    result = await db.execute(select(TarkibiyBolinma).where(TarkibiyBolinma.id == id))
-    bolinma = result.scalar_one_or_none()
-    if not bolinma:
-        raise HTTPException(status_code=404, detail="Ma'lumot topilmadi")
-
-    if bolinma.image and "default.png" not in bolinma.image:
-        old_path = bolinma.image.lstrip("/")
-        if os.path.exists(old_path):
-            try:
-                os.remove(old_path)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Rasmni o'chirishda xato: {str(e)}")
 
+@router.get("/", response_model=list[TarkibiyBolinmaOut],
+            dependencies=[conditional_get(TarkibiyBolinma)])
+async def get_all(db: AsyncSession = Depends(get_db)):
     try:
-        await db.delete(bolinma)
-        await db.commit()
+        result = await db.execute(select(TarkibiyBolinma))
+        return result.scalars().all()
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Ma'lumotlarni o'chirishda xato: {str(e)}")
-    return {"message": "Muvaffaqiyatli o'chirildi"}
+            status_code=500, detail=f"Ma'lumotlarni olishda xato: {str(e)}")
+
+
+crud = CRUD(TarkibiyBolinma, "Ma'lumot topilmadi", file_fields=("image",),
+            shared_files=(DEFAULT_IMAGE,))
+add_crud_routes(router, crud, out_model=TarkibiyBolinmaOut,
+                create_form=create_form, create_error="Ma'lumotlarni saqlashda xato",
+                update_form=update_form, update_error="Ma'lumotlarni yangilashda xato",
+                deleted_message="Muvaffaqiyatli o'chirildi",
+                delete_error="Ma'lumotlarni o'chirishda xato")
@@ -1,13 +1,13 @@
 import os
-from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from core.database import get_db
+from core.conditional import conditional_get
+from core.crud import CRUD, add_crud_routes
+from core.uploads import save_upload
 from models.tmsiti_haqida import TmsitiHaqida
 from schemas.tmsiti_haqida import TmsitiHaqidaOut
-from auth.dependencies import get_current_admin
-from aiofiles import open as aio_open
 from dotenv import load_dotenv
 
 router = APIRouter(prefix="/tmsiti-haqida", tags=["Tmsiti Haqida"])
@@ -15,94 +15,49 @@ router = APIRouter(prefix="/tmsiti-haqida", tags=["Tmsiti Haqida"])
 load_dotenv()
 
 PDF_FOLDER = os.getenv("PDF_FOLDER")
+ALLOWED_FILE_TYPES = ["application/pdf", "image/png", "image/jpeg"]
 
 
-@router.get("/", response_model=list[TmsitiHaqidaOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(TmsitiHaqida))
-    return result.scalars().all()
-
-
-@router.post("/for_admin/", response_model=TmsitiHaqidaOut)
-async def create(
-    text: str = Form(...),
-    pdf: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
-    allowed_types = ["application/pdf", "image/png", "image/jpeg"]
-    if pdf.content_type not in allowed_types:
+async def _save_pdf(pdf: UploadFile, db: AsyncSession) -> str:
+    if pdf.content_type not in ALLOWED_FILE_TYPES:
         raise HTTPException(
             status_code=400,
             detail=f"Yaroqsiz fayl turi: {pdf.content_type}. Faqat PDF, PNG, JPG, JPEG ruxsat etiladi"
         )
 
-    filename = f"{uuid4().hex}_{pdf.filename}"
-    path = os.path.join(PDF_FOLDER, filename)
+    filename = (await save_upload(pdf, PDF_FOLDER, db)).filename
+    return f"/static/pdfs/{filename}"
 
-    async with aio_open(path, "wb") as f:
-        await f.write(await pdf.read())
 
-    new = TmsitiHaqida(text=text, pdf=f"/static/pdfs/{filename}")
-    db.add(new)
-    await db.commit()
-    await db.refresh(new)
-    return new
+async def create_form(
+    text: str = Form(...),
+    pdf: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    return {"text": text, "pdf": await _save_pdf(pdf, db)}
 
 
-@router.put("/{id}/for_admin/", response_model=TmsitiHaqidaOut)
-async def update(
-    id: int,
+async def update_form(
     text: str = Form(...),
     pdf: UploadFile = File(None),
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
-    result = await db.execute(select(TmsitiHaqida).where(TmsitiHaqida.id == id))
-    row = result.scalar_one_or_none()
-    if not row:
-        raise HTTPException(404, detail="Topilmadi")
-
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    values = {"text": text}
     if pdf:
-        allowed_types = ["application/pdf", "image/png", "image/jpeg"]
-        if pdf.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Yaroqsiz fayl turi: {pdf.content_type}. Faqat PDF, PNG, JPG, JPEG ruxsat etiladi"
-            )
-
-        old_path = row.pdf.lstrip("/")
-        if os.path.exists(old_path):
-            os.remove(old_path)
-
-        filename = f"{uuid4().hex}_{pdf.filename}"
-        path = os.path.join(PDF_FOLDER, filename)
-        async with aio_open(path, "wb") as f:
-            await f.write(await pdf.read())
-        row.pdf = f"/static/pdfs/{filename}"
+        values["pdf"] = await _save_pdf(pdf, db)
+    return values
 
-    row.text = text
-    await db.commit()
-    await db.refresh(row)
-    return row
 
+@router.get("/", response_model=list[TmsitiHaqidaOut],
+            dependencies=[conditional_get(TmsitiHaqida)])
+async def get_all(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(TmsitiHaqida))
+    return result.scalars().all()
 
-@router.delete("/{id}/for_admin/")
-async def delete(
-    id: int,
-    db: AsyncSession = Depends(get_db),
-    current_admin=Depends(get_current_admin)
-):
-    result = await db.execute(select(TmsitiHaqida).where(TmsitiHaqida.id == id))
-    row = result.scalar_one_or_none()
-    if not row:
-        raise HTTPException(404, detail="Topilmadi")
-
-    if row.pdf:
-        path = row.pdf.lstrip("/")
-        if os.path.exists(path):
-            os.remove(path)
 
-    await db.delete(row)
-    await db.commit()
-    return {"message": "O'chirildi"}
+crud = CRUD(TmsitiHaqida, "Topilmadi", file_fields=("pdf",))
+add_crud_routes(router, crud, out_model=TmsitiHaqidaOut,
+                create_form=create_form, create_error="Yaratishda xato",
+                update_form=update_form, update_error="Yangilashda xato",
+                deleted_message="O'chirildi",
+                delete_error="O'chirishda xato")
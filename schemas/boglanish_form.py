@@ -43,11 +43,24 @@ class BoglanishFormOut(BoglanishFormBase):
         from_attributes = True
 
 
+class BoglanishFormAccepted(BaseModel):
+    message: str = Field(..., description="Murojaat qabul qilingani haqida xabar.")
+    request_id: str = Field(...,
+                            description="Qabul qilingan murojaat kaliti (bazadagi intake_id).")
+
+
 class PaginatedBoglanishFormOut(BaseModel):
     items: List[BoglanishFormOut] = Field(...,
                                           description="Murojat formasi ro'yxati.")
-    total: int = Field(..., description="Umumiy murojat formasi soni.")
-    page: int = Field(..., description="Joriy sahifa raqami.")
+    total: Optional[int] = Field(
+        None, description="Umumiy murojat formasi soni. with_total=false bo'lsa null.")
+    page: Optional[int] = Field(
+        None, description="Joriy sahifa raqami. Cursor rejimida null.")
     per_page: int = Field(...,
                           description="Har bir sahifadagi elementlar soni.")
-    total_pages: int = Field(..., description="Umumiy sahifalar soni.")
+    total_pages: Optional[int] = Field(
+        None, description="Umumiy sahifalar soni. with_total=false bo'lsa null.")
+    next_cursor: Optional[str] = Field(
+        None, description="Keyingi sahifa uchun cursor (faqat cursor rejimida).")
+    prev_cursor: Optional[str] = Field(
+        None, description="Oldingi sahifa uchun cursor (faqat cursor rejimida).")
@@ -5,11 +5,12 @@ from typing import List
 
 class GuruhSchema(BaseModel):
     id: int
-    shifr: str
-    hujjat_nomi: str
-    link: str
-    pdf: str
-    created_at: datetime
+    shifr: str | None
+    hujjat_nomi: str | None
+    link: str | None
+    pdf: str | None
+    bolim: int | None
+    created_at: datetime | None
 
     class Config:
         from_attributes = True
@@ -17,8 +18,9 @@ class GuruhSchema(BaseModel):
 
 class BolimSchema(BaseModel):
     id: int
-    name: str
-    created_at: datetime
+    name: str | None
+    tizim: int | None
+    created_at: datetime | None
     guruhlar: List[GuruhSchema] = []
 
     class Config:
@@ -27,8 +29,8 @@ class BolimSchema(BaseModel):
 
 class FullTizimSchema(BaseModel):
     id: int
-    name: str
-    created_at: datetime
+    name: str | None
+    created_at: datetime | None
     bolimlar: List[BolimSchema] = []
 
     class Config:
@@ -38,8 +38,15 @@ class MalumotnomaOut(MalumotnomaBase):
 class PaginatedMalumotnomaOut(BaseModel):
     items: List[MalumotnomaOut] = Field(...,
                                         description="Ma'lumotnomalar ro'yxati.")
-    total: int = Field(..., description="Umumiy ma'lumotnomalar soni.")
-    page: int = Field(..., description="Joriy sahifa raqami.")
+    total: Optional[int] = Field(
+        None, description="Umumiy ma'lumotnomalar soni. with_total=false bo'lsa null.")
+    page: Optional[int] = Field(
+        None, description="Joriy sahifa raqami. Cursor rejimida null.")
     per_page: int = Field(...,
                           description="Har bir sahifadagi elementlar soni.")
-    total_pages: int = Field(..., description="Umumiy sahifalar soni.")
+    total_pages: Optional[int] = Field(
+        None, description="Umumiy sahifalar soni. with_total=false bo'lsa null.")
+    next_cursor: Optional[str] = Field(
+        None, description="Keyingi sahifa uchun cursor (faqat cursor rejimida).")
+    prev_cursor: Optional[str] = Field(
+        None, description="Oldingi sahifa uchun cursor (faqat cursor rejimida).")
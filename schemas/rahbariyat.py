@@ -10,6 +10,7 @@ class RahbariyatOut(BaseModel):
     elektron_pochta: str
     mutahassisligi: str
     rasm: str
+    renditions: dict | None = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class SearchHit(BaseModel):
+    type: str = Field(..., description="Hujjat turi: qonun, yangilik, elon, standart, guruh, smeta, reglament, malumotnoma yoki tmsiti_haqida.")
+    id: int = Field(..., description="Tegishli ro'yxatdagi yozuv ID'si.")
+    source: Optional[str] = Field(None, description="pdf - moslik hujjatga biriktirilgan PDF matnida topilgan; bo'sh - hujjatning o'zida.")
+    title: Optional[str] = Field(None, description="Hujjat sarlavhasi (raqami va nomi).")
+    snippet: Optional[str] = Field(None, description="Moslik atrofidagi parcha (HTML: matn ekranlangan), topilgan so'zlar <mark> ichida.")
+    score: float = Field(..., description="Moslik darajasi: qancha katta bo'lsa, shuncha yuqori.")
+
+
+class SearchOut(BaseModel):
+    items: List[SearchHit]
+    total: int
+    limit: int
+    offset: int
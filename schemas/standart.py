@@ -29,7 +29,9 @@ class StandartOut(StandartBase):
 
 class PaginatedStandartOut(BaseModel):
     items: List[StandartOut]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
@@ -8,6 +8,7 @@ class TarkibiyBolinmaOut(BaseModel):
     telefon: str
     elektron_pochta: str
     image: str | None
+    renditions: dict | None = None
 
     class Config:
         from_attributes = True
@@ -4,6 +4,7 @@ from pydantic import BaseModel
 class TashkilTuzilmaOut(BaseModel):
     id: int
     image: str
+    renditions: dict | None = None
 
     class Config:
         from_attributes = True
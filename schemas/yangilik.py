@@ -40,6 +40,9 @@ class YangilikUpdate(YangilikBase):
 class YangilikOut(YangilikBase):
     id: int = Field(..., description="Yangilikning unikal ID raqami.")
     created_at: datetime = Field(..., description="Yangilik yaratilgan vaqt.")
+    renditions: Optional[dict] = Field(
+        None,
+        description="Rasmning kichraytirilgan nusxalari: {\"src\", \"width\", \"height\", \"webp\": {\"320\": url, ...}, \"avif\": {...}}. Tayyor bo'lmasa null.")
 
     class Config:
         from_attributes = True
@@ -47,8 +50,15 @@ class YangilikOut(YangilikBase):
 
 class PaginatedYangilikOut(BaseModel):
     items: List[YangilikOut] = Field(..., description="Yangiliklar ro'yxati.")
-    total: int = Field(..., description="Umumiy yangiliklar soni.")
-    page: int = Field(..., description="Joriy sahifa raqami.")
+    total: Optional[int] = Field(
+        None, description="Umumiy yangiliklar soni. with_total=false bo'lsa null.")
+    page: Optional[int] = Field(
+        None, description="Joriy sahifa raqami. Cursor rejimida null.")
     per_page: int = Field(...,
                           description="Har bir sahifadagi elementlar soni.")
-    total_pages: int = Field(..., description="Umumiy sahifalar soni.")
+    total_pages: Optional[int] = Field(
+        None, description="Umumiy sahifalar soni. with_total=false bo'lsa null.")
+    next_cursor: Optional[str] = Field(
+        None, description="Keyingi sahifa uchun cursor (faqat cursor rejimida).")
+    prev_cursor: Optional[str] = Field(
+        None, description="Oldingi sahifa uchun cursor (faqat cursor rejimida).")
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from core.database import IS_POSTGRES, async_session
+from models.stored_file import StoredFile
+
+logger = logging.getLogger(__name__)
+
+_FILES = StoredFile.__table__
+
+
+class BlobWorker(ABC):
+    """Yuklangan bloblarni fon rejimida, alohida jarayonlar pool'ida qayta ishlaydi.
+
+    Yuklash so'rovi natijani kutmaydi: commit'dan keyin navbat uyg'otiladi.
+    Har bir kontent xeshi `table` jadvalida bitta qatorga ega (sha256, path,
+    status, attempts, error, updated_at ustunlari); "done" bo'lgan xesh qayta
+    ishlanmaydi, xato bo'lsa max_attempts martagacha qayta uriniladi. Qatorni
+    olish shartli UPDATE bilan bo'ladi, shuning uchun bir nechta worker bitta
+    faylni ikki marta ishlamaydi. Vorislar `job` va `result_values`ni beradi.
+    """
+
+    #: Holat yangilanishlari table_versions hisoblagichlariga tegmasligi uchun Core jadval
+    table = None
+    content_types: tuple[str, ...] = ()
+    label = "blob"
+    #: Kerakli paket o'rnatilmaganda log'ga yoziladigan xabar
+    unavailable_message = ""
+
+    def __init__(self, workers: int, interval: float, max_attempts: int,
+                 retry_delay: float, stale_seconds: float):
+        self.workers = workers
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.stale_seconds = stale_seconds
+        self._executor: ProcessPoolExecutor | None = None
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def job(self, sha256: str, path: str) -> tuple:
+        """Pool'da bajariladigan (funksiya, *argumentlar)."""
+
+    @abstractmethod
+    def result_values(self, result) -> dict:
+        """Muvaffaqiyatli natijadan jadvalga yoziladigan ustunlar."""
+
+    def referenced_paths(self):
+        """Qayta ishlanadigan stored_files.path qiymatlari select'i; None - content_types'dagi hammasi."""
+        return None
+
+    async def after_pass(self, processed: list[str]):
+        """Har bir navbat o'tishidan keyin shu o'tishda qayta ishlangan xeshlar bilan chaqiriladi (ixtiyoriy)."""
+
+    def wake(self):
+        self._wake.set()
+
+    async def enqueue_new(self, db):
+        """stored_files'dagi hali navbatda yo'q xeshlar uchun pending qatorlar qo'shadi."""
+        table = self.table
+        known = select(table.c.sha256)
+        query = (select(_FILES.c.sha256, _FILES.c.path)
+                 .where(_FILES.c.content_type.in_(self.content_types),
+                        _FILES.c.sha256.not_in(known)))
+        paths = self.referenced_paths()
+        if paths is not None:
+            query = query.where(_FILES.c.path.in_(paths))
+        rows = (await db.execute(query)).all()
+        pending = {}
+        for sha256, path in rows:
+            pending.setdefault(sha256, path)
+        if pending:
+            now = datetime.utcnow()
+            # Boshqa worker/nusxa shu xeshni allaqachon qo'shgan bo'lishi mumkin
+            insert = pg_insert if IS_POSTGRES else sqlite_insert
+            statement = insert(table).on_conflict_do_nothing(index_elements=[table.c.sha256])
+            await db.execute(statement, [
+                {"sha256": sha256, "path": path, "status": "pending", "attempts": 0,
+                 "created_at": now, "updated_at": now}
+                for sha256, path in pending.items()
+            ])
+            await db.commit()
+
+    async def _claim(self, db, limit: int) -> list:
+        table = self.table
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=self.stale_seconds)
+        retry = now - timedelta(seconds=self.retry_delay)
+        candidates = (await db.execute(
+            select(table.c.id, table.c.sha256, table.c.path, table.c.status, table.c.attempts)
+            .where(table.c.attempts < self.max_attempts, or_(
+                table.c.status == "pending",
+                and_(table.c.status == "failed", table.c.updated_at < retry),
+                and_(table.c.status == "processing", table.c.updated_at < stale),
+            ))
+            .order_by(table.c.id)
+            .limit(limit)
+        )).all()
+        claimed = []
+        for id, sha256, path, status, attempts in candidates:
+            result = await db.execute(
+                update(table)
+                .where(table.c.id == id, table.c.status == status,
+                       table.c.attempts == attempts)
+                .values(status="processing", attempts=attempts + 1,
+                        updated_at=datetime.utcnow())
+            )
+            if result.rowcount == 1:
+                claimed.append((id, sha256, path))
+        await db.commit()
+        return claimed
+
+    async def _process(self, id: int, sha256: str, path: str):
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, *self.job(sha256, path))
+            values = {"status": "done", "error": None, **self.result_values(result)}
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # Bola jarayon yiqildi (masalan, buzilgan fayl): pool qayta yaratiladi
+                self._restart_executor()
+            logger.warning("%s qayta ishlanmadi: %s: %s", self.label, path, e)
+            values = {"status": "failed", "error": str(e)[:500]}
+        async with async_session() as db:
+            await db.execute(update(self.table).where(self.table.c.id == id)
+                             .values(updated_at=datetime.utcnow(), **values))
+            await db.commit()
+
+    async def process_pending(self) -> list[str]:
+        """Navbatni bo'shatadi; qayta ishlangan (done yoki failed) xeshlarni qaytaradi."""
+        processed = []
+        while True:
+            async with async_session() as db:
+                await self.enqueue_new(db)
+                claimed = await self._claim(db, self.workers)
+            if not claimed:
+                return processed
+            await asyncio.gather(*(self._process(*job) for job in claimed))
+            processed.extend(sha256 for _, sha256, _ in claimed)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                processed = await self.process_pending()
+                await self.after_pass(processed)
+            except Exception:
+                logger.exception("%s navbatini qayta ishlashda xato", self.label)
+
+    def _restart_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        # spawn: bola jarayon event loop va DB ulanishlarini meros qilib olmaydi
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def start(self):
+        if not self.enabled:
+            return
+        if not self.available:
+            logger.info(self.unavailable_message)
+            return
+        if self._task is None:
+            self._restart_executor()
+            self._task = asyncio.create_task(self._run())
+            self.wake()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
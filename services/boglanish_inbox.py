@@ -0,0 +1,139 @@
+import logging
+import time
+from collections import OrderedDict
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import inspect, or_, select, text, update
+
+from core.database import IS_POSTGRES
+from core.pagination import count
+from core.versions import get_table_versions
+from models.boglanish_form import BoglanishForm, normalize_email, normalize_phone
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Ro'yxat o'zgargach ham hisoblangan son shuncha vaqt taxminiy qiymat sifatida beriladi
+INBOX_COUNT_MAX_STALE = float(getenv("INBOX_COUNT_MAX_STALE", "30"))
+INBOX_COUNT_MAX_ENTRIES = int(getenv("INBOX_COUNT_MAX_ENTRIES", "256"))
+
+_TABLE = BoglanishForm.__table__
+FTS_TABLE = "boglanish_form_fts"
+# trigram indeksi 3 belgidan qisqa qidiruvni qo'llamaydi
+_TRIGRAM_MIN = 3
+_SEARCH_COLUMNS = ("FIO", "email", "tel_raqam", "type")
+_PG_SEARCH_EXPR = " || ' ' || ".join(f'coalesce("{c}", \'\')' for c in _SEARCH_COLUMNS)
+_BACKFILL_BATCH = 1000
+
+
+def backfill_normalized(connection):
+    """Eski yozuvlarning email/telefon normal shakllarini to'ldiradi (migratsiyada).
+
+    Python'da hisoblanadi: SQLite'da regex yo'q.
+    """
+    while True:
+        rows = connection.execute(
+            select(_TABLE.c.id, _TABLE.c.email, _TABLE.c.tel_raqam)
+            .where(_TABLE.c.email_normalized.is_(None), _TABLE.c.tel_normalized.is_(None),
+                   or_(_TABLE.c.email.is_not(None), _TABLE.c.tel_raqam.is_not(None)))
+            .limit(_BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            return
+        for id, email, tel_raqam in rows:
+            connection.execute(
+                update(_TABLE).where(_TABLE.c.id == id).values(
+                    email_normalized=normalize_email(email) or "",
+                    tel_normalized=normalize_phone(tel_raqam) or ""))
+
+
+def _sqlite_fts_statements() -> list[str]:
+    columns = ", ".join(_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in _SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in _SEARCH_COLUMNS)
+    insert = f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});"
+    delete = (f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+              f"VALUES ('delete', old.id, {old_values});")
+    return [
+        # Tashqi kontentli FTS5: matn ikkinchi marta saqlanmaydi, faqat trigram indeksi
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='{_TABLE.name}', content_rowid='id', tokenize='trigram')",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {_TABLE.name} BEGIN {insert} END",
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {_TABLE.name} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {_TABLE.name} BEGIN {delete} END",
+    ]
+
+
+def install_inbox_search(connection):
+    """Murojaatlar uchun matnli qidiruv indeksini o'rnatadi (migratsiyada)."""
+    if IS_POSTGRES:
+        try:
+            with connection.begin_nested():
+                connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                connection.exec_driver_sql(
+                    f"CREATE INDEX IF NOT EXISTS ix_{_TABLE.name}_search_trgm "
+                    f"ON {_TABLE.name} USING gin (({_PG_SEARCH_EXPR}) gin_trgm_ops)")
+        except Exception:
+            logger.warning("pg_trgm o'rnatilmadi: murojaatlar qidiruvi indekssiz ishlaydi")
+        return
+
+    created = not inspect(connection).has_table(FTS_TABLE)
+    for statement in _sqlite_fts_statements():
+        connection.exec_driver_sql(statement)
+    if created:
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def search_clause(term: str):
+    """FIO, email, tel_raqam va type ichida qism-satr qidiruvi (avvalgi ilike bilan bir xil)."""
+    if IS_POSTGRES:
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return text(f"({_PG_SEARCH_EXPR}) ILIKE :inbox_search").bindparams(
+            inbox_search=f"%{escaped}%")
+    if len(term) >= _TRIGRAM_MIN:
+        phrase = '"' + term.replace('"', '""') + '"'
+        return BoglanishForm.id.in_(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :inbox_search")
+            .bindparams(inbox_search=phrase))
+    pattern = f"%{term}%"
+    return or_(*(getattr(BoglanishForm, c).ilike(pattern) for c in _SEARCH_COLUMNS))
+
+
+class InboxCountCache:
+    """Filtrlar bo'yicha COUNT natijalari keshi.
+
+    Jadval versiyasi (table_versions) o'zgarmagan bo'lsa son aniq; o'zgargan
+    bo'lsa ham INBOX_COUNT_MAX_STALE soniya davomida eski (taxminiy) son
+    qaytariladi va katta jadvalni qayta sanash kechiktiriladi.
+    """
+
+    def __init__(self, max_stale: float, max_entries: int):
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[int, int, float]] = OrderedDict()
+
+    async def count(self, db, query, key: tuple) -> int:
+        versions = await get_table_versions(db, [_TABLE.name])
+        version = versions.get(_TABLE.name, (0, None))[0]
+        entry = self._entries.get(key)
+        if entry is not None:
+            total, counted_version, counted_at = entry
+            if (counted_version == version
+                    or time.monotonic() - counted_at < self.max_stale):
+                self._entries.move_to_end(key)
+                return total
+        total = await count(db, query)
+        self._entries[key] = (total, version, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return total
+
+
+inbox_counts = InboxCountCache(
+    max_stale=INBOX_COUNT_MAX_STALE, max_entries=INBOX_COUNT_MAX_ENTRIES)
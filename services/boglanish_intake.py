@@ -0,0 +1,334 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from os import getenv
+from uuid import uuid4
+
+from dotenv import load_dotenv
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from core.database import async_session
+from core.uploads import ReceivedUpload, store_upload
+from models.boglanish_form import BoglanishForm
+
+try:
+    import fcntl
+except ImportError:  # Windows: spool fayllari qulflanmaydi, bitta worker kutiladi
+    fcntl = None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "sync" - har bir murojaat so'rov ichida yoziladi; "queue" - 202 qaytadi, yozish fon navbatida
+BOGLANISH_INTAKE_MODE = getenv("BOGLANISH_INTAKE_MODE", "sync").strip().lower()
+INTAKE_BATCH_SIZE = int(getenv("INTAKE_BATCH_SIZE", "100"))
+# Birinchi murojaat kelgandan keyin to'plam shuncha soniyada yoziladi (to'lmagan bo'lsa ham)
+INTAKE_FLUSH_INTERVAL = float(getenv("INTAKE_FLUSH_INTERVAL", "0.5"))
+# Navbat to'lsa murojaat so'rovning o'zida yoziladi
+INTAKE_QUEUE_SIZE = int(getenv("INTAKE_QUEUE_SIZE", "10000"))
+INTAKE_RETRY_DELAY = float(getenv("INTAKE_RETRY_DELAY", "5"))
+INTAKE_SPOOL = getenv("INTAKE_SPOOL", "true").lower() in ("1", "true", "yes", "on")
+INTAKE_SPOOL_DIR = getenv("INTAKE_SPOOL_DIR", "db/intake")
+INTAKE_FSYNC = getenv("INTAKE_FSYNC", "true").lower() in ("1", "true", "yes", "on")
+# To'xtashda navbatni bo'shatish uchun kutiladigan vaqt; qolgani spool'dan keyingi ishga tushishda yoziladi
+INTAKE_STOP_TIMEOUT = float(getenv("INTAKE_STOP_TIMEOUT", "10"))
+
+_TABLE = BoglanishForm.__table__
+_SPOOL_PATTERN = "intake-*.jsonl"
+
+
+@dataclass
+class IntakeRecord:
+    id: str
+    data: dict
+    created_at: str
+    upload: dict | None = None
+
+    @property
+    def received(self) -> ReceivedUpload | None:
+        return ReceivedUpload(**self.upload) if self.upload else None
+
+
+class IntakeSpool:
+    """Bazaga hali yozilmagan murojaatlar uchun append-only JSONL fayl.
+
+    Har bir murojaat navbatga qo'yilishidan oldin "add" qatori sifatida
+    yoziladi, bazaga yozilgach "ack" qatori qo'shiladi. Har bir worker o'z
+    faylini flock bilan ushlab turadi; ishga tushishda qulflanmagan (egasi
+    to'xtagan) fayllardagi tasdiqlanmagan yozuvlar qayta yoziladi. Barcha
+    yozuvlar tasdiqlangach fayl qisqartiriladi.
+    """
+
+    def __init__(self, directory: str, fsync: bool):
+        self.directory = directory
+        self.fsync = fsync
+        self.path: str | None = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._unacked: set[str] = set()
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"intake-{uuid4().hex}.jsonl"
+        # Avval qulflanadi, keyin nomlanadi: boshqa worker yangi faylni "egasiz" deb olmaydi
+        tmp_path = os.path.join(self.directory, f".{name}.tmp")
+        self._file = open(tmp_path, "ab")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.path = os.path.join(self.directory, name)
+        os.replace(tmp_path, self.path)
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False).encode() + b"\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def append(self, record: IntakeRecord):
+        with self._lock:
+            self._write({"op": "add", **asdict(record)})
+            self._unacked.add(record.id)
+
+    def ack(self, ids: list[str]):
+        with self._lock:
+            self._unacked.difference_update(ids)
+            if self._unacked:
+                self._write({"op": "ack", "ids": ids})
+            else:
+                # Hammasi yozildi: fayl o'smasligi uchun boshidan boshlanadi
+                self._file.truncate(0)
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            if not self._unacked:
+                os.remove(self.path)
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def read(file) -> list[IntakeRecord]:
+        records: dict[str, IntakeRecord] = {}
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Yozish paytida to'xtagan jarayonning chala oxirgi qatori
+                continue
+            if entry.pop("op", None) == "add":
+                records[entry["id"]] = IntakeRecord(**entry)
+            else:
+                for id in entry.get("ids", ()):
+                    records.pop(id, None)
+        return list(records.values())
+
+    def orphans(self):
+        """Egasi to'xtagan spool fayllarini qulflab, (fayl, tasdiqlanmagan yozuvlar) beradi."""
+        for path in sorted(glob.glob(os.path.join(self.directory, _SPOOL_PATTERN))):
+            if path == self.path:
+                continue
+            try:
+                file = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            try:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue  # ishlab turgan worker'ning fayli
+                if not os.path.exists(path):
+                    continue  # boshqa worker hozirgina o'qib o'chirdi
+                yield path, self.read(file)
+            finally:
+                file.close()
+
+
+class BoglanishIntake:
+    """Ochiq murojaat formasini so'rovdan ajratib, bazaga to'plab yozadi.
+
+    So'rov faqat tekshiradi, spool'ga yozadi va navbatga qo'yadi; fon
+    vazifasi navbatdan INTAKE_BATCH_SIZE tagacha yoki INTAKE_FLUSH_INTERVAL
+    soniya ichida kelgan murojaatlarni bitta tranzaksiyada ko'p qatorli
+    INSERT bilan yozadi. Shu bilan SQLite yozish qulfi har murojaat uchun
+    emas, har to'plam uchun bir marta olinadi. intake_id ustuni qayta
+    o'qilgan spool yozuvlarining ikki marta yozilishiga yo'l qo'ymaydi.
+    """
+
+    def __init__(self, mode: str, batch_size: int, flush_interval: float,
+                 queue_size: int, retry_delay: float):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.retry_delay = retry_delay
+        self.written = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue[IntakeRecord] | None = None
+        self._spool: IntakeSpool | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode == "queue"
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, data: dict, received: ReceivedUpload | None = None) -> str:
+        """Murojaatni spool'ga yozib navbatga qo'yadi va uning kalitini qaytaradi."""
+        record = IntakeRecord(
+            id=uuid4().hex, data=data, created_at=datetime.utcnow().isoformat(),
+            upload=asdict(received) if received else None)
+        if self._spool is not None:
+            await asyncio.to_thread(self._spool.append, record)
+        try:
+            if self._queue is None:
+                raise asyncio.QueueFull
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            # Navbat to'la (yoki writer ishga tushmagan): murojaat shu so'rovda yoziladi
+            await self._write([record])
+        return record.id
+
+    async def _write(self, records: list[IntakeRecord]):
+        ids = [record.id for record in records]
+        async with async_session() as db:
+            existing = set((await db.execute(
+                select(_TABLE.c.intake_id).where(_TABLE.c.intake_id.in_(ids))
+            )).scalars())
+            rows = []
+            for record in records:
+                if record.id in existing:
+                    continue
+                row = {**record.data, "intake_id": record.id,
+                       "created_at": datetime.fromisoformat(record.created_at)}
+                received = record.received
+                if received is not None:
+                    if os.path.exists(received.tmp_path):
+                        # Vaqtinchalik fayl commit'gacha saqlanadi: xato bo'lsa qayta urinish mumkin
+                        row["fayl"] = (await store_upload(db, received, keep_tmp=True)).path
+                    else:
+                        logger.warning("Murojaat fayli topilmadi, faylsiz yoziladi: %s",
+                                       received.tmp_path)
+                rows.append(row)
+            if rows:
+                # ORM insert: table_versions hisoblagichi ham yangilanadi
+                await db.execute(insert(BoglanishForm), rows)
+            await db.commit()
+        self.written += len(rows)
+        self._finish(records)
+
+    def _finish(self, records: list[IntakeRecord]):
+        for record in records:
+            received = record.received
+            if received is not None and os.path.exists(received.tmp_path):
+                os.remove(received.tmp_path)
+        if self._spool is not None:
+            self._spool.ack([record.id for record in records])
+
+    async def _flush(self, records: list[IntakeRecord]):
+        """To'plamni yozadi; ma'lumotdagi xatoda qatorlar birma-bir yoziladi, buzuqlari tashlanadi.
+
+        Baza vaqtincha ishlamasa (OperationalError, OSError) xato yuqoriga
+        uzatiladi va to'plam keyinroq to'liq qayta yoziladi.
+        """
+        try:
+            await self._write(records)
+        except (OperationalError, OSError):
+            raise
+        except Exception:
+            if len(records) > 1:
+                for record in records:
+                    await self._flush([record])
+                return
+            logger.exception("Murojaatni yozib bo'lmadi, tashlab yuborildi: %s",
+                             json.dumps(asdict(records[0]), ensure_ascii=False))
+            self.dropped += 1
+            self._finish(records)
+
+    async def _collect(self) -> list[IntakeRecord]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            while True:
+                try:
+                    await self._flush(batch)
+                    break
+                except Exception:
+                    logger.exception("Murojaatlar to'plamini yozib bo'lmadi, qayta uriniladi")
+                    await asyncio.sleep(self.retry_delay)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _replay(self):
+        for path, records in self._spool.orphans():
+            try:
+                for start in range(0, len(records), self.batch_size):
+                    await self._flush(records[start:start + self.batch_size])
+            except Exception:
+                logger.exception("Spool fayli qayta yozilmadi, keyingi ishga tushishda uriniladi: %s",
+                                 path)
+                continue
+            if records:
+                logger.info("Spool'dan %d ta murojaat yozildi: %s", len(records), path)
+            os.remove(path)
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        if INTAKE_SPOOL:
+            self._spool = IntakeSpool(INTAKE_SPOOL_DIR, fsync=INTAKE_FSYNC)
+            self._spool.open()
+            await self._replay()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), INTAKE_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Navbatda %d ta murojaat qoldi, spool'dan keyin yoziladi",
+                               self._queue.qsize())
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._queue = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+
+boglanish_intake = BoglanishIntake(
+    mode=BOGLANISH_INTAKE_MODE,
+    batch_size=INTAKE_BATCH_SIZE,
+    flush_interval=INTAKE_FLUSH_INTERVAL,
+    queue_size=INTAKE_QUEUE_SIZE,
+    retry_delay=INTAKE_RETRY_DELAY,
+)
@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import logging
+from sqlalchemy import event, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from core.changes import Change, on_commit, pending_changes
+from core.database import async_session
+from core.versions import get_table_versions, local_bumps
+from models.tizim import Tizim
+from models.shaharsozlik_norma_qoida_bolim import ShaharsozlikNormaQoidaBolim
+from models.guruh import Guruh
+from schemas.full_tizim import FullTizimSchema
+
+logger = logging.getLogger(__name__)
+
+_TABLES = (Tizim.__tablename__, ShaharsozlikNormaQoidaBolim.__tablename__,
+           Guruh.__tablename__)
+
+# Core jadvallar: tree_version yangilanishi table_versions va o'zgarishlar ro'yxatiga tushmaydi
+_TIZIM = Tizim.__table__
+_BOLIM = ShaharsozlikNormaQoidaBolim.__table__
+
+
+def _serialize(tizim: Tizim) -> bytes:
+    tizim.bolimlar.sort(key=lambda b: b.id)
+    for bolim in tizim.bolimlar:
+        bolim.guruhlar.sort(key=lambda g: g.id)
+    return FullTizimSchema.model_validate(tizim).model_dump_json().encode()
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_tree_versions(session):
+    """Commit qilinayotgan o'zgarishlar tegadigan tizimlarning tree_version'ini oshiradi.
+
+    Yozuv bilan bitta tranzaksiyada bajariladi: boshqa worker'lar qaysi
+    tizimlar o'zgarganini shu ustundan biladi.
+    """
+    # Commit ichidagi flush'ni oldinroq bajaramiz - uning o'zgarishlari ham hisobga olinadi
+    session.flush()
+    tizim_ids, bolim_ids, everything = set(), set(), False
+    for change in pending_changes(session):
+        if change.table not in _TABLES:
+            continue
+        if change.obj is None:
+            everything = True
+        elif change.table == Tizim.__tablename__:
+            if change.op != "delete":
+                tizim_ids.add(change.obj.id)
+        elif change.table == ShaharsozlikNormaQoidaBolim.__tablename__:
+            tizim_ids.update((change.obj.tizim, change.previous.get("tizim")))
+        else:
+            bolim_ids.update((change.obj.bolim, change.previous.get("bolim")))
+    tizim_ids.discard(None)
+    bolim_ids.discard(None)
+    if not (everything or tizim_ids or bolim_ids):
+        return
+    condition = true() if everything else or_(
+        _TIZIM.c.id.in_(tizim_ids),
+        _TIZIM.c.id.in_(select(_BOLIM.c.tizim).where(_BOLIM.c.id.in_(bolim_ids))),
+    )
+    session.connection().execute(
+        update(_TIZIM).where(condition).values(tree_version=_TIZIM.c.tree_version + 1))
+
+
+class FullTizimSnapshot:
+    """Tizim -> Bo'lim -> Guruh daraxtining oldindan serializatsiya qilingan nusxasi.
+
+    Har bir tizim alohida JSON bo'lagi sifatida saqlanadi. O'zgarish kelganda
+    faqat ta'sirlangan tizimlarning bo'laklari qayta quriladi: bu worker'dagi
+    commit'lar ro'yxatidan, boshqa worker'lardagilari esa tizim.tree_version
+    bo'yicha topiladi. To'liq qayta qurish (bulk so'rovdan keyin) fonda
+    bajariladi, shu orada eski javob va ETag berib turiladi.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.body = b"[]"
+        self.etag = ""
+        self._fragments: dict[int, bytes] = {}
+        self._tree_versions: dict[int, int] = {}
+        self._bolim_tizim: dict[int, int] = {}
+        self._dirty: set[int] = set()
+        self._needs_full = True
+        self._compare_versions = False
+        self._versions: tuple | None = None
+        self._local: tuple | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def stale(self) -> bool:
+        return self._needs_full or self._compare_versions or bool(self._dirty)
+
+    def invalidate(self):
+        self._needs_full = True
+
+    def mark_changes(self, changes: list[Change]):
+        for change in changes:
+            if change.obj is None:
+                # Bulk so'rov: ta'sirlangan qatorlar noma'lum
+                if change.table in _TABLES:
+                    self._needs_full = True
+            elif change.table == Tizim.__tablename__:
+                self._dirty.add(change.obj.id)
+            elif change.table == ShaharsozlikNormaQoidaBolim.__tablename__:
+                self._mark_tizim(change.obj.tizim)
+                self._mark_tizim(change.previous.get("tizim"))
+                if change.op == "delete":
+                    self._bolim_tizim.pop(change.obj.id, None)
+            elif change.table == Guruh.__tablename__:
+                self._mark_bolim(change.obj.bolim)
+                self._mark_bolim(change.previous.get("bolim"))
+
+    def _mark_tizim(self, tizim_id: int | None):
+        if tizim_id is not None:
+            self._dirty.add(tizim_id)
+
+    def _mark_bolim(self, bolim_id: int | None):
+        if bolim_id is None:
+            return
+        tizim_id = self._bolim_tizim.get(bolim_id)
+        if tizim_id is None:
+            # Bo'lim hali snapshotda yo'q - tizimi tree_version orqali topiladi
+            self._compare_versions = True
+        else:
+            self._dirty.add(tizim_id)
+
+    async def _table_versions(self, db: AsyncSession) -> tuple[tuple, tuple]:
+        versions = await get_table_versions(db, _TABLES)
+        current = tuple(versions.get(t, (0, None))[0] for t in _TABLES)
+        local = tuple(local_bumps[t] for t in _TABLES)
+        return current, local
+
+    async def get(self, db: AsyncSession) -> tuple[bytes, str]:
+        current, local = await self._table_versions(db)
+        built = self._versions is not None
+        if built and current != tuple(
+                version + bumps - seen
+                for version, bumps, seen in zip(self._versions, local, self._local)):
+            # Hisoblagich o'sishini bu jarayondagi commit'lar to'liq tushuntirmaydi -
+            # o'zgarish boshqa worker'dan keldi
+            self._compare_versions = True
+        if built and self._needs_full and self._task is None:
+            self._task = asyncio.create_task(self._rebuild_in_background())
+        if self._task is not None:
+            # To'liq qayta qurish tugaguncha eski daraxt beriladi
+            return self.body, self.etag
+        if self.stale:
+            async with self._lock:
+                if self.stale:
+                    await self._rebuild(db)
+                    self._versions = current
+                    self._local = local
+        return self.body, self.etag
+
+    async def _rebuild_in_background(self):
+        try:
+            async with async_session() as db:
+                async with self._lock:
+                    current, local = await self._table_versions(db)
+                    await self._rebuild(db)
+                    self._versions = current
+                    self._local = local
+        except Exception:
+            self._needs_full = True
+            logger.exception("/full_tizim/ snapshotini qayta qurib bo'lmadi")
+        finally:
+            self._task = None
+
+    async def _rebuild(self, db: AsyncSession):
+        query = select(Tizim).options(
+            selectinload(Tizim.bolimlar).selectinload(
+                ShaharsozlikNormaQoidaBolim.guruhlar)
+        )
+        removed: set[int] = set()
+        if self._needs_full:
+            targets = None
+            self._needs_full = False
+            self._compare_versions = False
+        else:
+            targets = set(self._dirty)
+            if self._compare_versions:
+                self._compare_versions = False
+                tree_versions = dict((await db.execute(
+                    select(Tizim.id, Tizim.tree_version))).all())
+                targets.update(tizim_id for tizim_id, version in tree_versions.items()
+                               if self._tree_versions.get(tizim_id) != version)
+                removed = set(self._fragments) - set(tree_versions)
+            query = query.where(Tizim.id.in_(targets))
+        self._dirty.clear()
+
+        tizimlar = []
+        if targets is None or targets:
+            result = await db.execute(query.execution_options(populate_existing=True))
+            tizimlar = result.scalars().unique().all()
+
+        if targets is None:
+            self._fragments.clear()
+            self._tree_versions.clear()
+            self._bolim_tizim.clear()
+        else:
+            targets |= removed
+            for tizim_id in targets:
+                self._fragments.pop(tizim_id, None)
+                self._tree_versions.pop(tizim_id, None)
+            self._bolim_tizim = {b: t for b, t in self._bolim_tizim.items()
+                                 if t not in targets}
+
+        for tizim in tizimlar:
+            self._fragments[tizim.id] = _serialize(tizim)
+            self._tree_versions[tizim.id] = tizim.tree_version
+            for bolim in tizim.bolimlar:
+                self._bolim_tizim[bolim.id] = tizim.id
+
+        body = b"[" + b",".join(self._fragments[k]
+                                for k in sorted(self._fragments)) + b"]"
+        if body != self.body or not self.etag:
+            self.body = body
+            self.version += 1
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            self.etag = f'"{digest}"'
+
+
+full_tizim_snapshot = FullTizimSnapshot()
+on_commit(full_tizim_snapshot.mark_changes)
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+
+from dotenv import load_dotenv
+
+from services.image_render import Image, resize_image, supported_formats
+
+load_dotenv()
+
+IMG_CACHE_DIR = getenv("IMG_CACHE_DIR", "cache/img")
+# Diskdagi nusxalarning umumiy hajmi; oshsa eng uzoq so'ralmaganlari o'chiriladi
+IMG_CACHE_MAX_BYTES = int(getenv("IMG_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+IMG_MAX_WIDTH = int(getenv("IMG_MAX_WIDTH", "2560"))
+IMG_QUALITY = int(getenv("IMG_QUALITY", "80"))
+# Pillow dekodlash va siqishda GIL'ni bo'shatadi, shuning uchun thread'lar yetarli
+IMG_RESIZE_WORKERS = int(getenv("IMG_RESIZE_WORKERS", "2"))
+IMG_FORMATS = ("avif", "webp", "jpeg", "png")
+
+
+class RenditionCache:
+    """/img nusxalari uchun hajmi cheklangan disk keshi (LRU).
+
+    Nusxa bir marta yaratiladi va keyingi so'rovlar to'g'ridan-to'g'ri
+    diskdan beriladi. Fayl nomi manba yo'li, hajmi, mtime'i, kenglik va
+    formatdan olingan xesh: manba almashtirilsa eski nusxa ishlatilmaydi va
+    navbati kelganda o'chiriladi. Bir xil yo'q nusxaga kelgan parallel
+    so'rovlar bitta o'lcham o'zgartirish ishini kutadi.
+    Hisob har bir worker'da alohida yuritiladi; boshqa worker o'chirgan
+    fayl keyingi so'rovda qayta yaratiladi.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, workers: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def formats(self) -> list[str]:
+        return supported_formats(list(IMG_FORMATS))
+
+    def load(self):
+        """Diskdagi mavjud nusxalarni hisobga oladi (eng eskisi - birinchi)."""
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        self._entries.clear()
+        self._bytes = 0
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._bytes += size
+        self._evict()
+
+    @staticmethod
+    def key(source: str, stat: os.stat_result, width: int, fmt: str) -> str:
+        digest = hashlib.sha256(
+            f"{source}\0{stat.st_size}\0{stat.st_mtime_ns}\0{width}".encode()).hexdigest()
+        return f"{digest}.{fmt}"
+
+    def _add(self, name: str, size: int):
+        previous = self._entries.pop(name, None)
+        if previous is not None:
+            self._bytes -= previous
+        self._entries[name] = size
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        # Oxirgi (hozirgina yozilgan) nusxa chegaradan katta bo'lsa ham qoladi
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    async def _render(self, name: str, source: str, path: str, width: int, fmt: str) -> str:
+        try:
+            loop = asyncio.get_running_loop()
+            size = await loop.run_in_executor(
+                self._executor, resize_image, source, path, width, fmt, IMG_QUALITY)
+            self._add(name, size)
+            return path
+        finally:
+            self._inflight.pop(name, None)
+
+    async def get(self, source: str, width: int, fmt: str) -> str:
+        """Nusxa yo'lini qaytaradi; kerak bo'lsa yaratadi. Manba bo'lmasa FileNotFoundError."""
+        name = self.key(source, os.stat(source), width, fmt)
+        path = os.path.join(self.directory, name)
+
+        if os.path.exists(path):
+            if name in self._entries:
+                self._entries.move_to_end(name)
+            else:
+                # Boshqa worker yaratgan nusxa
+                self._add(name, os.path.getsize(path))
+            self.hits += 1
+            return path
+
+        task = self._inflight.get(name)
+        if task is None:
+            self.misses += 1
+            self._ensure_executor()
+            task = self._inflight[name] = asyncio.create_task(
+                self._render(name, source, path, width, fmt))
+        else:
+            self.coalesced += 1
+        # shield: mijoz uzilsa ham boshqalar kutayotgan ish to'xtamaydi
+        return await asyncio.shield(task)
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="image-resize")
+
+    async def start(self):
+        if not self.available:
+            return
+        self._ensure_executor()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.load)
+
+    async def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_cache = RenditionCache(
+    directory=IMG_CACHE_DIR, max_bytes=IMG_CACHE_MAX_BYTES, workers=IMG_RESIZE_WORKERS)
@@ -0,0 +1,95 @@
+"""Rasm o'lchamlarini tayyorlash: fon jarayonlari pool'ida (services/image_renditions.py)
+va /img endpointining thread pool'ida (services/image_cache.py) bajariladi.
+
+Modul ataylab yengil: spawn qilingan jarayon faqat shu faylni import qiladi.
+"""
+import os
+from uuid import uuid4
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # Pillow ixtiyoriy: bo'lmasa o'lchamlar tayyorlanmaydi
+    Image = None
+
+
+def supported_formats(formats: list[str]) -> list[str]:
+    """Pillow shu muhitda yoza oladigan formatlar (masalan, AVIF kutubxonasiz yig'ilgan bo'lishi mumkin)."""
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt in formats if fmt.upper() in Image.SAVE]
+
+
+def is_decode_error(error: BaseException) -> bool:
+    """Fayl rasm sifatida o'qilmadi (rasm emas, buzilgan, juda katta) - disk xatolaridan farqli."""
+    if Image is None:
+        return False
+    if isinstance(error, (UnidentifiedImageError, Image.DecompressionBombError)):
+        return True
+    # Pillow dekodlash xatolari ("image file is truncated" va h.k.) errno'siz OSError;
+    # diskka yozish/o'qish xatolarida errno bor
+    return isinstance(error, OSError) and error.errno is None
+
+
+def _target_widths(width: int, widths: list[int]) -> list[int]:
+    # Kattalashtirilmaydi: asl rasmdan keng o'lchamlar o'rniga asl kenglik beriladi
+    return sorted({min(w, width) for w in widths})
+
+
+def _open(path: str, max_width: int):
+    """Rasmni o'qiydi, EXIF bo'yicha aylantiradi va RGB/RGBA ga keltiradi."""
+    with Image.open(path) as source:
+        if source.format == "JPEG":
+            # JPEG'ni kerakli o'lchamga yaqin masshtabda o'qish dekodlashni bir necha barobar
+            # tezlashtiradi; kvadrat chegara EXIF bo'yicha 90° aylantirilgan rasmga ham yetadi
+            source.draft("RGB", (max_width, max_width))
+        # Aylantirish pikselga o'tkaziladi, shundan keyin EXIF kerak emas
+        image = ImageOps.exif_transpose(source)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.mode or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    return image
+
+
+def _resized(image, width: int):
+    if width >= image.width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def _save(image, out: str, fmt: str, quality: int):
+    if fmt in ("jpeg", "jpg") and image.mode != "RGB":
+        image = image.convert("RGB")
+    tmp = os.path.join(os.path.dirname(out), f".{uuid4().hex}.part")
+    try:
+        # exif/icc_profile berilmaydi: natijada metama'lumot qolmaydi
+        image.save(tmp, format="JPEG" if fmt == "jpg" else fmt.upper(), quality=quality)
+        os.replace(tmp, out)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def render_image(path: str, folder: str, sha256: str, widths: list[int],
+                 formats: list[str], quality: int) -> dict:
+    """Rasmni har bir kenglik va format uchun saqlaydi; metama'lumotlar (EXIF, ICC) tashlanadi.
+
+    {"width", "height", "variants": {format: {kenglik: yo'l}}} qaytaradi.
+    """
+    os.makedirs(folder, exist_ok=True)
+    image = _open(path, max(widths))
+    variants: dict[str, dict[str, str]] = {}
+    for target in _target_widths(image.width, widths):
+        resized = _resized(image, target)
+        for fmt in formats:
+            out = os.path.join(folder, f"{sha256}-{target}.{fmt}")
+            _save(resized, out, fmt, quality)
+            variants.setdefault(fmt, {})[str(target)] = out
+    return {"width": image.width, "height": image.height, "variants": variants}
+
+
+def resize_image(path: str, out: str, width: int, fmt: str, quality: int) -> int:
+    """Bitta nusxani `out` ga saqlaydi (kattalashtirmasdan); fayl hajmini qaytaradi."""
+    _save(_resized(_open(path, width), width), out, fmt, quality)
+    return os.path.getsize(out)
@@ -0,0 +1,166 @@
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from core.cache import response_cache
+from core.database import async_session
+from core.storage import blob_key
+from core.uploads import IMAGE_UPLOADED_KEY
+from models.elonlar import Elon
+from models.image_rendition import ImageRendition
+from models.rahbariyat import Rahbariyat
+from models.stored_file import StoredFile
+from models.tarkibiy_bolinmalar import TarkibiyBolinma
+from models.tashkiliy_tuzilma import TashkilTuzilma
+from models.yangiliklar import Yangilik
+from services.blob_worker import BlobWorker
+from services.image_render import Image, render_image, supported_formats
+
+load_dotenv()
+
+IMAGE_RENDITIONS_ENABLED = getenv(
+    "IMAGE_RENDITIONS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+IMAGE_RENDITION_WIDTHS = [int(w) for w in getenv(
+    "IMAGE_RENDITION_WIDTHS", "320,640,1280").split(",") if w.strip()]
+# Pillow yoza olmaydigan formatlar (masalan, libavif'siz yig'ilgan AVIF) tashlab ketiladi
+IMAGE_RENDITION_FORMATS = [f.strip().lower() for f in getenv(
+    "IMAGE_RENDITION_FORMATS", "webp,avif").split(",") if f.strip()]
+IMAGE_RENDITION_QUALITY = int(getenv("IMAGE_RENDITION_QUALITY", "80"))
+IMAGE_RENDITION_FOLDER = getenv("IMAGE_RENDITION_FOLDER", "static/images/renditions")
+IMAGE_RENDITION_WORKERS = int(getenv("IMAGE_RENDITION_WORKERS", "1"))
+IMAGE_RENDITION_INTERVAL = float(getenv("IMAGE_RENDITION_INTERVAL", "30"))
+IMAGE_RENDITION_MAX_ATTEMPTS = int(getenv("IMAGE_RENDITION_MAX_ATTEMPTS", "3"))
+IMAGE_RENDITION_RETRY_DELAY = float(getenv("IMAGE_RENDITION_RETRY_DELAY", "60"))
+IMAGE_RENDITION_STALE_SECONDS = float(getenv("IMAGE_RENDITION_STALE_SECONDS", "900"))
+
+_TABLE = ImageRendition.__table__
+_FILES = StoredFile.__table__
+
+# Rasm yo'lini saqlaydigan ustunlar: tayyor o'lchamlar shu yozuvlarning renditions ustuniga
+# yoziladi va router javoblari keshi (namespace) tozalanadi
+IMAGE_FIELDS = (
+    ("/yangiliklar", Yangilik, "rasm"),
+    ("/elonlar", Elon, "rasm"),
+    ("/rahbariyat", Rahbariyat, "rasm"),
+    ("/tarkibiy-bolinmalar", TarkibiyBolinma, "image"),
+    ("/tashkil-tuzilma", TashkilTuzilma, "image"),
+)
+
+
+def _url(path: str) -> str:
+    return "/" + blob_key(path)
+
+
+def rendition_value(path: str, width: int, height: int, variants: dict) -> dict:
+    return {
+        "src": blob_key(path),
+        "width": width,
+        "height": height,
+        **{fmt: {size: _url(out) for size, out in sizes.items()}
+           for fmt, sizes in variants.items()},
+    }
+
+
+class ImageRenditionWorker(BlobWorker):
+    """Yuklangan PNG/JPEG rasmlarning bir nechta kenglikdagi WebP/AVIF nusxalarini tayyorlaydi.
+
+    Nusxalar kontent xeshi bo'yicha bir marta yaratiladi va image_renditions
+    jadvalida saqlanadi. O'tishda nusxasi tayyorlangan yoki yangi yuklangan
+    rasmlar uchun URL'lar shu rasmga havola qiladigan yozuvlarning renditions
+    ustuniga yoziladi; rasm almashtirilsa eski qiymat tozalanadi.
+    """
+
+    table = _TABLE
+    content_types = ("image/png", "image/jpeg", "image/webp")
+    label = "Rasm o'lchamlari"
+    unavailable_message = "Pillow o'rnatilmagan: rasm o'lchamlarini tayyorlash o'chirilgan"
+
+    def __init__(self, formats: list[str], **kwargs):
+        super().__init__(**kwargs)
+        self.formats = formats
+        # Commit qilingan, lekin yozuvlarga hali qo'llanmagan yuklangan rasmlar xeshlari
+        self._uploaded: set[str] = set()
+
+    def uploaded(self, hashes: set[str]):
+        self._uploaded |= hashes
+        self.wake()
+
+    @property
+    def enabled(self) -> bool:
+        return IMAGE_RENDITIONS_ENABLED
+
+    @property
+    def available(self) -> bool:
+        return Image is not None and bool(supported_formats(self.formats))
+
+    def job(self, sha256: str, path: str) -> tuple:
+        return (render_image, path, IMAGE_RENDITION_FOLDER, sha256, IMAGE_RENDITION_WIDTHS,
+                supported_formats(self.formats), IMAGE_RENDITION_QUALITY)
+
+    def result_values(self, result) -> dict:
+        return result
+
+    async def after_pass(self, processed: list[str]):
+        affected, self._uploaded = self._uploaded | set(processed), set()
+        if not affected:
+            return
+        try:
+            await self.apply_to_rows(affected)
+        except Exception:
+            # Keyingi o'tishda qayta uriniladi
+            self._uploaded |= affected
+            raise
+
+    async def apply_to_rows(self, hashes: set[str]) -> int:
+        """Shu xeshli rasmlarga havola qiladigan yozuvlarning renditions ustunini moslaydi.
+
+        O'zgargan jadvallar sonini qaytaradi.
+        """
+        paths = select(_FILES.c.path).where(_FILES.c.sha256.in_(hashes))
+        async with async_session() as db:
+            done = (await db.execute(
+                select(_FILES.c.path, _TABLE.c.width, _TABLE.c.height, _TABLE.c.variants)
+                .join(_TABLE, _TABLE.c.sha256 == _FILES.c.sha256)
+                .where(_TABLE.c.status == "done", _FILES.c.sha256.in_(hashes))
+            )).all()
+            expected = {path: rendition_value(path, width, height, variants)
+                        for path, width, height, variants in done}
+            changed = set()
+            for namespace, model, field in IMAGE_FIELDS:
+                column = getattr(model, field)
+                rows = (await db.execute(
+                    select(model.id, column, model.renditions)
+                    .where(func.ltrim(column, "/").in_(paths))
+                )).all()
+                values = [
+                    {"id": id, "renditions": expected.get(blob_key(path))}
+                    for id, path, current in rows
+                    if current != expected.get(blob_key(path))
+                ]
+                if values:
+                    # ORM bulk UPDATE: table_versions (va javoblar keshi) ham yangilanadi
+                    await db.execute(update(model), values)
+                    changed.add(namespace)
+            await db.commit()
+        for namespace in changed:
+            response_cache.invalidate(namespace)
+        return len(changed)
+
+
+image_rendition_worker = ImageRenditionWorker(
+    formats=IMAGE_RENDITION_FORMATS,
+    workers=IMAGE_RENDITION_WORKERS,
+    interval=IMAGE_RENDITION_INTERVAL,
+    max_attempts=IMAGE_RENDITION_MAX_ATTEMPTS,
+    retry_delay=IMAGE_RENDITION_RETRY_DELAY,
+    stale_seconds=IMAGE_RENDITION_STALE_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_upload(session):
+    hashes = session.info.pop(IMAGE_UPLOADED_KEY, None)
+    if hashes:
+        image_rendition_worker.uploaded(hashes)
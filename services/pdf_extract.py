@@ -0,0 +1,23 @@
+"""PDF'dan matn ajratish: alohida jarayonda (ProcessPoolExecutor) bajariladi.
+
+Modul ataylab yengil: spawn qilingan jarayon faqat shu faylni import qiladi.
+"""
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf ixtiyoriy: bo'lmasa ajratish bosqichi o'chiq turadi
+    PdfReader = None
+
+
+def extract_pdf_text(path: str, max_chars: int) -> tuple[int, str]:
+    """(sahifalar soni, matn) qaytaradi; matn max_chars belgidan uzun bo'lsa kesiladi."""
+    reader = PdfReader(path)
+    parts = []
+    size = 0
+    for page in reader.pages:
+        if size >= max_chars:
+            break
+        text = page.extract_text() or ""
+        parts.append(text)
+        size += len(text) + 1
+    return len(reader.pages), "\n".join(parts)[:max_chars]
@@ -0,0 +1,78 @@
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.cache import response_cache
+from core.search import referenced_pdf_paths
+from core.uploads import PDF_UPLOADED_KEY
+from models.pdf_text import PdfText
+from services.blob_worker import BlobWorker
+from services.pdf_extract import PdfReader, extract_pdf_text
+
+load_dotenv()
+
+PDF_EXTRACT_ENABLED = getenv(
+    "PDF_EXTRACT_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+PDF_EXTRACT_WORKERS = int(getenv("PDF_EXTRACT_WORKERS", "1"))
+# Yangi yuklash bo'lmasa ham navbat shu oraliqda tekshiriladi (boshqa worker'lar yuklagan fayllar)
+PDF_EXTRACT_INTERVAL = float(getenv("PDF_EXTRACT_INTERVAL", "30"))
+PDF_EXTRACT_MAX_ATTEMPTS = int(getenv("PDF_EXTRACT_MAX_ATTEMPTS", "3"))
+# Xato bilan tugagan urinishdan keyin qayta urinishgacha kutish
+PDF_EXTRACT_RETRY_DELAY = float(getenv("PDF_EXTRACT_RETRY_DELAY", "60"))
+# "processing" holatida shuncha vaqt qolgan yozuv (jarayon to'xtab qolgan) qayta olinadi
+PDF_EXTRACT_STALE_SECONDS = float(getenv("PDF_EXTRACT_STALE_SECONDS", "900"))
+PDF_TEXT_MAX_CHARS = int(getenv("PDF_TEXT_MAX_CHARS", str(1_000_000)))
+
+
+class PdfTextExtractor(BlobWorker):
+    """Hujjatlarga biriktirilgan PDF'lardan matn va sahifalar sonini fon rejimida ajratadi (pdf_texts).
+
+    Faqat core.search.PDF_SOURCES ustunlari havola qiladigan fayllar olinadi:
+    murojaatlarga biriktirilgan fuqarolar fayllari o'qilmaydi va qidiruvga tushmaydi.
+    """
+
+    table = PdfText.__table__
+    content_types = ("application/pdf",)
+    label = "PDF matni"
+    unavailable_message = "pypdf o'rnatilmagan: PDF matnlarini ajratish o'chirilgan"
+
+    @property
+    def enabled(self) -> bool:
+        return PDF_EXTRACT_ENABLED
+
+    @property
+    def available(self) -> bool:
+        return PdfReader is not None
+
+    def referenced_paths(self):
+        return referenced_pdf_paths()
+
+    def job(self, sha256: str, path: str) -> tuple:
+        return extract_pdf_text, path, PDF_TEXT_MAX_CHARS
+
+    def result_values(self, result) -> dict:
+        page_count, text = result
+        return {"page_count": page_count, "text": text}
+
+    async def after_pass(self, processed: list[str]):
+        # pdf_texts Core jadval orqali yoziladi (table_versions'ga tegmaydi):
+        # yangi matn qidiruvga tushishi uchun keshlangan /search javoblari tashlanadi
+        if processed:
+            response_cache.invalidate("/search")
+
+
+pdf_text_extractor = PdfTextExtractor(
+    workers=PDF_EXTRACT_WORKERS,
+    interval=PDF_EXTRACT_INTERVAL,
+    max_attempts=PDF_EXTRACT_MAX_ATTEMPTS,
+    retry_delay=PDF_EXTRACT_RETRY_DELAY,
+    stale_seconds=PDF_EXTRACT_STALE_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_upload(session):
+    if session.info.pop(PDF_UPLOADED_KEY, False):
+        pdf_text_extractor.wake()
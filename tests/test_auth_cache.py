@@ -0,0 +1,44 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from auth import cache
+from auth.cache import RevokedTokens
+from models.revoked_token import RevokedToken
+
+
+def _row(jti: str, revoked_at: datetime):
+    return {"jti": jti, "revoked_at": revoked_at,
+            "expires_at": datetime.utcnow() + timedelta(hours=1)}
+
+
+def test_refresh_reads_only_new_rows(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    monkeypatch.setattr(cache, "async_session", async_sessionmaker(engine, expire_on_commit=False))
+    table = RevokedToken.__table__
+    long_ago = datetime.utcnow() - timedelta(days=1)
+
+    async def main():
+        async with engine.begin() as connection:
+            await connection.run_sync(table.create)
+            await connection.execute(insert(table), [_row("eski", long_ago)])
+
+        revoked = RevokedTokens(refresh_interval=5, sweep_interval=600)
+        await revoked.refresh(full=True)
+        assert "eski" in revoked
+
+        async with engine.begin() as connection:
+            await connection.execute(insert(table), [_row("yangi", datetime.utcnow())])
+        # Xotiradan olib tashlangan eski qator qaytmasa - butun jadval qayta o'qilmagan
+        revoked._revoked.pop("eski")
+        await revoked.refresh()
+        assert "yangi" in revoked
+        assert "eski" not in revoked
+
+        await revoked.refresh(full=True)
+        assert "eski" in revoked
+        await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+import asyncio
+
+from core.cache import ResponseCache, ResponseCacheMiddleware
+
+
+def _middleware(app, cache):
+    return ResponseCacheMiddleware(app, cache=cache, cached_prefixes=("/yangiliklar",),
+                                   enabled=True)
+
+
+def _scope(method: str, path: str = "/yangiliklar/"):
+    return {"type": "http", "method": method, "path": path,
+            "query_string": b"", "headers": []}
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def test_response_raced_with_invalidation_is_not_cached():
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=1 << 20)
+    read_done = asyncio.Event()
+    mutation_done = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["method"] == "GET":
+            # Eski ma'lumot o'qildi, javob yozish tugaguncha mutatsiya commit bo'ladi
+            read_done.set()
+            await mutation_done.wait()
+            body = b"eski"
+        else:
+            body = b"ok"
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    middleware = _middleware(app, cache)
+
+    async def mutate():
+        await read_done.wait()
+        await middleware(_scope("POST", "/yangiliklar/for_admin/"), _receive, _send)
+        mutation_done.set()
+
+    async def main():
+        await asyncio.gather(middleware(_scope("GET"), _receive, _send), mutate())
+
+    asyncio.run(main())
+    assert len(cache) == 0
+
+
+def test_response_is_cached_without_concurrent_invalidation():
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=1 << 20)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"yangi"})
+
+    asyncio.run(_middleware(app, cache)(_scope("GET"), _receive, _send))
+    assert cache.get("/yangiliklar/?").body == b"yangi"
+
+
+def test_set_ignores_stale_generation():
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=1 << 20)
+    generation = cache.generation("/elonlar")
+    cache.clear()
+    cache.set("/elonlar/?", "/elonlar", 200, [], b"x", generation=generation)
+    assert len(cache) == 0
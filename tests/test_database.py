@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core import database
+from core.database import _engine_options, _env_bool, _normalize_url
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("postgres://u:p@host:5432/db", "postgresql+asyncpg://u:p@host:5432/db"),
+    ("postgresql://u:p@host/db", "postgresql+asyncpg://u:p@host/db"),
+    # Drayver ko'rsatilgan yoki boshqa baza - o'zgarmaydi
+    ("postgresql+asyncpg://u:p@host/db", "postgresql+asyncpg://u:p@host/db"),
+    ("sqlite+aiosqlite:///./db/tmsiti.db", "sqlite+aiosqlite:///./db/tmsiti.db"),
+])
+def test_normalize_url(url, expected):
+    assert _normalize_url(url) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1", True), ("true", True), (" Yes ", True), ("ON", True),
+    ("0", False), ("false", False), ("no", False), ("", False),
+])
+def test_env_bool(monkeypatch, value, expected):
+    monkeypatch.setenv("TEST_FLAG", value)
+    assert _env_bool("TEST_FLAG", not expected) is expected
+
+
+def test_env_bool_default(monkeypatch):
+    monkeypatch.delenv("TEST_FLAG", raising=False)
+    assert _env_bool("TEST_FLAG", True) is True
+    assert _env_bool("TEST_FLAG", False) is False
+
+
+def _use_url(monkeypatch, url: str):
+    parsed = make_url(url)
+    monkeypatch.setattr(database, "database_url", parsed)
+    monkeypatch.setattr(database, "IS_SQLITE", parsed.get_backend_name() == "sqlite")
+
+
+def test_engine_options_pool(monkeypatch):
+    _use_url(monkeypatch, "postgresql+asyncpg://u:p@host/db")
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(database, "DB_POOL_RECYCLE", 60)
+    monkeypatch.setattr(database, "DB_POOL_TIMEOUT", 5)
+    monkeypatch.setattr(database, "DB_POOL_PRE_PING", False)
+    monkeypatch.setattr(database, "DB_ECHO", True)
+    assert _engine_options() == {
+        "echo": True, "pool_pre_ping": False, "pool_size": 7,
+        "max_overflow": 3, "pool_recycle": 60, "pool_timeout": 5,
+    }
+
+
+def test_asyncpg_engine_uses_pool_options(monkeypatch):
+    # Engine yaratiladi, lekin bazaga ulanilmaydi
+    url = _normalize_url("postgres://u:p@host:5432/db")
+    _use_url(monkeypatch, url)
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 7)
+    engine = create_async_engine(url, **_engine_options())
+    try:
+        assert engine.dialect.driver == "asyncpg"
+        pool = engine.sync_engine.pool
+        assert isinstance(pool, AsyncAdaptedQueuePool)
+        assert pool.size() == 7
+    finally:
+        engine.sync_engine.dispose()
+
+
+def test_engine_options_sqlite_file_gets_pool(monkeypatch):
+    _use_url(monkeypatch, "sqlite+aiosqlite:///./db/tmsiti.db")
+    assert "pool_size" in _engine_options()
+
+
+@pytest.mark.parametrize("url", ["sqlite+aiosqlite://", "sqlite+aiosqlite:///:memory:"])
+def test_engine_options_memory_sqlite_has_no_pool(monkeypatch, url):
+    # StaticPool pool_size/max_overflow qabul qilmaydi
+    _use_url(monkeypatch, url)
+    options = _engine_options()
+    assert set(options) == {"echo", "pool_pre_ping"}
+
+
+def test_pool_settings_parsed_from_env():
+    # Sozlamalar import paytida o'qiladi, shuning uchun alohida jarayonda tekshiriladi
+    env = {
+        **os.environ,
+        "DATABASE_URL": "postgres://u:p@host/db",
+        "DB_POOL_SIZE": "12",
+        "DB_MAX_OVERFLOW": "4",
+        "DB_POOL_RECYCLE": "90",
+        "DB_POOL_TIMEOUT": "7",
+        "DB_POOL_PRE_PING": "off",
+        "DB_ECHO": "yes",
+        "METRICS_ENABLED": "false",
+        "SQL_PROFILE": "false",
+    }
+    code = ("import json; from core.database import DATABASE_URL, _engine_options; "
+            "print(json.dumps([DATABASE_URL, _engine_options()]))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    url, options = json.loads(result.stdout.strip().splitlines()[-1])
+    assert url == "postgresql+asyncpg://u:p@host/db"
+    assert options == {
+        "echo": True, "pool_pre_ping": False, "pool_size": 12,
+        "max_overflow": 4, "pool_recycle": 90, "pool_timeout": 7,
+    }
@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import os
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.storage import release_file
+from core.uploads import ReceivedUpload, store_upload
+from models.image_rendition import ImageRendition
+from models.pdf_text import PdfText
+from models.stored_file import StoredFile
+
+FOLDER = os.path.join("static", "files")
+TABLES = [StoredFile.__table__, PdfText.__table__, ImageRendition.__table__]
+
+
+async def _sessions(name: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{name}.db")
+    async with engine.begin() as connection:
+        for table in TABLES:
+            await connection.run_sync(table.create)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _received(content: bytes) -> ReceivedUpload:
+    os.makedirs(FOLDER, exist_ok=True)
+    sha256 = hashlib.sha256(content).hexdigest()
+    tmp_path = os.path.join(FOLDER, f".{os.urandom(8).hex()}.part")
+    with open(tmp_path, "wb") as out:
+        out.write(content)
+    filename = sha256 + ".txt"
+    return ReceivedUpload(tmp_path=tmp_path, path=os.path.join(FOLDER, filename),
+                          filename=filename, size=len(content), sha256=sha256,
+                          content_type="text/plain")
+
+
+async def _ref_count(session, path: str):
+    async with session() as db:
+        return (await db.execute(
+            select(StoredFile.ref_count).where(StoredFile.path == path))).scalar_one_or_none()
+
+
+def _leftovers() -> list[str]:
+    return [name for name in os.listdir(FOLDER) if name.startswith(".")]
+
+
+def test_dedupe_and_release(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def main():
+        engine, session = await _sessions("storage")
+        for _ in range(2):
+            async with session() as db:
+                saved = await store_upload(db, _received(b"bir xil"))
+                await db.commit()
+        assert await _ref_count(session, saved.path) == 2
+        assert os.path.exists(saved.path)
+        assert _leftovers() == []
+
+        async with session() as db:
+            await release_file(db, saved.path)
+            await db.commit()
+        assert await _ref_count(session, saved.path) == 1
+        assert os.path.exists(saved.path)
+
+        async with session() as db:
+            await release_file(db, saved.path)
+            await db.commit()
+        assert await _ref_count(session, saved.path) is None
+        assert not os.path.exists(saved.path)
+        await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_rollback_removes_only_new_blob(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def main():
+        engine, session = await _sessions("storage")
+        async with session() as db:
+            saved = await store_upload(db, _received(b"yangi"))
+            await db.rollback()
+        assert not os.path.exists(saved.path)
+        assert await _ref_count(session, saved.path) is None
+
+        async with session() as db:
+            saved = await store_upload(db, _received(b"mavjud"))
+            await db.commit()
+        async with session() as db:
+            await store_upload(db, _received(b"mavjud"))
+            await db.rollback()
+        # Havolasi bor blob bekor qilingan qayta yuklashda o'chmaydi
+        assert os.path.exists(saved.path)
+        assert await _ref_count(session, saved.path) == 1
+        assert _leftovers() == []
+        await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_rollback_keeps_blob_placed_by_other_worker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def main():
+        # Ikki worker: birining tranzaksiyasi bekor bo'lguncha ikkinchisi o'z blobini qo'yadi
+        engine_a, session_a = await _sessions("a")
+        engine_b, session_b = await _sessions("b")
+        async with session_a() as db_a:
+            saved = await store_upload(db_a, _received(b"poyga"))
+            async with session_b() as db_b:
+                await store_upload(db_b, _received(b"poyga"))
+                await db_b.commit()
+            await db_a.rollback()
+        assert os.path.exists(saved.path)
+        await engine_a.dispose()
+        await engine_b.dispose()
+
+    asyncio.run(main())
+
+
+def test_release_keeps_blob_recreated_before_unlink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def main():
+        engine_a, session_a = await _sessions("a")
+        engine_b, session_b = await _sessions("b")
+        async with session_b() as db_b:
+            saved = await store_upload(db_b, _received(b"poyga"))
+            await db_b.commit()
+        async with session_b() as db_b:
+            await release_file(db_b, saved.path)
+            # Oxirgi havola commit bo'lguncha boshqa worker shu blobni yangidan yaratadi
+            async with session_a() as db_a:
+                await store_upload(db_a, _received(b"poyga"))
+                await db_a.commit()
+            await db_b.commit()
+        assert os.path.exists(saved.path)
+        assert await _ref_count(session_a, saved.path) == 1
+        await engine_a.dispose()
+        await engine_b.dispose()
+
+    asyncio.run(main())